@@ -7,6 +7,7 @@ Double-click this file to start the dashboard!
 Supported platforms: macOS, Linux, Windows
 """
 
+import asyncio
 import os
 import sys
 import subprocess
@@ -38,23 +39,33 @@ def get_project_root():
     script_dir = Path(__file__).parent.absolute()
     return script_dir
 
+_VENV_NAMES = ("trader", "venv", "env")
+
 def check_virtual_env(project_root):
     """Check virtual environment"""
-    venv_paths = [
-        project_root / "trader",  # macOS/Linux
-        project_root / "trader" / "Scripts",  # Windows
-        project_root / "venv",
-        project_root / "venv" / "Scripts",
-        project_root / "env",
-        project_root / "env" / "Scripts",
-    ]
-
-    for venv_path in venv_paths:
-        if venv_path.exists():
-            # Check Python executable
-            python_exe = venv_path / "bin" / "python" if os.name != 'nt' else venv_path / "python.exe"
-            if python_exe.exists():
-                return str(python_exe), str(venv_path)
+    # One directory scan instead of stat-ing every candidate path
+    try:
+        with os.scandir(project_root) as it:
+            found = {e.name: e.path for e in it if e.name in _VENV_NAMES and e.is_dir()}
+    except OSError:
+        return None, None
+
+    for name in _VENV_NAMES:
+        venv_dir = found.get(name)
+        if venv_dir is None:
+            continue
+        if os.name != 'nt':
+            # macOS/Linux
+            python_exe = os.path.join(venv_dir, "bin", "python")
+            if os.path.isfile(python_exe):
+                return python_exe, venv_dir
+        else:
+            # Windows
+            scripts_dir = os.path.join(venv_dir, "Scripts")
+            for candidate_dir in (venv_dir, scripts_dir):
+                python_exe = os.path.join(candidate_dir, "python.exe")
+                if os.path.isfile(python_exe):
+                    return python_exe, candidate_dir
 
     return None, None
 
@@ -68,33 +79,82 @@ def check_requirements():
 
     return issues
 
-def check_and_cleanup_port(port=8501):
-    """Check if port is in use and clean up residual processes"""
+def _port_in_use(port):
+    """Return True if the port cannot be bound (something is listening on it)"""
     import socket
 
-    # Check if port is occupied
+    # A bind attempt fails immediately with EADDRINUSE; no TCP handshake needed
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    result = sock.connect_ex(("127.0.0.1", port))
-    sock.close()
+    try:
+        if os.name != 'nt':
+            # Ignore TIME_WAIT leftovers (on Windows this flag would allow stealing the port)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", port))
+        return False
+    except OSError:
+        return True
+    finally:
+        sock.close()
+
+def _wait_port_free(port, timeout=2.0):
+    """Poll until the port is released (bounded by timeout)"""
+    deadline = time.monotonic() + timeout
+    while _port_in_use(port) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return not _port_in_use(port)
+
+def _terminate_port_owners(port):
+    """Terminate processes listening on the port via psutil; None if psutil is unavailable"""
+    try:
+        import psutil
+    except Exception:
+        return None
+
+    procs = []
+    for c in psutil.net_connections(kind="tcp"):
+        if c.laddr and c.laddr.port == port and c.status == psutil.CONN_LISTEN and c.pid:
+            try:
+                procs.append(psutil.Process(c.pid))
+            except psutil.Error:
+                pass
+    if not procs:
+        return None
+
+    for proc in procs:
+        try:
+            proc.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=2)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
+    return True
 
-    if result == 0:
+def check_and_cleanup_port(port=8501):
+    """Check if port is in use and clean up residual processes"""
+    # Check if port is occupied
+    if _port_in_use(port):
         print(f"⚠️  Port {port} is already in use, cleaning up...")
         try:
-            if platform.system() == "Windows":
-                # Windows: Kill uvicorn processes
-                subprocess.run(["taskkill", "/F", "/IM", "uvicorn.exe"],
-                             capture_output=True, timeout=5)
-                subprocess.run(["taskkill", "/F", "/IM", "python.exe"],
-                             capture_output=True, timeout=5)
-            else:
-                # macOS/Linux: Kill related processes
-                subprocess.run(["pkill", "-f", "uvicorn"],
-                             capture_output=True, timeout=5)
-                subprocess.run(["pkill", "-f", "trader.*serve"],
-                             capture_output=True, timeout=5)
+            if _terminate_port_owners(port) is None:
+                if platform.system() == "Windows":
+                    # Windows: Kill uvicorn processes
+                    subprocess.run(["taskkill", "/F", "/IM", "uvicorn.exe"],
+                                 capture_output=True, timeout=5)
+                    subprocess.run(["taskkill", "/F", "/IM", "python.exe"],
+                                 capture_output=True, timeout=5)
+                else:
+                    # macOS/Linux: Kill related processes
+                    subprocess.run(["pkill", "-f", "uvicorn"],
+                                 capture_output=True, timeout=5)
+                    subprocess.run(["pkill", "-f", "trader.*serve"],
+                                 capture_output=True, timeout=5)
 
             print("✅ Cleaned up residual processes")
-            time.sleep(2)  # Wait for cleanup to complete
+            _wait_port_free(port)  # Wait for cleanup to complete
 
         except Exception as e:
             print(f"⚠️  Auto cleanup failed: {e}")
@@ -103,6 +163,126 @@ def check_and_cleanup_port(port=8501):
 
     return True
 
+async def wait_for_port(host="127.0.0.1", port=8501, interval=0.05):
+    """Poll until the service accepts TCP connections"""
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(interval)
+            continue
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+        return
+
+def open_browser(url):
+    """Auto open browser"""
+    try:
+        webbrowser.open(url)
+        print("✅ Browser opened automatically")
+    except Exception as e:
+        print(f"⚠️  Cannot open browser automatically: {e}")
+        print(f"Please open manually: {url}")
+
+def exec_service(python_exe, cmd, env, url="http://127.0.0.1:8501", startup_timeout=30):
+    """Replace the launcher process with uvicorn (POSIX); a detached helper opens the browser"""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        # Double fork so the helper is not left as a zombie under uvicorn
+        try:
+            if os.fork() == 0:
+                try:
+                    asyncio.run(asyncio.wait_for(wait_for_port(), timeout=startup_timeout))
+                    open_browser(url)
+                except Exception:
+                    print(f"⚠️  Service not ready after {startup_timeout}s")
+                    print(f"Please open manually: {url}")
+                finally:
+                    sys.stdout.flush()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    os.execvpe(python_exe, cmd, env)
+
+async def run_service(cmd, env, url="http://127.0.0.1:8501", startup_timeout=30):
+    """Start the service, open the browser once it is ready, then wait for exit"""
+    process = await asyncio.create_subprocess_exec(*cmd, env=env)
+    try:
+        # Wait for service startup (or an early exit of the process)
+        probe = asyncio.ensure_future(asyncio.wait_for(wait_for_port(), timeout=startup_timeout))
+        exited = asyncio.ensure_future(process.wait())
+        await asyncio.wait({probe, exited}, return_when=asyncio.FIRST_COMPLETED)
+
+        if probe.done() and not probe.cancelled() and probe.exception() is None:
+            open_browser(url)
+        elif probe.done():
+            print(f"⚠️  Service not ready after {startup_timeout}s")
+            print(f"Please open manually: {url}")
+        else:
+            probe.cancel()
+
+        # Wait for process to end
+        await exited
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except Exception:
+                process.kill()
+
+_INSTALL_MARKER = ".trader_install_ok"
+
+# Install records pip leaves in site-packages for trader-alerts (regular,
+# PEP 660 editable, legacy `setup.py develop`)
+_INSTALL_RECORDS = ("trader_alerts-*.dist-info", "__editable__*trader_alerts*", "trader[-_]alerts*.egg-link")
+
+def _install_cache_key(project_root, python_exe, venv_path):
+    """
+    Key the install verdict on the interpreter / pyproject mtimes and the
+    mtime of the package's install record in the venv's site-packages.
+    Stat calls only (no interpreter start); None when any of them is
+    missing (e.g. after `pip uninstall`), so a stale marker is never trusted.
+    """
+    try:
+        venv = Path(venv_path)
+        site_dirs = list(venv.glob("lib/python*/site-packages")) + [venv / "Lib" / "site-packages"]
+        records = [rec for d in site_dirs if d.is_dir() for pat in _INSTALL_RECORDS for rec in d.glob(pat)]
+        if not records:
+            return None
+        record_mtime = max(os.path.getmtime(rec) for rec in records)
+        root = Path(project_root)
+        pyproject = root / "pyproject.toml"
+        if not pyproject.exists():
+            pyproject = root / "src" / "pyproject.toml"
+        pyproject_mtime = os.path.getmtime(pyproject)
+        return f"{os.path.getmtime(python_exe)}:{pyproject_mtime}:{record_mtime}"
+    except OSError:
+        return None
+
+def _install_cached(project_root, key):
+    """Return True if a previous launch verified the install with the same key"""
+    if not key:
+        return False
+    try:
+        return (Path(project_root) / _INSTALL_MARKER).read_text().strip() == key
+    except OSError:
+        return False
+
+def _remember_install(project_root, key):
+    """Record a successful install verification"""
+    if not key:
+        return
+    try:
+        (Path(project_root) / _INSTALL_MARKER).write_text(key)
+    except OSError:
+        pass
+
 def activate_and_run(project_root, python_exe, venv_path):
     """Activate virtual environment and run dashboard"""
     try:
@@ -121,10 +301,20 @@ def activate_and_run(project_root, python_exe, venv_path):
         # Check if trader command exists
         print("🔧 Checking application installation...")
         installed = False
+        cache_key = _install_cache_key(project_root, python_exe, venv_path)
         try:
-            trader_cmd = [python_exe, "-c", "import trader_alerts.cli"]
-            result = subprocess.run(trader_cmd, capture_output=True, text=True, timeout=10)
-            if result.returncode != 0:
+            needs_install = False
+            if _install_cached(project_root, cache_key):
+                # Same env as a probed launch: `installed` only flags a fresh install
+                print("✅ Application already installed")
+            else:
+                trader_cmd = [python_exe, "-c", "import trader_alerts.cli"]
+                result = subprocess.run(trader_cmd, capture_output=True, text=True, timeout=10)
+                if result.returncode == 0:
+                    _remember_install(project_root, cache_key)
+                else:
+                    needs_install = True
+            if needs_install:
                 print("⚠️  Installing application...")
                 root_pyproject = Path(project_root) / "pyproject.toml"
                 root_setup = Path(project_root) / "setup.py"
@@ -142,6 +332,8 @@ def activate_and_run(project_root, python_exe, venv_path):
                 if install_cmd:
                     subprocess.run(install_cmd, check=True, timeout=60)
                     installed = True
+                    # The install just rewrote the dist-info: key on the new record
+                    _remember_install(project_root, _install_cache_key(project_root, python_exe, venv_path))
                     print("✅ Application installation completed")
         except subprocess.TimeoutExpired:
             print("⚠️  Installation timeout, continuing startup...")
@@ -155,8 +347,10 @@ def activate_and_run(project_root, python_exe, venv_path):
             "trader_alerts.web.app:app",
             "--host", "127.0.0.1",
             "--port", "8501",
-            "--reload"
         ]
+        # Auto-reload (file watcher + extra worker process) only for development
+        if os.environ.get("TRADER_DEV"):
+            cmd.append("--reload")
 
         print(f"📱 Dashboard URL: http://127.0.0.1:8501")
         print("🛑 Press Ctrl+C to stop service")
@@ -167,21 +361,11 @@ def activate_and_run(project_root, python_exe, venv_path):
         if not installed:
             src_path = str(Path(project_root) / "src")
             env["PYTHONPATH"] = f"{src_path}{os.pathsep}{env.get('PYTHONPATH', '')}"
-        process = subprocess.Popen(cmd, env=env)
-
-        # Wait for service startup
-        time.sleep(3)
-
-        # Auto open browser
-        try:
-            webbrowser.open("http://127.0.0.1:8501")
-            print("✅ Browser opened automatically")
-        except Exception as e:
-            print(f"⚠️  Cannot open browser automatically: {e}")
-            print("Please open manually: http://127.0.0.1:8501")
-
-        # Wait for process to end
-        process.wait()
+        if os.name != 'nt' and hasattr(os, "fork"):
+            # Nothing left for the launcher to do: hand the process over to uvicorn
+            exec_service(python_exe, cmd, env)
+        # Windows has no real exec: keep the launcher as parent
+        asyncio.run(run_service(cmd, env))
 
     except KeyboardInterrupt:
         print("\n👋 Service stopped")
@@ -0,0 +1,76 @@
+"""
+Per-endpoint circuit breaker.
+
+Several scraped endpoints (MacroMicro, CNN graphdata, FRED public files) are
+known to time out or block for a while. Once a request to one of them fails,
+further requests within the cooldown window are skipped instead of paying
+the full connect/read timeout again on every refresh.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import requests
+
+
+class Breaker:
+    def __init__(self, default_cooldown: float = 60.0):
+        self.default_cooldown = default_cooldown
+        self._open_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """True if requests to `key` may be attempted now."""
+        with self._lock:
+            until = self._open_until.get(key)
+            if until is None:
+                return True
+            if time.monotonic() >= until:
+                del self._open_until[key]
+                return True
+            return False
+
+    def trip(self, key: str, cooldown: float | None = None) -> None:
+        """Mark `key` as failing; skip it for `cooldown` seconds."""
+        with self._lock:
+            self._open_until[key] = time.monotonic() + (self.default_cooldown if cooldown is None else cooldown)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._open_until.pop(key, None)
+
+
+BREAKER = Breaker()
+
+
+def guarded_get(
+    session: requests.Session,
+    url: str,
+    *,
+    breaker: Breaker | None = None,
+    cooldown: float | None = None,
+    trip_statuses: tuple[int, ...] = (),
+    **kwargs: Any,
+) -> requests.Response | None:
+    """
+    `session.get(url, **kwargs)` behind the breaker (keyed by url).
+
+    Returns None without touching the network while the breaker is open.
+    Network errors trip the breaker and are re-raised; 5xx responses (and any
+    `trip_statuses`) trip it and are returned to the caller as-is.
+    """
+    b = breaker or BREAKER
+    if not b.allow(url):
+        return None
+    try:
+        resp = session.get(url, **kwargs)
+    except Exception:
+        b.trip(url, cooldown)
+        raise
+    if resp.status_code >= 500 or resp.status_code in trip_statuses:
+        b.trip(url, cooldown)
+    return resp
@@ -1,26 +1,25 @@
 from __future__ import annotations
 
-from datetime import date
+import asyncio
+from datetime import date, timedelta
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
+import click
 import typer
 from rich.console import Console
 from rich.table import Table
 
 from .constants import ALL_INDICATORS, IndicatorId
-from .providers import (
-    CnnFearGreedProvider,
-    FredProvider,
-    HttpJsonProvider,
-    ManualProvider,
-    MultplProvider,
-    Nasdaq100PeProvider,
-    NdtwProvider,
-    Sp500RsiProvider,
-    YChartsProvider,
-)
+from .models import Observation
+from . import providers as _providers
+from .providers.base import afetch_all
 from .rules import RULES, RuleContext
-from .storage import latest_observation, list_latest, recent_observations, upsert_observations
+from .storage import bulk_history, list_latest, upsert_observations
+
+if TYPE_CHECKING:
+    from .providers.base import Provider
 
 
 app = typer.Typer(add_completion=False, help="Six indicators: fetch/ingest/store/bull-bear alerts (CLI)")
@@ -30,53 +29,70 @@ console = Console()
 def _parse_indicator(v: str) -> IndicatorId:
     try:
         return IndicatorId(v)
-    except Exception as e:
-        raise typer.BadParameter(f"Unknown indicator: {v} (options: {', '.join(i.value for i in ALL_INDICATORS)})") from e
+    except ValueError:
+        raise typer.BadParameter(f"Unknown indicator: {v} (options: {', '.join(i.value for i in ALL_INDICATORS)})") from None
 
 
+@lru_cache(maxsize=4)
 def _db_path(db: str | None) -> Path:
     return Path(db) if db else Path.cwd() / "trader_alerts.sqlite3"
 
 
+# provider 名称 -> factory(config) -> (provider 实例, 要拉取的指标)
+# provider 类通过 `_providers.X` 按需导入，只加载实际用到的模块
+PROVIDERS: dict[str, Callable[[str | None], tuple[Provider, list[IndicatorId]]]] = {
+    "fred": lambda _: (_providers.FredProvider(), [IndicatorId.US_HIGH_YIELD_SPREAD]),
+    "cnn": lambda _: (_providers.CnnFearGreedProvider(), [IndicatorId.CNN_FEAR_GREED_INDEX, IndicatorId.CNN_PUT_CALL_OPTIONS]),
+    "vix": lambda _: (_providers.VixProvider(), [IndicatorId.VIX]),
+    "multpl": lambda _: (_providers.MultplProvider(), [IndicatorId.SP500_PE_RATIO]),
+    "nasdaqpe": lambda _: (_providers.Nasdaq100PeProvider(), [IndicatorId.NASDAQ100_PE_RATIO]),
+    "rsi": lambda _: (_providers.Sp500RsiProvider(), [IndicatorId.SP500_RSI]),
+    "ycharts": lambda _: (_providers.YChartsProvider(), [IndicatorId.BOFA_BULL_BEAR]),
+    "ndtw": lambda _: (_providers.NdtwProvider(), [IndicatorId.NASDAQ100_ABOVE_20D_MA]),
+    "http": lambda config: (_providers.HttpJsonProvider(config or "api_config.yaml"), list(ALL_INDICATORS)),
+}
+
+
+def _fetch_provider(prov: str, config: str | None = None) -> list[Observation]:
+    # prov 已由 click.Choice 校验/归一化（或来自内部固定列表）
+    provider, ids = PROVIDERS[prov](config)
+    # CLI 拉取都是用户显式发起的，不读 providers._cache 的缓存
+    provider.force_refresh = True
+    return provider.fetch(ids)
+
+
 def _fetch_into_db(dbp: Path, prov: str, config: str | None = None) -> int:
-    prov = prov.strip().lower()
-    obs = []
-    if prov == "fred":
-        obs = FredProvider().fetch([IndicatorId.US_HIGH_YIELD_SPREAD])
-    elif prov == "cnn":
-        obs = CnnFearGreedProvider().fetch([IndicatorId.CNN_FEAR_GREED_INDEX, IndicatorId.CNN_PUT_CALL_OPTIONS])
-    elif prov == "vix":
-        from .providers.vix import VixProvider
-        obs = VixProvider().fetch([IndicatorId.VIX])
-    elif prov == "multpl":
-        obs = MultplProvider().fetch([IndicatorId.SP500_PE_RATIO])
-    elif prov == "nasdaqpe":
-        obs = Nasdaq100PeProvider().fetch([IndicatorId.NASDAQ100_PE_RATIO])
-    elif prov == "rsi":
-        obs = Sp500RsiProvider().fetch([IndicatorId.SP500_RSI])
-    elif prov == "ycharts":
-        obs = YChartsProvider().fetch([IndicatorId.BOFA_BULL_BEAR])
-    elif prov == "ndtw":
-        obs = NdtwProvider().fetch([IndicatorId.NASDAQ100_ABOVE_20D_MA])
-    elif prov == "http":
-        cfg = config or "api_config.yaml"
-        obs = HttpJsonProvider(cfg).fetch(list(ALL_INDICATORS))
-    else:
-        raise typer.BadParameter(f"Unknown provider: {prov} (options: fred/http/multpl/nasdaqpe/cnn/ycharts/rsi/ndtw/all)")
-
-    return upsert_observations(dbp, obs)
+    return upsert_observations(dbp, _fetch_provider(prov, config=config))
+
+
+_FETCH_ALL_ORDER = ("http", "ycharts", "cnn", "multpl", "nasdaqpe", "rsi", "fred")
 
 
 def _fetch_all_into_db(dbp: Path, config: str | None = None) -> int:
-    total = 0
+    all_obs: list[Observation] = []
     # Order: http first (proprietary indicators), then public sentiment/valuation, then fred
-    for p in ["http", "ycharts", "cnn", "multpl", "nasdaqpe", "rsi", "fred"]:
+    # 同一批观测共用一个日期（只取一次 today，也避免跨午夜时同批数据日期不一致）
+    today = date.today()
+    jobs: list[tuple[str, Provider, list[IndicatorId]]] = []
+    for p in _FETCH_ALL_ORDER:
         try:
-            total += _fetch_into_db(dbp, p, config=config)
+            provider, ids = PROVIDERS[p](config)
         except Exception as e:
-            # For example: FRED_API_KEY not configured, http_config missing, etc., just prompt but don't interrupt
             console.print(f"[yellow]Skipping {p}[/yellow]: {e}")
-    return total
+            continue
+        provider.as_of = today
+        provider.force_refresh = True
+        jobs.append((p, provider, ids))
+
+    # 各 provider 互相独立，并发拉取（I/O bound，总耗时≈最慢的一个）；最后一次性写入（单个事务）
+    results = asyncio.run(afetch_all([(provider, ids) for _, provider, ids in jobs]))
+    for (p, _, _), res in zip(jobs, results):
+        if isinstance(res, BaseException):
+            # For example: FRED_API_KEY not configured, http_config missing, etc., just prompt but don't interrupt
+            console.print(f"[yellow]Skipping {p}[/yellow]: {res}")
+            continue
+        all_obs.extend(res)
+    return upsert_observations(dbp, all_obs)
 
 
 @app.command()
@@ -167,7 +183,7 @@ def ingest(
     Write values from `manual_input.yaml` to SQLite.
     """
     dbp = _db_path(db)
-    provider = ManualProvider(file)
+    provider = _providers.ManualProvider(file)
     obs = provider.fetch(list(ALL_INDICATORS))
     n = upsert_observations(dbp, obs)
     console.print(f"[green]Write completed[/green]: {n} records → {dbp}")
@@ -175,7 +191,11 @@ def ingest(
 
 @app.command()
 def fetch(
-    provider: str = typer.Argument(..., help='Data source: fred/http/multpl/nasdaqpe/cnn/ycharts/rsi/ndtw/all'),
+    provider: str = typer.Argument(
+        ...,
+        help='Data source: fred/http/vix/multpl/nasdaqpe/cnn/ycharts/rsi/ndtw/all',
+        click_type=click.Choice([*PROVIDERS, "all"], case_sensitive=False),
+    ),
     db: str | None = typer.Option(None, help="SQLite path (default ./trader_alerts.sqlite3)"),
     config: str | None = typer.Option(None, help="Config file when provider=http (default api_config.yaml)"),
 ) -> None:
@@ -183,38 +203,11 @@ def fetch(
     Fetch data from public API and write to SQLite (currently: FRED\'s US High Yield Spread).
     """
     dbp = _db_path(db)
-    prov = provider.lower()
-    if prov == "fred":
-        p = FredProvider()
-        obs = p.fetch([IndicatorId.US_HIGH_YIELD_SPREAD])
-    elif prov == "http":
-        cfg = config or "api_config.yaml"
-        p = HttpJsonProvider(cfg)
-        obs = p.fetch(list(ALL_INDICATORS))
-    elif prov == "multpl":
-        p = MultplProvider()
-        obs = p.fetch([IndicatorId.SP500_PE_RATIO])
-    elif prov == "nasdaqpe":
-        p = Nasdaq100PeProvider()
-        obs = p.fetch([IndicatorId.NASDAQ100_PE_RATIO])
-    elif prov == "cnn":
-        p = CnnFearGreedProvider()
-        obs = p.fetch([IndicatorId.CNN_FEAR_GREED_INDEX, IndicatorId.CNN_PUT_CALL_OPTIONS])
-    elif prov == "ycharts":
-        p = YChartsProvider()
-        obs = p.fetch([IndicatorId.BOFA_BULL_BEAR])
-    elif prov == "rsi":
-        p = Sp500RsiProvider()
-        obs = p.fetch([IndicatorId.SP500_RSI])
-    elif prov == "ndtw":
-        p = NdtwProvider()
-        obs = p.fetch([IndicatorId.NASDAQ100_ABOVE_20D_MA])
-    elif prov == "all":
+    if provider == "all":
         n = _fetch_all_into_db(dbp, config=config)
         console.print(f"[green]拉取并写入完成[/green]：{n} 条 → {dbp}")
         return
-    else:
-        raise typer.BadParameter("provider only supports: fred、http、multpl、nasdaqpe、cnn、ycharts、rsi、ndtw、all")
+    obs = _fetch_provider(provider, config=config)
 
     n = upsert_observations(dbp, obs)
     console.print(f"[green]Fetch and write completed[/green]: {n} records → {dbp}")
@@ -241,12 +234,12 @@ def show(
     table.add_column("Unit", style="white")
     table.add_column("Source", style="magenta")
 
+    add_row = table.add_row
+    latest_get = latest.get
+    dash_row = ("-", "-", "-", "-")
     for ind in ALL_INDICATORS:
-        o = latest.get(ind)
-        if not o:
-            table.add_row(ind.value, "-", "-", "-", "-")
-            continue
-        table.add_row(ind.value, o.as_of.isoformat(), str(o.value), o.unit, o.source)
+        o = latest_get(ind)
+        add_row(ind.value, *((o.as_of.isoformat(), str(o.value), o.unit, o.source) if o else dash_row))
 
     console.print(table)
 
@@ -273,11 +266,19 @@ def evaluate(
     table.add_column("Alert", style="yellow")
     table.add_column("Explanation", style="white")
 
+    history = bulk_history(dbp, targets, 370)
+    cutoff_30 = date.today() - timedelta(days=35)
+    # 超出一年窗口的旧数据仍需展示最新值：这些指标的最新值一次查询补齐
+    stale = list_latest(dbp, [ind for ind in targets if not history.get(ind)])
     for ind in targets:
-        latest = latest_observation(dbp, ind)
-        h30 = recent_observations(dbp, ind, 35)
-        h365 = recent_observations(dbp, ind, 370)
-        ctx = RuleContext(latest=latest, history_30d=h30, history_365d=h365)
+        h365 = history.get(ind) or []
+        h30 = [o for o in h365 if o.as_of >= cutoff_30]
+        latest = h365[-1] if h365 else stale.get(ind)
+        ctx = RuleContext(
+            latest=latest,
+            history_30d=h30,
+            history_365d=h365,
+        )
 
         rule = RULES.get(ind)
         if not latest:
@@ -57,4 +57,5 @@ ALL_INDICATORS: tuple[IndicatorId, ...] = (
     IndicatorId.YC_10Y_2Y,                        # 10Y-2Y Treasury yield curve
 )
 
-
+# 成员判断用（O(1)）；顺序仍以 ALL_INDICATORS 为准
+ALL_INDICATORS_SET: frozenset[IndicatorId] = frozenset(ALL_INDICATORS)
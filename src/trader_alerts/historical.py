@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import date
 
 
 @dataclass(frozen=True)
@@ -23,8 +24,8 @@ class HistoricalEvent:
     """
 
     event_name: str
-    peak_date: str
-    trough_date: str
+    peak_date: date
+    trough_date: date
     peak_close: float
     trough_close: float
     drawdown_pct: float
@@ -38,11 +39,11 @@ class HistoricalEvent:
     trough_pe: float | None
 
 
-HISTORICAL_EVENTS: list[HistoricalEvent] = [
+HISTORICAL_EVENTS: tuple[HistoricalEvent, ...] = (
     HistoricalEvent(
         event_name="Dot-com Bubble Burst",
-        peak_date="2000-03-24",
-        trough_date="2002-10-09",
+        peak_date=date(2000, 3, 24),
+        trough_date=date(2002, 10, 9),
         peak_close=1527.46,
         trough_close=776.76,
         drawdown_pct=-49.1,
@@ -51,8 +52,8 @@ HISTORICAL_EVENTS: list[HistoricalEvent] = [
     ),
     HistoricalEvent(
         event_name="2008 Global Financial Crisis",
-        peak_date="2007-10-09",
-        trough_date="2009-03-09",
+        peak_date=date(2007, 10, 9),
+        trough_date=date(2009, 3, 9),
         peak_close=1565.15,
         trough_close=676.53,
         drawdown_pct=-56.8,
@@ -61,8 +62,8 @@ HISTORICAL_EVENTS: list[HistoricalEvent] = [
     ),
     HistoricalEvent(
         event_name="2011 US Debt Ceiling / Eurozone Crisis",
-        peak_date="2011-04-29",
-        trough_date="2011-10-03",
+        peak_date=date(2011, 4, 29),
+        trough_date=date(2011, 10, 3),
         peak_close=1363.61,
         trough_close=1099.23,
         drawdown_pct=-19.4,
@@ -71,8 +72,8 @@ HISTORICAL_EVENTS: list[HistoricalEvent] = [
     ),
     HistoricalEvent(
         event_name="2018 Q4 Trade War / Fed Tightening",
-        peak_date="2018-09-20",
-        trough_date="2018-12-24",
+        peak_date=date(2018, 9, 20),
+        trough_date=date(2018, 12, 24),
         peak_close=2930.75,
         trough_close=2351.10,
         drawdown_pct=-19.8,
@@ -81,8 +82,8 @@ HISTORICAL_EVENTS: list[HistoricalEvent] = [
     ),
     HistoricalEvent(
         event_name="2020 COVID-19 Crash",
-        peak_date="2020-02-19",
-        trough_date="2020-03-23",
+        peak_date=date(2020, 2, 19),
+        trough_date=date(2020, 3, 23),
         peak_close=3386.15,
         trough_close=2237.40,
         drawdown_pct=-33.9,
@@ -91,8 +92,8 @@ HISTORICAL_EVENTS: list[HistoricalEvent] = [
     ),
     HistoricalEvent(
         event_name="2022 Inflation / Rate Hike Bear",
-        peak_date="2022-01-03",
-        trough_date="2022-10-12",
+        peak_date=date(2022, 1, 3),
+        trough_date=date(2022, 10, 12),
         peak_close=4796.56,
         trough_close=3577.03,
         drawdown_pct=-25.4,
@@ -101,8 +102,8 @@ HISTORICAL_EVENTS: list[HistoricalEvent] = [
     ),
     HistoricalEvent(
         event_name="2024.08 Yen Carry Trade Unwind",
-        peak_date="2024-07-16",
-        trough_date="2024-08-05",
+        peak_date=date(2024, 7, 16),
+        trough_date=date(2024, 8, 5),
         peak_close=5667.20,
         trough_close=5186.33,
         drawdown_pct=-8.5,  # included as a sentiment-only turning point
@@ -111,16 +112,16 @@ HISTORICAL_EVENTS: list[HistoricalEvent] = [
     ),
     HistoricalEvent(
         event_name="2025.04 Tariff Shock",
-        peak_date="2025-02-19",
-        trough_date="2025-04-08",
+        peak_date=date(2025, 2, 19),
+        trough_date=date(2025, 4, 8),
         peak_close=6144.15,
         trough_close=4982.77,
         drawdown_pct=-18.9,
         peak_hy=2.84, peak_aaii=-12.0, peak_cnn=50.0, peak_pe=30.0,
         trough_hy=4.61, trough_aaii=-38.0, trough_cnn=4.0, trough_pe=23.0,
     ),
-]
+)
 
 
-def get_historical_events() -> list[HistoricalEvent]:
+def get_historical_events() -> tuple[HistoricalEvent, ...]:
     return HISTORICAL_EVENTS
@@ -0,0 +1,188 @@
+"""
+Shared HTTP session.
+
+All scrapers / overview fetchers hit a handful of hosts (Yahoo, Stooq, CNN,
+FRED, multpl ...) on every refresh. A single pooled `requests.Session` keeps
+TCP/TLS connections alive between calls instead of re-handshaking per
+provider instance or per page refresh.
+
+`requests.Session` is safe to share for plain GETs across the worker threads
+used here; callers must not mutate `SESSION.headers` — pass per-request
+headers instead.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson as _orjson  # type: ignore
+except Exception:  # optional accelerator
+    _orjson = None
+
+DEFAULT_USER_AGENT = "Mozilla/5.0"
+
+# Desktop-browser headers for the HTML scrapers (Barchart, Investing, Barron's,
+# YCharts ...). Shared read-only; add a Referer with `{**BROWSER_HEADERS, ...}`.
+BROWSER_HEADERS: dict[str, str] = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_POOL_SIZE = 32
+
+
+def make_session() -> requests.Session:
+    s = requests.Session()
+    # Retry only transient server errors and connect failures; read timeouts are
+    # not retried and Retry-After is ignored (backoff stays at 0.2s/0.4s) so a
+    # slow upstream cannot stall a dashboard refresh. 429 is deliberately not
+    # retried: hitting a rate-limited host again within a second only prolongs
+    # the throttling.
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=2,
+        backoff_factor=0.2,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    # Accept-Encoding is left to requests' default: gzip/deflate, plus br when
+    # the optional `brotli` package is installed (urllib3 can only advertise
+    # encodings it can decode).
+    s.headers["User-Agent"] = DEFAULT_USER_AGENT
+    s.headers["Connection"] = "keep-alive"
+    return s
+
+
+SESSION: requests.Session = make_session()
+
+
+def cache_dir(*parts: str) -> Path:
+    """
+    On-disk cache directory for raw HTTP bodies (override the root with
+    TRADER_ALERTS_CACHE_DIR). Not created here; writers create it lazily.
+    """
+    root = os.environ.get("TRADER_ALERTS_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "trader_alerts"
+    return base.joinpath(*parts)
+
+
+def _read_until(
+    session: requests.Session,
+    url: str,
+    anchor: bytes,
+    margin: int,
+    cap: int,
+    kwargs: dict[str, Any],
+) -> tuple[bytes, str]:
+    with session.get(url, stream=True, **kwargs) as resp:
+        resp.raise_for_status()
+        buf = bytearray()
+        hit = -1
+        for chunk in resp.iter_content(chunk_size=16 * 1024):
+            buf += chunk
+            if hit < 0:
+                hit = buf.find(anchor, max(0, len(buf) - len(chunk) - len(anchor)))
+            if (hit >= 0 and len(buf) >= hit + len(anchor) + margin) or len(buf) >= cap:
+                break
+        return bytes(buf), resp.encoding or "utf-8"
+
+
+def get_bytes_until(
+    session: requests.Session,
+    url: str,
+    *,
+    anchor: bytes,
+    margin: int = 256,
+    cap: int = 512 * 1024,
+    **kwargs: Any,
+) -> bytes:
+    """
+    GET `url` streaming and stop reading once `anchor` plus `margin` bytes
+    after it have arrived (or `cap` bytes total), for pages where the value
+    sits near the top. Raises on HTTP errors like `raise_for_status()`.
+
+    Without the anchor the body is read up to `cap`, so regex fallbacks still
+    see the page. Stopping early closes the connection instead of returning
+    it to the pool. Returns the raw body, for ASCII-only parsers using bytes
+    patterns (no decode of the page).
+    """
+    return _read_until(session, url, anchor, margin, cap, kwargs)[0]
+
+
+def get_text_until(
+    session: requests.Session,
+    url: str,
+    *,
+    anchor: bytes,
+    margin: int = 256,
+    cap: int = 512 * 1024,
+    **kwargs: Any,
+) -> str:
+    """`get_bytes_until`, decoded with the response encoding."""
+    body, encoding = _read_until(session, url, anchor, margin, cap, kwargs)
+    return body.decode(encoding, errors="replace")
+
+
+_T = TypeVar("_T")
+
+
+def first_result(*fns: Callable[[], _T | None]) -> _T | None:
+    """
+    Hedged request: run `fns` concurrently and return the first non-None
+    result, so one slow source does not cost its full timeout. Exceptions
+    count as None. Slower calls are abandoned (their results are dropped);
+    a single callable is just called inline.
+    """
+    if len(fns) == 1:
+        try:
+            return fns[0]()
+        except Exception:
+            return None
+
+    ex = ThreadPoolExecutor(max_workers=len(fns))
+    try:
+        pending = {ex.submit(fn) for fn in fns}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    result = fut.result()
+                except Exception:
+                    result = None
+                if result is not None:
+                    return result
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+    return None
+
+
+def json_loads(body: bytes | str) -> Any:
+    """
+    Decode a JSON response body (`resp.content`, or already-decoded text).
+    Uses orjson when installed, stdlib json otherwise (which also accepts raw
+    UTF-8/16/32 bytes).
+    """
+    if _orjson is not None:
+        return _orjson.loads(body)
+    return json.loads(body)
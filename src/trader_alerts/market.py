@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+import csv
+import json
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
 from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+from .http import SESSION, cache_dir
 
 
 @dataclass(frozen=True)
@@ -21,6 +31,13 @@ class IndexOverviewRow:
     source_url: str
 
 
+_STOOQ_HEADERS = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "identity"}
+_YAHOO_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "application/json,text/plain,*/*",
+}
+
+
 def _pct_change(last: float, prev: float) -> float:
     if prev == 0:
         return 0.0
@@ -38,9 +55,8 @@ def _fetch_stooq_quote(
     """
     url = "https://stooq.com/q/l/"
     params = {"s": symbol, "f": "sd2t2ohlcv", "h": "", "e": "csv"}
-    headers = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "identity"}
-    s = session or requests.Session()
-    resp = s.get(url, params=params, headers=headers, timeout=(2, 6))
+    s = session or SESSION
+    resp = s.get(url, params=params, headers=_STOOQ_HEADERS, timeout=(2, 6))
     resp.raise_for_status()
     text = (resp.text or "").strip()
     lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
@@ -55,6 +71,102 @@ def _fetch_stooq_quote(
     return (d, c)
 
 
+_STOOQ_CACHE_SAFE_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _stooq_cache_paths(symbol: str, range_key: str) -> tuple[Path, Path]:
+    # One copy per (symbol, date range): world.py's 30-day windows and the
+    # overview's 900-day window for the same index must not evict each other.
+    d = cache_dir("stooq")
+    safe = _STOOQ_CACHE_SAFE_RE.sub("_", symbol.lower())
+    return d / f"{safe}_{range_key}.csv", d / f"{safe}_{range_key}.json"
+
+
+def _prune_stooq_cache(csv_path: Path, range_key: str) -> None:
+    """Drop this symbol's copies for ranges ending before `range_key` (earlier days)."""
+    safe = csv_path.name[: -len(f"_{range_key}.csv")]
+    end = range_key.split("-")[1]
+    pattern = re.compile(re.escape(safe) + r"_(\d{8})-(\d{8})\.(?:csv|json)")
+    for path in csv_path.parent.glob(f"{safe}_*"):
+        m = pattern.fullmatch(path.name)
+        if m and m.group(2) < end:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _read_stooq_cache_meta(meta_path: Path, range_key: str) -> dict[str, Any] | None:
+    """Validators of the cached CSV, only if it was fetched for the same date range."""
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or meta.get("range") != range_key:
+        return None
+    if not (meta.get("etag") or meta.get("last_modified")):
+        return None
+    return meta
+
+
+def _replace_text(path: Path, text: str) -> None:
+    """Write via a unique temp file + os.replace, so readers never see a half-written file."""
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False) as f:
+        f.write(text)
+    try:
+        os.replace(f.name, path)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
+
+def _write_stooq_cache(csv_path: Path, meta_path: Path, range_key: str, resp: requests.Response, text: str) -> None:
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if not (etag or last_modified) or not text:
+        return
+    try:
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        # CSV first: the meta (validators) only points at a complete copy
+        _replace_text(csv_path, text)
+        _replace_text(meta_path, json.dumps({"range": range_key, "etag": etag, "last_modified": last_modified}))
+        _prune_stooq_cache(csv_path, range_key)
+    except OSError:
+        pass
+
+
+def _fetch_stooq_quotes_bulk(
+    symbols: list[str],
+    *,
+    session: requests.Session | None = None,
+) -> dict[str, tuple[date, float]]:
+    """
+    Multi-symbol variant of `_fetch_stooq_quote`: stooq's q/l endpoint takes a
+    comma-separated `s=` list and returns one CSV row per symbol.
+
+    Returns {lowercased symbol: (date, close)}; symbols without data are omitted.
+    """
+    if not symbols:
+        return {}
+    url = "https://stooq.com/q/l/"
+    params = {"s": ",".join(symbols), "f": "sd2t2ohlcv", "h": "", "e": "csv"}
+    s = session or SESSION
+    resp = s.get(url, params=params, headers=_STOOQ_HEADERS, timeout=(2, 6))
+    resp.raise_for_status()
+    out: dict[str, tuple[date, float]] = {}
+    # Symbol,Date,Time,Open,High,Low,Close,Volume
+    for line in (resp.text or "").splitlines()[1:]:
+        parts = line.strip().split(",")
+        if len(parts) < 7:
+            continue
+        try:
+            out[parts[0].lower()] = (date.fromisoformat(parts[1]), float(parts[6]))
+        except ValueError:
+            # "N/D" rows for unknown symbols
+            continue
+    return out
+
+
 def _fetch_stooq_daily_closes(
     symbol: str,
     *,
@@ -62,10 +174,14 @@ def _fetch_stooq_daily_closes(
     end: date,
     session: requests.Session | None = None,
     timeout: tuple[float, float] = (2, 6),
+    tail: int | None = None,
 ) -> list[tuple[date, float]]:
     """
     Stooq CSV：
     - https://stooq.com/q/d/l/?s=^spx&i=d&d1=20240101&d2=20251231
+
+    `tail`: only parse the last N rows (callers that just need recent
+    lookbacks skip parsing the older ~650 rows).
     """
     url = "https://stooq.com/q/d/l/"
     params = {
@@ -74,26 +190,46 @@ def _fetch_stooq_daily_closes(
         "d1": start.strftime("%Y%m%d"),
         "d2": end.strftime("%Y%m%d"),
     }
-    headers = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "identity"}
-    s = session or requests.Session()
+    s = session or SESSION
+    # Conditional GET against the on-disk copy: the CSV is the bulk of the
+    # bytes and rarely changes within a day (the live quote covers the tail).
+    range_key = f"{params['d1']}-{params['d2']}"
+    csv_path, meta_path = _stooq_cache_paths(symbol, range_key)
+    cached_meta = _read_stooq_cache_meta(meta_path, range_key)
+    headers = _STOOQ_HEADERS
+    if cached_meta:
+        headers = dict(_STOOQ_HEADERS)
+        if cached_meta.get("etag"):
+            headers["If-None-Match"] = cached_meta["etag"]
+        if cached_meta.get("last_modified"):
+            headers["If-Modified-Since"] = cached_meta["last_modified"]
     # Dashboard real-time display, avoid long blocking
     resp = s.get(url, params=params, headers=headers, timeout=timeout)
-    resp.raise_for_status()
-    text = resp.text.strip()
+    text = None
+    if resp.status_code == 304 and cached_meta:
+        try:
+            text = csv_path.read_text(encoding="utf-8").strip()
+        except OSError:
+            text = None
+        if text is None:
+            resp = s.get(url, params=params, headers=_STOOQ_HEADERS, timeout=timeout)
+    if text is None:
+        resp.raise_for_status()
+        text = resp.text.strip()
+        _write_stooq_cache(csv_path, meta_path, range_key, resp, text)
     if not text or text.lower().startswith("no data"):
         return []
 
-    rows: list[tuple[date, float]] = []
-    lines = text.splitlines()
     # Date,Open,High,Low,Close,Volume
-    for line in lines[1:]:
-        parts = line.split(",")
-        if len(parts) < 5:
-            continue
-        d = date.fromisoformat(parts[0])
-        c = float(parts[4])
-        rows.append((d, c))
-    return rows
+    # Column-wise parse: rows are split by the C csv reader, then the
+    # date / close columns are converted in bulk with map() instead of
+    # building tuples field-by-field in a Python loop.
+    lines = text.splitlines()
+    body = lines[max(1, len(lines) - tail):] if tail else lines[1:]
+    cells = [c for c in csv.reader(body) if len(c) >= 5]
+    dates = map(date.fromisoformat, [c[0] for c in cells])
+    closes = map(float, [c[4] for c in cells])
+    return list(zip(dates, closes))
 
 
 def _fetch_yahoo_chart(
@@ -113,12 +249,8 @@ def _fetch_yahoo_chart(
     """
     url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
     params = {"range": range_, "interval": interval, "includePrePost": "false"}
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "application/json,text/plain,*/*",
-    }
-    s = session or requests.Session()
-    resp = s.get(url, params=params, headers=headers, timeout=timeout)
+    s = session or SESSION
+    resp = s.get(url, params=params, headers=_YAHOO_HEADERS, timeout=timeout)
     if resp.status_code != 200:
         return []
     try:
@@ -149,6 +281,10 @@ def _fetch_yahoo_chart(
     return out
 
 
+_SYMBOL_OK_RE = re.compile(r"[A-Z0-9-]+")
+
+
+@lru_cache(maxsize=1024)
 def _normalize_stock_symbol(raw: str) -> tuple[str, str] | None:
     s = (raw or "").strip().upper().replace(" ", "")
     if not s:
@@ -158,7 +294,7 @@ def _normalize_stock_symbol(raw: str) -> tuple[str, str] | None:
         s = s[:-3]
     s = s.replace(".", "-")
     # Allow letters, numbers, and dashes only
-    if not all(c.isalnum() or c == "-" for c in s):
+    if _SYMBOL_OK_RE.fullmatch(s) is None:
         return None
     return (f"{s}.US", s)
 
@@ -179,6 +315,50 @@ _DEFAULT_ITEMS: list[dict[str, str]] = [
 ]
 
 
+# (row field, trading days back)
+_LOOKBACKS: tuple[tuple[str, int], ...] = (
+    ("chg_1w_pct", 5),
+    ("chg_1m_pct", 21),
+    ("chg_3m_pct", 63),
+    ("chg_1y_pct", 252),
+)
+
+# Longest lookback in the overview is chg(252) -> 253 closes.
+_OVERVIEW_TAIL = 253
+
+
+def _http_workers(n_items: int) -> int:
+    """Worker count for the overview fan-out; override with TRADER_ALERTS_HTTP_WORKERS."""
+    try:
+        configured = int(os.environ.get("TRADER_ALERTS_HTTP_WORKERS", "0"))
+    except ValueError:
+        configured = 0
+    if configured > 0:
+        return configured
+    return min(32, max(1, n_items * 2))
+
+
+_POOLS: tuple[ThreadPoolExecutor, ThreadPoolExecutor] | None = None
+_POOLS_LOCK = threading.Lock()
+
+
+def _overview_pools() -> tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+    """
+    Process-wide (outer, aux) pools for the overview fan-out. Reused across
+    refreshes so each refresh doesn't spawn and tear down a fresh set of OS
+    threads; idle workers just sit blocked on the queue.
+    """
+    global _POOLS
+    with _POOLS_LOCK:
+        if _POOLS is None:
+            n = _http_workers(16)
+            _POOLS = (
+                ThreadPoolExecutor(max_workers=n, thread_name_prefix="overview"),
+                ThreadPoolExecutor(max_workers=n, thread_name_prefix="overview-aux"),
+            )
+        return _POOLS
+
+
 def get_us_index_overview_rows(extra_symbols: list[str] | None = None) -> list[dict[str, Any]]:
     """
     Live overview rows for the front-end's three market tables.
@@ -190,7 +370,7 @@ def get_us_index_overview_rows(extra_symbols: list[str] | None = None) -> list[d
     """
     end = date.today()
     start = end - timedelta(days=900)  # Enough for 252 trading days + holiday buffer
-    session = requests.Session()
+    session = SESSION
 
     items: list[dict[str, str]] = list(_DEFAULT_ITEMS)
     seen = {it["symbol"].lower() for it in items}
@@ -205,6 +385,19 @@ def get_us_index_overview_rows(extra_symbols: list[str] | None = None) -> list[d
         seen.add(legacy_sym.lower())
         items.append({"symbol": legacy_sym.lower(), "yahoo": ticker, "name": ticker})
 
+    # One stooq quote request for every symbol, issued lazily the first time
+    # any symbol has to fall back to stooq (usually never, Yahoo is primary).
+    quotes_lock = threading.Lock()
+    quotes_future: list[Future] = []
+
+    def _bulk_quotes() -> Future:
+        with quotes_lock:
+            if not quotes_future:
+                quotes_future.append(
+                    aux.submit(_fetch_stooq_quotes_bulk, [it["symbol"] for it in items], session=session)
+                )
+            return quotes_future[0]
+
     def _fetch_one(it: dict[str, str]) -> dict[str, Any] | None:
         legacy_sym = it["symbol"]
         yh = it["yahoo"]
@@ -217,15 +410,25 @@ def get_us_index_overview_rows(extra_symbols: list[str] | None = None) -> list[d
         except Exception:
             series = []
 
-        # Stooq fallback.
+        # Stooq fallback: daily candles and the live quote are independent
+        # requests, issue them concurrently.
         if not series:
+            series_fut = aux.submit(
+                _fetch_stooq_daily_closes,
+                legacy_sym,
+                start=start,
+                end=end,
+                session=session,
+                tail=_OVERVIEW_TAIL,
+            )
+            quotes_fut = _bulk_quotes()
             try:
-                series = _fetch_stooq_daily_closes(legacy_sym, start=start, end=end, session=session)
+                series = series_fut.result()
             except Exception:
                 series = []
             try:
-                quote = _fetch_stooq_quote(legacy_sym, session=session)
-            except Exception:
+                quote = quotes_fut.result().get(legacy_sym.lower())
+            except requests.RequestException:
                 quote = None
             if series and quote is not None:
                 qd, qc = quote
@@ -238,39 +441,37 @@ def get_us_index_overview_rows(extra_symbols: list[str] | None = None) -> list[d
             return None
 
         as_of, last_close = series[-1]
-        closes = [c for _, c in series]
-
-        def chg(n_trading_days: int) -> float | None:
-            idx = len(closes) - 1 - n_trading_days
-            if idx < 0:
-                return None
-            return _pct_change(last_close, closes[idx])
-
-        row = IndexOverviewRow(
-            symbol=legacy_sym,
-            name=name,
-            as_of=as_of.strftime("%m-%d"),
-            close=last_close,
-            chg_1w_pct=chg(5),
-            chg_1m_pct=chg(21),
-            chg_3m_pct=chg(63),
-            chg_1y_pct=chg(252),
-            source_url=f"https://finance.yahoo.com/quote/{yh}",
-        )
-        return asdict(row)
+        # All lookbacks in one pass, indexing the series in place (no copy of
+        # the close column).
+        n = len(series)
+        chg = {
+            key: _pct_change(last_close, series[n - 1 - k][1]) if k < n else None
+            for key, k in _LOOKBACKS
+        }
+
+        # Plain dict (same keys as IndexOverviewRow) -- no dataclass + asdict() deep copy per row.
+        return {
+            "symbol": legacy_sym,
+            "name": name,
+            "as_of": as_of.strftime("%m-%d"),
+            "close": last_close,
+            **chg,
+            "source_url": f"https://finance.yahoo.com/quote/{yh}",
+        }
 
     # Concurrent fetch: don't let one slow symbol stall the whole panel.
+    # `aux` serves the nested stooq fallback requests (a separate pool, so
+    # outer tasks never wait on work queued behind themselves).
     out: list[dict[str, Any]] = []
-    max_workers = min(8, max(1, len(items)))
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futs = {ex.submit(_fetch_one, it): it for it in items}
-        for fut in as_completed(futs):
-            try:
-                row = fut.result()
-            except Exception:
-                row = None
-            if row:
-                out.append(row)
+    ex, aux = _overview_pools()
+    futs = {ex.submit(_fetch_one, it): it for it in items}
+    for fut in as_completed(futs):
+        try:
+            row = fut.result()
+        except Exception:
+            row = None
+        if row:
+            out.append(row)
 
     return out
 
@@ -1,14 +1,28 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 from typing import Any
 
 from .constants import IndicatorId
 
 
-@dataclass(frozen=True)
+def parse_iso_date(ts: str) -> date:
+    """
+    ISO 日期/时间戳 -> date（只取日期部分，不做时区换算）。
+
+    快路径：直接切 `YYYY-MM-DD` 前 10 个字符；其他格式回退 `datetime.fromisoformat`。
+    """
+    if len(ts) >= 10 and ts[4] == "-" and ts[7] == "-" and (len(ts) == 10 or ts[10] in "T "):
+        try:
+            return date(int(ts[0:4]), int(ts[5:7]), int(ts[8:10]))
+        except ValueError:
+            pass
+    return datetime.fromisoformat(ts.replace("Z", "+00:00")).date()
+
+
+@dataclass(frozen=True, slots=True)
 class Observation:
     indicator_id: IndicatorId
     as_of: date
@@ -24,7 +38,7 @@ class AlertLevel(str, Enum):
     NEUTRAL = "中性"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Alert:
     indicator_id: IndicatorId
     level: AlertLevel
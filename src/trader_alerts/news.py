@@ -20,8 +20,7 @@ from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Iterable
 
-import requests
-
+from .http import SESSION
 from .storage import get_cached_news, upsert_cached_news
 
 
@@ -122,7 +121,7 @@ def _http_get(path: str, params: dict[str, Any]) -> list[dict[str, Any]]:
         return []
     p = {**params, "token": key}
     try:
-        resp = requests.get(
+        resp = SESSION.get(
             f"{_FINNHUB_BASE}{path}",
             params=p,
             timeout=_DEFAULT_TIMEOUT,
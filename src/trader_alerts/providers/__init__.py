@@ -1,14 +1,35 @@
-from .cnn import CnnFearGreedProvider
-from .fred import FredProvider
-from .http_json import HttpJsonProvider
-from .manual import ManualProvider
-from .multpl import MultplProvider
-from .nasdaq_pe import Nasdaq100PeProvider
-from .ndtw import NdtwProvider
-from .sp500_rsi import Sp500RsiProvider
-from .tradingeconomics import TradingEconomicsProvider
-from .vix import VixProvider
-from .ycharts import YChartsProvider
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cnn import CnnFearGreedProvider
+    from .fred import FredProvider
+    from .http_json import HttpJsonProvider
+    from .manual import ManualProvider
+    from .multpl import MultplProvider
+    from .nasdaq_pe import Nasdaq100PeProvider
+    from .ndtw import NdtwProvider
+    from .sp500_rsi import Sp500RsiProvider
+    from .tradingeconomics import TradingEconomicsProvider
+    from .vix import VixProvider
+    from .ycharts import YChartsProvider
+
+# 按需导入（PEP 562）：各 provider 模块只在首次访问时加载，缩短 CLI 启动时间
+_LAZY: dict[str, str] = {
+    "CnnFearGreedProvider": ".cnn",
+    "FredProvider": ".fred",
+    "HttpJsonProvider": ".http_json",
+    "ManualProvider": ".manual",
+    "MultplProvider": ".multpl",
+    "Nasdaq100PeProvider": ".nasdaq_pe",
+    "NdtwProvider": ".ndtw",
+    "Sp500RsiProvider": ".sp500_rsi",
+    "TradingEconomicsProvider": ".tradingeconomics",
+    "VixProvider": ".vix",
+    "YChartsProvider": ".ycharts",
+}
 
 __all__ = [
     "CnnFearGreedProvider",
@@ -25,3 +46,14 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str) -> Any:
+    mod = _LAZY.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(mod, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,123 @@
+"""
+Same-day on-disk cache for scraped observations.
+
+The HTML scrapers (multpl, Barron's, Barchart, Investing ...) publish values
+that move at most a few times a day, but every `trader fetch` / dashboard
+refresh re-downloads and re-parses the whole page. `@cached()` stores the
+resulting Observation as JSON under `cache_dir("providers")`, keyed by
+(provider class, method, date), and serves it back while it is younger than
+the TTL.
+
+TTL defaults to 10 minutes (enough to absorb back-to-back refreshes without
+serving stale quotes); override with TRADER_ALERTS_PROVIDER_CACHE_TTL
+(seconds, 0 disables). Explicit refreshes bypass it: set
+`provider.force_refresh = True` before `fetch()`, or pass
+`force_refresh=True` to the decorated method.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable
+
+from ..constants import IndicatorId
+from ..http import cache_dir
+from ..models import Observation
+
+_DEFAULT_TTL = 10 * 60
+
+
+def _ttl(default: float) -> float:
+    raw = os.environ.get("TRADER_ALERTS_PROVIDER_CACHE_TTL")
+    if raw is None:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _path(provider: object, method: str) -> Path:
+    key = f"{type(provider).__name__}.{method}:{date.today().isoformat()}"
+    return cache_dir("providers") / (hashlib.md5(key.encode("utf-8")).hexdigest() + ".json")
+
+
+def _load(path: Path, ttl: float) -> Observation | None:
+    try:
+        if time.time() - path.stat().st_mtime >= ttl:
+            return None
+        d = json.loads(path.read_bytes())
+        return Observation(
+            indicator_id=IndicatorId(d["indicator_id"]),
+            as_of=date.fromisoformat(d["as_of"]),
+            value=float(d["value"]),
+            unit=d["unit"],
+            source=d["source"],
+            meta=d.get("meta"),
+        )
+    except Exception:
+        return None
+
+
+def _store(path: Path, obs: Observation) -> None:
+    try:
+        body = json.dumps(
+            {
+                "indicator_id": obs.indicator_id.value,
+                "as_of": obs.as_of.isoformat(),
+                "value": obs.value,
+                "unit": obs.unit,
+                "source": obs.source,
+                "meta": obs.meta,
+            },
+            ensure_ascii=False,
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp file per writer: concurrent fills of the same key never share a .tmp
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False) as f:
+            f.write(body)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def cached(
+    ttl: float = _DEFAULT_TTL,
+) -> Callable[[Callable[[Any], Observation | None]], Callable[..., Observation | None]]:
+    """
+    Decorate a provider method `(self) -> Observation | None`.
+
+    Only successful results are cached; None / exceptions always fall
+    through to a real fetch next time.
+    """
+
+    def deco(fn: Callable[[Any], Observation | None]) -> Callable[..., Observation | None]:
+        @functools.wraps(fn)
+        def wrapper(self: Any, *, force_refresh: bool = False) -> Observation | None:
+            t = _ttl(ttl)
+            if t <= 0:
+                return fn(self)
+            path = _path(self, fn.__name__)
+            if not (force_refresh or getattr(self, "force_refresh", False)):
+                hit = _load(path, t)
+                if hit is not None:
+                    return hit
+            obs = fn(self)
+            if obs is not None:
+                _store(path, obs)
+            return obs
+
+        return wrapper
+
+    return deco
@@ -1,14 +1,46 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import date
 
 from ..constants import IndicatorId
 from ..models import Observation
 
 
 class Provider(ABC):
+    # 观测日期：批量抓取时由调用方统一设置一次（同一批观测共享同一个日期）；未设置时取当天
+    as_of: date | None = None
+    # 显式刷新（dashboard ?refresh=1 / CLI fetch）时由调用方置 True：跳过 providers._cache 的磁盘缓存
+    force_refresh: bool = False
+
+    def today(self) -> date:
+        return self.as_of or date.today()
+
     @abstractmethod
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
         raise NotImplementedError
 
+    async def afetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
+        # 抓取本身基于共享的 requests.Session（阻塞 I/O），放到线程里跑，供 async 调用方并发等待
+        return await asyncio.to_thread(self.fetch, indicator_ids)
+
+
+async def afetch_all(
+    jobs: Iterable[tuple[Provider, list[IndicatorId]]],
+    *,
+    limit: int = 8,
+) -> list[list[Observation] | BaseException]:
+    """
+    并发执行多个 provider 的 fetch（总耗时≈最慢的一个，而不是逐个相加）。
+
+    结果与 jobs 顺序一致；单个 provider 失败时对应位置是异常对象，不影响其它 provider。
+    """
+    sem = asyncio.Semaphore(limit)
+
+    async def run(provider: Provider, ids: list[IndicatorId]) -> list[Observation]:
+        async with sem:
+            return await provider.afetch(ids)
 
+    return await asyncio.gather(*(run(p, ids) for p, ids in jobs), return_exceptions=True)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from datetime import date, datetime
 from typing import Any
 
 import requests
 
+from ..circuit import guarded_get
 from ..constants import IndicatorId
-from ..models import Observation
+from ..http import BROWSER_HEADERS, SESSION, json_loads
+from ..models import Observation, parse_iso_date
 from .base import Provider
 
 
@@ -25,8 +26,18 @@ class CnnFearGreedProvider(Provider):
     REFERER = "https://edition.cnn.com/markets/fear-and-greed"
     ORIGIN = "https://edition.cnn.com"
 
+    # 关键：需要像浏览器一样带 Referer/Origin/UA，否则可能返回 418（类上构造一次，只读）
+    _HEADERS = {
+        "User-Agent": BROWSER_HEADERS["User-Agent"],
+        "Accept": "application/json,text/plain,*/*",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Referer": REFERER,
+        "Origin": ORIGIN,
+        "Connection": "keep-alive",
+    }
+
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
         want = set(indicator_ids) if indicator_ids else {IndicatorId.CNN_FEAR_GREED_INDEX, IndicatorId.CNN_PUT_CALL_OPTIONS}
@@ -46,24 +57,14 @@ class CnnFearGreedProvider(Provider):
         return out
 
     def _fetch_graphdata(self) -> dict[str, Any]:
-        headers = {
-            # 关键：需要像浏览器一样带 Referer/Origin/UA，否则可能返回 418
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "application/json,text/plain,*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Referer": self.REFERER,
-            "Origin": self.ORIGIN,
-            "Connection": "keep-alive",
-        }
-        resp = self.session.get(self.URL, headers=headers, timeout=20)
+        # 418/5xx/超时后短时间内直接跳过，避免每次刷新都等满超时
+        resp = guarded_get(self.session, self.URL, headers=self._HEADERS, timeout=20, trip_statuses=(418,))
+        if resp is None:
+            raise RuntimeError("CNN graphdata 近期请求失败，暂时跳过。")
         if resp.status_code == 418:
             raise RuntimeError("CNN graphdata 返回 418（被识别为 bot）。请稍后重试或更换网络。")
         resp.raise_for_status()
-        return resp.json()
+        return json_loads(resp.content)
 
     def _parse_fng(self, data: dict[str, Any]) -> Observation | None:
         fg = data.get("fear_and_greed") or {}
@@ -73,10 +74,10 @@ class CnnFearGreedProvider(Provider):
         rating = str(fg.get("rating") or "")
         ts = str(fg.get("timestamp") or "")
 
-        as_of = date.today()
+        as_of = self.today()
         if ts:
             try:
-                as_of = datetime.fromisoformat(ts.replace("Z", "+00:00")).date()
+                as_of = parse_iso_date(ts)
             except Exception:
                 pass
 
@@ -90,21 +91,20 @@ class CnnFearGreedProvider(Provider):
         )
 
     def _find_component(self, data: dict[str, Any], *, keywords: list[str]) -> dict[str, Any] | None:
-        # 1) 常见：顶层 key 就是 component
-        for k, v in data.items():
-            if not isinstance(v, dict):
-                continue
-            lk = k.lower()
-            if all(kw in lk for kw in keywords):
-                return v
-        # 2) 兜底：any keyword match
+        # 单次遍历：
+        # 1) 常见：顶层 key 同时包含全部关键字 -> 直接返回
+        # 2) 兜底：记录第一个命中任一关键字的 component
+        fallback: dict[str, Any] | None = None
         for k, v in data.items():
             if not isinstance(v, dict):
                 continue
             lk = k.lower()
-            if any(kw in lk for kw in keywords):
+            hits = sum(1 for kw in keywords if kw in lk)
+            if hits == len(keywords):
                 return v
-        return None
+            if hits and fallback is None:
+                fallback = v
+        return fallback
 
     def _parse_put_call(self, data: dict[str, Any]) -> Observation | None:
         # Put/Call component（CNN 页面名：put and call options / 5-day avg put/call ratio）
@@ -119,10 +119,10 @@ class CnnFearGreedProvider(Provider):
 
         rating = str(comp.get("rating") or "")
         ts = str(comp.get("timestamp") or "")
-        as_of = date.today()
+        as_of = self.today()
         if ts:
             try:
-                as_of = datetime.fromisoformat(ts.replace("Z", "+00:00")).date()
+                as_of = parse_iso_date(ts)
             except Exception:
                 pass
 
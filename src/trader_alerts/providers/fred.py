@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from datetime import date
+from functools import partial
 from typing import Any
 
 import requests
 
+from ..circuit import guarded_get
 from ..constants import IndicatorId
+from ..http import SESSION, first_result
 from ..models import Observation
 from ..settings import Settings
 from .base import Provider
@@ -26,7 +29,7 @@ class FredProvider(Provider):
 
     def __init__(self, settings: Settings | None = None, session: requests.Session | None = None):
         self.settings = settings or Settings()
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
         out: list[Observation] = []
@@ -39,97 +42,110 @@ class FredProvider(Provider):
         """
         注意：FRED 的 BAMLH0A0HYM2 单位是 Percent。
         本项目为了和“bp 阈值”一致，会把 percent 转成 bp（x100）。
+
+        顺序：TradingEconomics 与 FRED 公开 txt **并发**（hedged request，取先返回的有效结果）
+        → FRED API（有 key 时）→ fredgraph.csv。
         """
         series_id = "BAMLH0A0HYM2"
 
-        # 你的网络环境对 stlouisfed 域名经常超时：优先用 TradingEconomics 抓取（页面可访问）
-        try:
-            te_obs = TradingEconomicsProvider(session=self.session).fetch([IndicatorId.US_HIGH_YIELD_SPREAD])[0]
-            pct = float(te_obs.value)  # percent
-            return Observation(
-                indicator_id=IndicatorId.US_HIGH_YIELD_SPREAD,
-                as_of=te_obs.as_of,
-                value=pct * 100.0,
-                unit="bp",
-                source="TradingEconomics",
-                meta={"url": te_obs.meta.get("url") if te_obs.meta else None, "raw_percent": pct},
-            )
-        except Exception:
-            # 若失败再尝试 FRED（可能超时）
-            pass
+        # 你的网络环境对 stlouisfed 域名经常超时：TE 与 FRED txt 同时发出，谁先成功用谁
+        obs = first_result(self._fetch_via_te, partial(self._fetch_public_txt, series_id))
+        if obs is not None:
+            return obs
 
         api_key = self.settings.fred_api_key
         if api_key:
-            # 取最新一期非空值
-            params = {
-                "series_id": series_id,
-                "api_key": api_key,
-                "file_type": "json",
-                "sort_order": "desc",
-                "limit": 10,
-            }
-            resp = self.session.get(f"{self.BASE}/series/observations", params=params, timeout=20)
-            resp.raise_for_status()
-            data: dict[str, Any] = resp.json()
-            obs_list = data.get("observations") or []
-            for row in obs_list:
-                v = row.get("value")
-                if v is None or v == ".":
-                    continue
-                as_of = date.fromisoformat(row["date"])
-                pct = float(v)
-                return Observation(
-                    indicator_id=IndicatorId.US_HIGH_YIELD_SPREAD,
-                    as_of=as_of,
-                    value=pct * 100.0,
-                    unit="bp",
-                    source=f"FRED_API:{series_id}",
-                    meta={"fred_series_id": series_id, "raw_percent": pct},
-                )
-
-        # 无 key：回退到公开数据文件（无鉴权）
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/plain,text/csv,*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
+            obs = self._fetch_via_api(series_id, api_key)
+            if obs is not None:
+                return obs
+
+        # 最后尝试 fredgraph.csv（通常体积更小/更稳定）
+        resp = guarded_get(
+            self.session,
+            self.PUBLIC_GRAPH_CSV,
+            params={"id": series_id},
+            headers=self._PUBLIC_HEADERS,
+            timeout=(10, 60),
+        )
+        if resp is None:
+            raise RuntimeError(f"FRED fredgraph.csv 近期请求失败，暂时跳过 {series_id}")
+        resp.raise_for_status()
+        obs = self._parse_public_text(resp.text, series_id)
+        if obs is None:
+            raise RuntimeError(f"无法从 FRED 数据文件解析 {series_id}")
+        return obs
 
-        text: str | None = None
-        # 先尝试 /data/*.txt（最接近你提到的 “View All”）
-        try:
-            resp = self.session.get(
-                f"{self.PUBLIC_TXT_BASE}/{series_id}.txt",
-                headers=headers,
-                timeout=(10, 60),
-            )
-            resp.raise_for_status()
-            # 有时会返回 HTML（例如反爬/跳转页），需要识别
-            if "text/html" not in (resp.headers.get("content-type") or "").lower():
-                text = resp.text
-        except Exception:
-            text = None
-
-        # 再尝试 fredgraph.csv（通常体积更小/更稳定）
-        if not text:
-            resp = self.session.get(
-                self.PUBLIC_GRAPH_CSV,
-                params={"id": series_id},
-                headers=headers,
-                timeout=(10, 60),
-            )
-            resp.raise_for_status()
-            text = resp.text
+    def _fetch_via_te(self) -> Observation:
+        te_obs = TradingEconomicsProvider(session=self.session).fetch([IndicatorId.US_HIGH_YIELD_SPREAD])[0]
+        pct = float(te_obs.value)  # percent
+        return Observation(
+            indicator_id=IndicatorId.US_HIGH_YIELD_SPREAD,
+            as_of=te_obs.as_of,
+            value=pct * 100.0,
+            unit="bp",
+            source="TradingEconomics",
+            meta={"url": te_obs.meta.get("url") if te_obs.meta else None, "raw_percent": pct},
+        )
 
-        # 格式类似：
-        # DATE VALUE
-        # 2025-12-24 2.84
-        latest_date: date | None = None
-        latest_value_pct: float | None = None
-        for line in reversed(text.splitlines()):
+    def _fetch_via_api(self, series_id: str, api_key: str) -> Observation | None:
+        # 取最新一期非空值
+        params = {
+            "series_id": series_id,
+            "api_key": api_key,
+            "file_type": "json",
+            "sort_order": "desc",
+            "limit": 10,
+        }
+        resp = self.session.get(f"{self.BASE}/series/observations", params=params, timeout=20)
+        resp.raise_for_status()
+        data: dict[str, Any] = resp.json()
+        obs_list = data.get("observations") or []
+        for row in obs_list:
+            v = row.get("value")
+            if v is None or v == ".":
+                continue
+            as_of = date.fromisoformat(row["date"])
+            pct = float(v)
+            return Observation(
+                indicator_id=IndicatorId.US_HIGH_YIELD_SPREAD,
+                as_of=as_of,
+                value=pct * 100.0,
+                unit="bp",
+                source=f"FRED_API:{series_id}",
+                meta={"fred_series_id": series_id, "raw_percent": pct},
+            )
+        return None
+
+    # 无 key：回退到公开数据文件（无鉴权）
+    _PUBLIC_HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/131.0.0.0 Safari/537.36"
+        ),
+        "Accept": "text/plain,text/csv,*/*",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+
+    def _fetch_public_txt(self, series_id: str) -> Observation | None:
+        # /data/*.txt（最接近你提到的 “View All”）
+        resp = guarded_get(
+            self.session,
+            f"{self.PUBLIC_TXT_BASE}/{series_id}.txt",
+            headers=self._PUBLIC_HEADERS,
+            timeout=(10, 60),
+        )
+        if resp is None:
+            return None
+        resp.raise_for_status()
+        # 有时会返回 HTML（例如反爬/跳转页），需要识别
+        if "text/html" in (resp.headers.get("content-type") or "").lower():
+            return None
+        return self._parse_public_text(resp.text, series_id)
+
+    @staticmethod
+    def _scan_latest(lines: list[str]) -> tuple[date, float] | None:
+        for line in reversed(lines):
             line = line.strip()
             if not line or line.startswith("DATE"):
                 continue
@@ -140,14 +156,25 @@ class FredProvider(Provider):
             if v == ".":
                 continue
             try:
-                latest_date = date.fromisoformat(d)
-                latest_value_pct = float(v)
-                break
+                return date.fromisoformat(d), float(v)
             except Exception:
                 continue
+        return None
+
+    @staticmethod
+    def _parse_public_text(text: str, series_id: str) -> Observation | None:
+        # 格式类似：
+        # DATE VALUE
+        # 2025-12-24 2.84
+        # 只需要最后一个有效行：先扫尾部少量行，找不到（例如末尾连续 "."）再全量扫描
+        lines = text.rstrip().splitlines()
+        latest = FredProvider._scan_latest(lines[-20:])
+        if latest is None:
+            latest = FredProvider._scan_latest(lines)
+        latest_date, latest_value_pct = latest if latest else (None, None)
 
         if latest_date is None or latest_value_pct is None:
-            raise RuntimeError(f"无法从 FRED 数据文件解析 {series_id}")
+            return None
 
         return Observation(
             indicator_id=IndicatorId.US_HIGH_YIELD_SPREAD,
@@ -157,5 +184,3 @@ class FredProvider(Provider):
             source=f"FRED_TXT:{series_id}",
             meta={"fred_series_id": series_id, "raw_percent": latest_value_pct},
         )
-
-
@@ -7,21 +7,37 @@ from typing import Any
 import requests
 import yaml
 
-from ..constants import ALL_INDICATORS, IndicatorId
-from ..models import Observation
+from ..constants import ALL_INDICATORS_SET, IndicatorId
+from ..http import SESSION, json_loads
+from ..models import Observation, parse_iso_date
 from .base import Provider
 
 
-def _dig(obj: Any, path: str) -> Any:
+# C 加速的 YAML loader（libyaml 不可用时回退纯 Python 版本）
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_Path = tuple[tuple[str, "int | None"], ...]
+
+
+def _compile_path(path: str) -> _Path:
+    """
+    预解析 dot-path：每段保存 (key, 下标)，数字段预先转成 int。
     """
-    简单的 dot-path 取值：a.b.0.c
+    return tuple((part, int(part) if part.isdigit() else None) for part in path.split("."))
+
+
+def _dig(obj: Any, path: str | _Path) -> Any:
+    """
+    简单的 dot-path 取值：a.b.0.c（也接受 `_compile_path` 的结果）
     """
     cur = obj
-    for part in path.split("."):
-        if isinstance(cur, list):
-            cur = cur[int(part)]
+    for key, idx in _compile_path(path) if isinstance(path, str) else path:
+        if idx is not None and isinstance(cur, list):
+            cur = cur[idx]
+        elif isinstance(cur, list):
+            cur = cur[int(key)]
         else:
-            cur = cur[part]
+            cur = cur[key]
     return cur
 
 
@@ -47,11 +63,21 @@ class HttpJsonProvider(Provider):
 
     def __init__(self, config_file: str | Path, session: requests.Session | None = None):
         self.config_file = Path(config_file)
-        self.session = session or requests.Session()
-        self.config = yaml.safe_load(self.config_file.read_text(encoding="utf-8")) or {}
+        self.session = session or SESSION
+        self.config = yaml.load(self.config_file.read_text(encoding="utf-8"), Loader=_YAML_LOADER) or {}
+        # 配置加载时一次性解析 value_path / as_of_path，fetch 时不再重复 split
+        self._paths: dict[str, tuple[_Path, _Path | None]] = {}
+        for key, item in (self.config.get("indicators") or {}).items():
+            if not isinstance(item, dict) or not item.get("value_path"):
+                continue
+            as_of_path = item.get("as_of_path")
+            self._paths[key] = (
+                _compile_path(str(item["value_path"])),
+                _compile_path(str(as_of_path)) if as_of_path else None,
+            )
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        wanted = set(indicator_ids) if indicator_ids else set(ALL_INDICATORS)
+        wanted = set(indicator_ids) if indicator_ids else ALL_INDICATORS_SET
         cfg = self.config.get("indicators") or {}
 
         out: list[Observation] = []
@@ -71,16 +97,18 @@ class HttpJsonProvider(Provider):
 
         resp = self.session.request(method, url, headers=headers, params=params, timeout=timeout)
         resp.raise_for_status()
-        data = resp.json()
+        data = json_loads(resp.content)
 
-        value = float(_dig(data, item["value_path"]))
+        paths = self._paths.get(indicator_id.value)
+        value_path, as_of_compiled = paths if paths else (item["value_path"], item.get("as_of_path"))
+        value = float(_dig(data, value_path))
         unit = str(item.get("unit") or "")
         source = str(item.get("source") or "http_json")
 
         as_of_path = item.get("as_of_path")
         if as_of_path:
-            as_of_raw = _dig(data, as_of_path)
-            as_of = date.fromisoformat(str(as_of_raw))
+            as_of_raw = _dig(data, as_of_compiled)
+            as_of = parse_iso_date(str(as_of_raw))
         else:
             as_of = date.today()
 
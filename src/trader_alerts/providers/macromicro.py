@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import re
-from datetime import date
 from html import unescape
 
 import requests
 
+from ..circuit import guarded_get
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION
 from ..models import Observation
 from .base import Provider
 
 
+# 预编译（bytes 模式）：直接在 resp.content 上匹配，只解码捕获到的片段
+_RE_META_DESC = re.compile(rb'<meta[^>]+name="description"[^>]+content="([^"]+)"', re.IGNORECASE)
+_RE_OG_DESC = re.compile(rb'<meta[^>]+property="og:description"[^>]+content="([^"]+)"', re.IGNORECASE)
+_RE_BREADTH = re.compile(rb"Breadth[^0-9]{0,120}([0-9]+(?:\.[0-9]+)?)", re.IGNORECASE)
+_RE_NUMBER = re.compile(r"([0-9]+(?:\.[0-9]+)?)")
+
+
 class MacroMicroProvider(Provider):
     """
     MacroMicro: S&P 500 Breadth
@@ -24,48 +32,44 @@ class MacroMicroProvider(Provider):
     """
 
     URL = "https://en.macromicro.me/charts/81081/S-P-500-Breadth"
+    _HEADERS = {
+        "User-Agent": BROWSER_HEADERS["User-Agent"],
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
 
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.SP500_BREADTH not in set(indicator_ids):
+        if indicator_ids and IndicatorId.SP500_BREADTH not in indicator_ids:
             return []
         obs = self._fetch_breadth_best_effort()
         return [obs] if obs else []
 
     def _fetch_breadth_best_effort(self) -> Observation | None:
         try:
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/131.0.0.0 Safari/537.36"
-                ),
-                "Accept": "text/html,application/xhtml+xml",
-                "Accept-Language": "en-US,en;q=0.9",
-            }
             # 页面可能较慢/反爬：用短超时，避免阻塞仪表盘刷新
-            resp = self.session.get(self.URL, headers=headers, timeout=(5, 12))
-            if resp.status_code >= 400:
+            resp = guarded_get(self.session, self.URL, headers=self._HEADERS, timeout=(5, 12))
+            if resp is None or resp.status_code >= 400:
                 return None
-            html = resp.text
+            body = resp.content
 
             # 1) 尝试 meta description / og:description 中的数值（页面常会把最新值写进去）
-            mm = re.search(r'<meta[^>]+name="description"[^>]+content="([^"]+)"', html, re.IGNORECASE)
-            desc = unescape(mm.group(1)) if mm else ""
+            mm = _RE_META_DESC.search(body)
+            desc = unescape(mm.group(1).decode("utf-8", "replace")) if mm else ""
             if not desc:
-                mm = re.search(r'<meta[^>]+property="og:description"[^>]+content="([^"]+)"', html, re.IGNORECASE)
-                desc = unescape(mm.group(1)) if mm else ""
+                mm = _RE_OG_DESC.search(body)
+                desc = unescape(mm.group(1).decode("utf-8", "replace")) if mm else ""
 
             if desc:
                 # 取 description 中出现的第一个合理数值
-                m = re.search(r"([0-9]+(?:\.[0-9]+)?)", desc)
+                m = _RE_NUMBER.search(desc)
                 if m:
                     v = float(m.group(1))
                     return Observation(
                         indicator_id=IndicatorId.SP500_BREADTH,
-                        as_of=date.today(),
+                        as_of=self.today(),
                         value=v,
                         unit="index",
                         source="MacroMicro",
@@ -73,12 +77,12 @@ class MacroMicroProvider(Provider):
                     )
 
             # 2) 兜底：从页面脚本中找 “Breadth” 附近的数值
-            m = re.search(r"Breadth[^0-9]{0,120}([0-9]+(?:\.[0-9]+)?)", html, re.IGNORECASE)
+            m = _RE_BREADTH.search(body)
             if m:
                 v = float(m.group(1))
                 return Observation(
                     indicator_id=IndicatorId.SP500_BREADTH,
-                    as_of=date.today(),
+                    as_of=self.today(),
                     value=v,
                     unit="index",
                     source="MacroMicro",
@@ -6,8 +6,8 @@ from typing import Any
 
 import yaml
 
-from ..constants import ALL_INDICATORS, IndicatorId
-from ..models import Observation
+from ..constants import ALL_INDICATORS_SET, IndicatorId
+from ..models import Observation, parse_iso_date
 from .base import Provider
 
 
@@ -15,7 +15,7 @@ def _as_date(v: Any) -> date:
     if isinstance(v, date):
         return v
     if isinstance(v, str):
-        return date.fromisoformat(v)
+        return parse_iso_date(v)
     raise ValueError(f"无法解析日期: {v!r}（期望 ISO 格式，如 2025-03-18）")
 
 
@@ -48,7 +48,7 @@ class ManualProvider(Provider):
         if raw is None:
             return []
 
-        wanted = set(indicator_ids) if indicator_ids else set(ALL_INDICATORS)
+        wanted = set(indicator_ids) if indicator_ids else ALL_INDICATORS_SET
         out: list[Observation] = []
 
         if isinstance(raw, dict):
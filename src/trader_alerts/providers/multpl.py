@@ -1,14 +1,46 @@
 from __future__ import annotations
 
 import re
-from datetime import date
 
 import requests
 
 from ..constants import IndicatorId
+from ..http import SESSION, get_bytes_until
 from ..models import Observation
+from ._cache import cached
 from .base import Provider
 
+# 页面锚点/数值都是 ASCII：直接在原始字节上匹配，不解码整页
+_RE_MULTPL_PE = re.compile(
+    rb'content="[^"]*Current\s*S&P\s*500\s*PE\s*Ratio\s*is\s*([0-9]+(?:\.[0-9]+)?)', re.IGNORECASE
+)
+_RE_MULTPL_PE_TEXT = re.compile(rb"Current\s*S&P\s*500\s*PE\s*Ratio.*?([0-9]+(?:\.[0-9]+)?)", re.IGNORECASE)
+_RE_MULTPL_TIME = re.compile(rb"(\d{1,2}:\d{2}\s*[AP]M\s*EST,\s*[^<\n]+)", re.IGNORECASE)
+
+_META_ANCHOR = b"Current S&P 500 PE Ratio is"
+_NUMBER_CHARS = frozenset(b"0123456789.")
+
+
+def _parse_meta_pe(html: bytes) -> float | None:
+    """
+    快路径：meta description 的固定写法 “Current S&P 500 PE Ratio is 31.28”，
+    用 find + 逐字节读数字，不走正则；写法不符时返回 None（由调用方回退到正则）。
+    """
+    i = html.find(_META_ANCHOR)
+    if i < 0:
+        return None
+    k = i + len(_META_ANCHOR)
+    n = len(html)
+    while k < n and html[k] in b" \t":
+        k += 1
+    j = k
+    while j < n and html[j] in _NUMBER_CHARS:
+        j += 1
+    try:
+        return float(html[k:j])
+    except ValueError:
+        return None
+
 
 class MultplProvider(Provider):
     """
@@ -18,45 +50,43 @@ class MultplProvider(Provider):
     """
 
     URL = "https://www.multpl.com/s-p-500-pe-ratio"
+    _HEADERS = {
+        "User-Agent": "trader-alerts/0.1.0 (+https://local)",
+        "Accept": "text/html,application/xhtml+xml",
+    }
 
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.SP500_PE_RATIO not in set(indicator_ids):
+        if indicator_ids and IndicatorId.SP500_PE_RATIO not in indicator_ids:
             return []
         return [self._fetch_sp500_pe_ratio()]
 
+    @cached()
     def _fetch_sp500_pe_ratio(self) -> Observation:
-        headers = {
-            "User-Agent": "trader-alerts/0.1.0 (+https://local)",
-            "Accept": "text/html,application/xhtml+xml",
-        }
-        resp = self.session.get(self.URL, headers=headers, timeout=20)
-        resp.raise_for_status()
-        html = resp.text
+        # 数值在 <head> 的 meta description 里，但 “4:00 PM EST, ...” 时间戳在正文数值块之后：
+        # 读到时间戳（再多读一点以包含日期）为止，没有时间戳时读到 cap
+        html = get_bytes_until(self.session, self.URL, anchor=b" EST,", margin=128, headers=self._HEADERS, timeout=20)
 
         # Multpl 页面主体有时依赖 JS 渲染，但 <meta name="description"> 通常会带 “Current ... is 31.28”
-        m = re.search(
-            r'content="[^"]*Current\s*S&P\s*500\s*PE\s*Ratio\s*is\s*([0-9]+(?:\.[0-9]+)?)',
-            html,
-            re.IGNORECASE,
-        )
-        if not m:
-            # 兼容另一种文本格式（如果未来页面直出）
-            m = re.search(r"Current\s*S&P\s*500\s*PE\s*Ratio.*?([0-9]+(?:\.[0-9]+)?)", html, re.IGNORECASE)
-        if not m:
-            raise RuntimeError("无法从 multpl 页面解析 S&P 500 PE Ratio（meta/文本均未命中，页面结构可能变更）")
-
-        value = float(m.group(1))
+        value = _parse_meta_pe(html)
+        if value is None:
+            m = _RE_MULTPL_PE.search(html)
+            if not m:
+                # 兼容另一种文本格式（如果未来页面直出）
+                m = _RE_MULTPL_PE_TEXT.search(html)
+            if not m:
+                raise RuntimeError("无法从 multpl 页面解析 S&P 500 PE Ratio（meta/文本均未命中，页面结构可能变更）")
+            value = float(m.group(1))
 
         # 尝试提取页面上的时间信息（仅作为 meta，解析失败也没关系）
-        tm = re.search(r"(\d{1,2}:\d{2}\s*[AP]M\s*EST,\s*[^<\n]+)", html, re.IGNORECASE)
-        reported = tm.group(1).strip() if tm else None
+        tm = _RE_MULTPL_TIME.search(html)
+        reported = tm.group(1).decode("utf-8", errors="replace").strip() if tm else None
 
         return Observation(
             indicator_id=IndicatorId.SP500_PE_RATIO,
-            as_of=date.today(),
+            as_of=self.today(),
             value=value,
             unit="x",
             source="multpl.com",
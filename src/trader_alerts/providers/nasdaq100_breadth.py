@@ -1,15 +1,28 @@
 from __future__ import annotations
 
 import re
-from datetime import date, datetime
+from datetime import datetime
 from typing import Any
 
 import requests
 
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION
 from ..models import Observation
+from ._cache import cached
 from .base import Provider
 
+# Barchart 页面上的当前值：三种写法合并成一个正则，一次扫描整页。
+# 各分支放在零宽 lookahead 里，互不“吃掉”对方的文本；取值时仍按分支优先级（与逐个 search 等价）。
+_BARCHART_VALUE_KEYS = ("last", "current", "price")
+# 锚点/数值都是 ASCII：在 resp.content 上用字节正则匹配，不解码整页。
+_RE_BARCHART_VALUE = re.compile(
+    rb'(?=Last Price[^>]*>(?P<last>[\d.]+))'  # 标准格式
+    rb'|(?=currentLast[^>]*>(?P<current>[\d.]+))'  # 另一种格式
+    rb'|(?=price[^>]*>(?P<price>[\d.]+))',  # 简化格式
+    re.IGNORECASE,
+)
+
 
 class Nasdaq100BreadthProvider(Provider):
     """
@@ -29,13 +42,14 @@ class Nasdaq100BreadthProvider(Provider):
     BARCHART_URL = "https://www.barchart.com/stocks/quotes/$NDTW"
 
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.NASDAQ100_ABOVE_20D_AVERAGE not in set(indicator_ids):
+        if indicator_ids and IndicatorId.NASDAQ100_ABOVE_20D_AVERAGE not in indicator_ids:
             return []
         return [self._fetch_breadth()]
 
+    @cached()
     def _fetch_breadth(self) -> Observation:
         # 优先尝试Barchart，因为TradingView可能需要特殊API
         try:
@@ -45,37 +59,26 @@ class Nasdaq100BreadthProvider(Provider):
             raise
 
     def _fetch_from_barchart(self) -> Observation:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-
-        resp = self.session.get(self.BARCHART_URL, headers=headers, timeout=25)
+        resp = self.session.get(self.BARCHART_URL, headers=BROWSER_HEADERS, timeout=25)
         resp.raise_for_status()
-        html = resp.text
+        html = resp.content
 
         # 从Barchart页面查找当前值
         # 页面通常包含类似 "Last Price" 或其他格式
         # 由于这是百分比指标，我们需要查找具体的数值
 
-        # 尝试多种模式匹配
-        patterns = [
-            r'Last Price[^>]*>([\d.]+)',  # 标准格式
-            r'currentLast[^>]*>([\d.]+)',  # 另一种格式
-            r'price[^>]*>([\d.]+)',  # 简化格式
-        ]
+        # 单次扫描，记录每种写法的首个命中（最高优先级命中后即可停止）
+        first: dict[str, bytes] = {}
+        for m in _RE_BARCHART_VALUE.finditer(html):
+            first.setdefault(m.lastgroup, m.group(m.lastgroup))
+            if "last" in first:
+                break
 
         value = None
-        for pattern in patterns:
-            match = re.search(pattern, html, re.IGNORECASE)
-            if match:
+        for key in _BARCHART_VALUE_KEYS:
+            if key in first:
                 try:
-                    value = float(match.group(1))
+                    value = float(first[key])
                     break
                 except ValueError:
                     continue
@@ -84,7 +87,7 @@ class Nasdaq100BreadthProvider(Provider):
             raise ValueError("无法从Barchart页面解析Nasdaq 100 Breadth值")
 
         # 获取当前日期作为数据日期
-        as_of = date.today()
+        as_of = self.today()
 
         return Observation(
             indicator_id=IndicatorId.NASDAQ100_ABOVE_20D_AVERAGE,
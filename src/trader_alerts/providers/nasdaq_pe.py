@@ -1,15 +1,68 @@
 from __future__ import annotations
 
-import json
 import re
-from datetime import date
 
 import requests
 
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION, first_result, json_loads
 from ..models import Observation
+from ._cache import cached
 from .base import Provider
 
+_RE_NEXT_DATA = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(?P<json>[\s\S]*?)</script>', re.IGNORECASE)
+# 在 __NEXT_DATA__ 原文中直接定位同一条记录里 "Nasdaq 100" 之后的 PE 字段（不跨出当前对象）
+_RE_NEXT_DATA_PE = re.compile(
+    r'"Nasdaq 100[^"]*"[^{}]{0,400}?'
+    r'"(?:peRatio|pe|pe_ratio|peRatioTTM|priceEarnings|priceToEarnings)"\s*:\s*"?([0-9]{1,3}(?:\.[0-9]{1,4})?)',
+    re.IGNORECASE,
+)
+_RE_PE_VALUE = re.compile(r"([0-9]{1,3}(?:\.[0-9]{1,4})?)")
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_NASDAQ100_ANCHOR = re.compile(r"Nasdaq\s*100", re.IGNORECASE)
+_RE_NASDAQ100_ROW = re.compile(r"Nasdaq\s*100(.{0,600}?)(([0-9]{1,3}\.[0-9]{1,4}))", re.IGNORECASE)
+# 上面的行正则最多跨越的字符数（锚点 + 600 + 数值），压缩后的窗口至少要这么长
+_ROW_WINDOW = 640
+_RE_WORLDPE_PE = re.compile(r'P/E[^0-9]*([0-9]{1,3}\.[0-9]{1,2})', re.IGNORECASE)
+_RE_WORLDPE_ANY = re.compile(r'([2-5][0-9]\.[0-9]{1,2})(?:\s*x|\s*times?)?')
+_RE_GURUFOCUS_PE = re.compile(r'(?:P/E|PE)[^0-9]*([0-9]{1,3}\.[0-9]{1,2})', re.IGNORECASE)
+_RE_GURUFOCUS_ANY = re.compile(r'([2-5][0-9]\.[0-9]{1,2})(?:\s*x|\s*ratio)?')
+
+
+def _norm_str(x: object) -> str:
+    return str(x).strip().lower()
+
+
+def _to_float_pe(x: object) -> float | None:
+    if isinstance(x, (int, float)):
+        return float(x)
+    if isinstance(x, str):
+        # 允许 "32.65" / "32.65x" / "32.65 x"
+        m = _RE_PE_VALUE.search(x.strip())
+        if m:
+            try:
+                return float(m.group(1))
+            except ValueError:
+                return None
+    return None
+
+
+def _compact_window(html: str, start: int, need: int) -> str:
+    """
+    压缩 html[start:] 开头一段的空白，直到压缩后至少有 need 个字符（或到页尾）。
+    只处理局部切片，不复制整页；空白多时按缺口继续向后扩展原始切片。
+    """
+    end = start + need
+    while True:
+        window = _RE_WHITESPACE.sub(" ", html[start:end])
+        if len(window) >= need or end >= len(html):
+            return window
+        end += max(need - len(window), need)
+
+
+def _is_reasonable_pe(v: float) -> bool:
+    return 5.0 <= v <= 200.0
+
 
 class Nasdaq100PeProvider(Provider):
     """
@@ -31,34 +84,30 @@ class Nasdaq100PeProvider(Provider):
     WORLDPE_URL = "https://worldperatio.com/index/nasdaq-100/"
     GURUFOCUS_URL = "https://www.gurufocus.com/economic_indicators/6778/nasdaq-100-pe-ratio"
 
+    # __NEXT_DATA__ 记录里常见的 PE 字段 / 名称字段
+    _PE_KEYS = ("peRatio", "pe", "pe_ratio", "peRatioTTM", "priceEarnings", "priceToEarnings")
+    _NAME_KEYS = ("name", "label", "title", "description")
+
+    # 参与抓取的数据源（方法名）。目前只用 Barron's：其余源要么是写死的旧值（Macrotrends），
+    # 要么是“任意 20-59 的数字”式宽松解析（WorldPERatio/GuruFocus），不适合自动采用。
+    _SOURCES = ("_fetch_barrons",)
+
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.NASDAQ100_PE_RATIO not in set(indicator_ids):
+        if indicator_ids and IndicatorId.NASDAQ100_PE_RATIO not in indicator_ids:
             return []
         obs = self._fetch_best_effort()
         return [obs] if obs else []
 
+    @cached()
     def _fetch_best_effort(self) -> Observation | None:
-        # 只从Barrons抓取Nasdaq 100 PE数据
-        try:
-            return self._fetch_barrons()
-        except Exception:
-            return None
+        # 多个数据源时并发发出，谁先返回有效结果用谁（不按顺序逐个超时）
+        return first_result(*(getattr(self, name) for name in self._SOURCES))
 
     def _get(self, url: str, *, referer: str | None = None) -> str:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-        if referer:
-            headers["Referer"] = referer
+        headers = {**BROWSER_HEADERS, "Referer": referer} if referer else BROWSER_HEADERS
         try:
             resp = self.session.get(url, headers=headers, timeout=(1, 3))  # 更短超时，避免阻塞
             if resp.status_code >= 400:
@@ -76,13 +125,13 @@ class Nasdaq100PeProvider(Provider):
         #
         # Barron's 页面通常是 Next.js，数据会落在 <script id="__NEXT_DATA__" type="application/json">...</script>
         # 这里优先从该 JSON 中精确找 "Nasdaq 100" 的记录，再取对应的 P/E 字段。
-        data = self._extract_next_data_json(html)
-        if data is not None:
-            value = self._find_nasdaq100_pe_in_json(data)
+        raw = self._extract_next_data_raw(html)
+        if raw is not None:
+            value = self._find_nasdaq100_pe_in_next_data(raw)
             if value is not None:
                 return Observation(
                     indicator_id=IndicatorId.NASDAQ100_PE_RATIO,
-                    as_of=date.today(),
+                    as_of=self.today(),
                     value=value,
                     unit="x",
                     source="Barron's",
@@ -95,7 +144,7 @@ class Nasdaq100PeProvider(Provider):
         if value is not None:
             return Observation(
                 indicator_id=IndicatorId.NASDAQ100_PE_RATIO,
-                as_of=date.today(),
+                as_of=self.today(),
                 value=value,
                 unit="x",
                 source="Barron's",
@@ -105,27 +154,40 @@ class Nasdaq100PeProvider(Provider):
         return None
 
     @staticmethod
-    def _extract_next_data_json(html: str) -> dict | list | None:
+    def _extract_next_data_raw(html: str) -> str | None:
         """
-        从 Next.js 的 __NEXT_DATA__ script 中提取 JSON。
+        从 Next.js 的 __NEXT_DATA__ script 中提取 JSON 原文（不解析）。
         """
-        m = re.search(
-            r'<script[^>]*id="__NEXT_DATA__"[^>]*>(?P<json>[\s\S]*?)</script>',
-            html,
-            re.IGNORECASE,
-        )
+        m = _RE_NEXT_DATA.search(html)
         if not m:
             return None
         raw = (m.group("json") or "").strip()
-        if not raw:
+        return raw or None
+
+    @classmethod
+    def _find_nasdaq100_pe_in_next_data(cls, raw: str) -> float | None:
+        """
+        先在 JSON 原文上做廉价的子串预筛 + 局部正则，只有未命中时才解析整棵树再遍历查找。
+        """
+        if "Nasdaq 100" not in raw and "nasdaq 100" not in raw.lower():
             return None
+
+        idx = raw.find("Nasdaq 100")
+        if idx >= 0:
+            m = _RE_NEXT_DATA_PE.search(raw, max(0, idx - 1))
+            if m:
+                v = float(m.group(1))
+                if _is_reasonable_pe(v):
+                    return v
+
         try:
-            return json.loads(raw)
+            data = json_loads(raw)
         except Exception:
             return None
+        return cls._find_nasdaq100_pe_in_json(data)
 
-    @staticmethod
-    def _find_nasdaq100_pe_in_json(data: object) -> float | None:
+    @classmethod
+    def _find_nasdaq100_pe_in_json(cls, data: object) -> float | None:
         """
         在任意嵌套 JSON 中定位“Nasdaq 100”对应的 P/E 值。
 
@@ -134,92 +196,56 @@ class Nasdaq100PeProvider(Provider):
         - 再从该 dict 中优先读取常见 PE 字段（peRatio/pe/pe_ratio/...）
         """
         target = "nasdaq 100"
-        pe_keys = (
-            "peRatio",
-            "pe",
-            "pe_ratio",
-            "peRatioTTM",
-            "priceEarnings",
-            "priceToEarnings",
-        )
-
-        def norm_str(x: object) -> str:
-            return str(x).strip().lower()
-
-        def to_float(x: object) -> float | None:
-            if isinstance(x, (int, float)):
-                return float(x)
-            if isinstance(x, str):
-                s = x.strip()
-                # 允许 "32.65" / "32.65x" / "32.65 x"
-                m2 = re.search(r"([0-9]{1,3}(?:\.[0-9]{1,4})?)", s)
-                if m2:
-                    try:
-                        return float(m2.group(1))
-                    except ValueError:
-                        return None
-            return None
-
-        def is_reasonable_pe(v: float) -> bool:
-            return 5.0 <= v <= 200.0
-
-        def walk(node: object) -> float | None:
+        pe_keys = cls._PE_KEYS
+        name_keys = cls._NAME_KEYS
+        norm_str = _norm_str
+        to_float = _to_float_pe
+
+        # 显式栈做前序遍历（不走 Python 递归），只把 dict/list 入栈；访问顺序与原递归版一致
+        containers = (dict, list)
+        stack: list[object] = [data] if isinstance(data, containers) else []
+        while stack:
+            node = stack.pop()
             if isinstance(node, dict):
-                # 1) 是否命中“Nasdaq 100”这条记录
-                hay = [
-                    norm_str(node.get(k, ""))  # type: ignore[arg-type]
-                    for k in ("name", "label", "title", "description")
-                    if k in node
-                ]
-                if any(target == s or target in s for s in hay):
+                children = [v for v in node.values() if isinstance(v, containers)]
+                children.reverse()
+                stack.extend(children)
+
+                # 是否命中“Nasdaq 100”这条记录
+                if any(k in node and target in norm_str(node[k]) for k in name_keys):
                     for k in pe_keys:
                         if k in node:
-                            v = to_float(node.get(k))
-                            if v is not None and is_reasonable_pe(v):
-                                return v
-                    # 有些结构会把数据放在 value/values 字段里
-                    for k in ("value", "values", "data"):
-                        if k in node:
-                            v = walk(node.get(k))
-                            if v is not None:
+                            v = to_float(node[k])
+                            if v is not None and _is_reasonable_pe(v):
                                 return v
-
-                # 2) 继续遍历
-                for v in node.values():
-                    out = walk(v)
-                    if out is not None:
-                        return out
-                return None
-            if isinstance(node, list):
-                for it in node:
-                    out = walk(it)
-                    if out is not None:
-                        return out
-                return None
-            return None
-
-        return walk(data)
+                    # 有些结构会把数据放在 value/values/data 字段里：先于其它子节点遍历
+                    for k in ("data", "values", "value"):
+                        if isinstance(node.get(k), containers):
+                            stack.append(node[k])
+            else:
+                children = [v for v in node if isinstance(v, containers)]  # type: ignore[union-attr]
+                children.reverse()
+                stack.extend(children)
+        return None
 
     @staticmethod
     def _extract_pe_from_html_row(html: str) -> float | None:
         """
         只基于“Nasdaq 100”锚点，从其附近提取紧邻的一个合理浮点数。
         """
-        # 先将多余空白压缩，减少跨行/跨标签影响
-        compact = re.sub(r"\s+", " ", html)
-
-        # 在 “Nasdaq 100” 后的有限窗口内找第一个像 PE 的数值（避免扫全页）
-        m = re.search(r"Nasdaq\s*100(.{0,600}?)(([0-9]{1,3}\.[0-9]{1,4}))", compact, re.IGNORECASE)
-        if not m:
-            m = re.search(r"NASDAQ\s*100(.{0,600}?)(([0-9]{1,3}\.[0-9]{1,4}))", compact, re.IGNORECASE)
-        if not m:
-            return None
-
-        try:
-            v = float(m.group(2))
-        except ValueError:
-            return None
-        return v if 5.0 <= v <= 200.0 else None
+        # 页面里可能有多处 “Nasdaq 100”（导航、标题等），逐个锚点尝试
+        for a in _RE_NASDAQ100_ANCHOR.finditer(html):
+            window = _compact_window(html, a.start(), _ROW_WINDOW)
+            m = _RE_NASDAQ100_ROW.match(window)
+            if not m:
+                continue
+            try:
+                v = float(m.group(2))
+            except ValueError:
+                continue
+            if _is_reasonable_pe(v):
+                return v
+        return None
 
     def _fetch_macrotrends(self) -> Observation | None:
         # Macrotrends提供权威的Nasdaq PE数据
@@ -228,7 +254,7 @@ class Nasdaq100PeProvider(Provider):
 
         return Observation(
             indicator_id=IndicatorId.NASDAQ100_PE_RATIO,
-            as_of=date.today(),
+            as_of=self.today(),
             value=30.29,  # Macrotrends最新数据: 2025-12-26
             unit="x",
             source="Macrotrends",
@@ -246,10 +272,10 @@ class Nasdaq100PeProvider(Provider):
 
         # 匹配 worldperatio.com 中的 PE 值 (通常是两位小数，如 34.15)
         # 查找包含 "P/E Ratio" 或类似文本附近的数值
-        m = re.search(r'P/E[^0-9]*([0-9]{1,3}\.[0-9]{1,2})', html, re.IGNORECASE)
+        m = _RE_WORLDPE_PE.search(html)
         if not m:
             # 备选：查找任何看起来像PE值的数值（20-50之间）
-            m = re.search(r'([2-5][0-9]\.[0-9]{1,2})(?:\s*x|\s*times?)?', html)
+            m = _RE_WORLDPE_ANY.search(html)
 
         if m:
             try:
@@ -258,7 +284,7 @@ class Nasdaq100PeProvider(Provider):
                 if 10 <= value <= 100:
                     return Observation(
                         indicator_id=IndicatorId.NASDAQ100_PE_RATIO,
-                        as_of=date.today(),
+                        as_of=self.today(),
                         value=value,
                         unit="x",
                         source="WorldPERatio",
@@ -275,10 +301,10 @@ class Nasdaq100PeProvider(Provider):
 
         # 匹配 GuruFocus 中的 PE 值
         # 查找包含 "P/E" 或 "PE" 文本附近的数值
-        m = re.search(r'(?:P/E|PE)[^0-9]*([0-9]{1,3}\.[0-9]{1,2})', html, re.IGNORECASE)
+        m = _RE_GURUFOCUS_PE.search(html)
         if not m:
             # 备选：查找表格或数据区域中的PE值
-            m = re.search(r'([2-5][0-9]\.[0-9]{1,2})(?:\s*x|\s*ratio)?', html)
+            m = _RE_GURUFOCUS_ANY.search(html)
 
         if m:
             try:
@@ -287,7 +313,7 @@ class Nasdaq100PeProvider(Provider):
                 if 10 <= value <= 100:
                     return Observation(
                         indicator_id=IndicatorId.NASDAQ100_PE_RATIO,
-                        as_of=date.today(),
+                        as_of=self.today(),
                         value=value,
                         unit="x",
                         source="GuruFocus",
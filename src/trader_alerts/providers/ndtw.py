@@ -2,14 +2,21 @@ from __future__ import annotations
 
 import html as _html
 import re
-from datetime import date
 
 import requests
 
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION, get_text_until
 from ..models import Observation
+from ._cache import cached
 from .base import Provider
 
+# 直接在原始 HTML 上匹配（引号可能是 &quot; 实体），不必先对整页做 html.unescape
+_RE_NDTW_DAILY = re.compile(
+    r'(?:&quot;|")dailyLastPrice(?:&quot;|")\s*:\s*(?:&quot;|")([0-9]{1,3}(?:\.[0-9]+)?)(?:&quot;|")'
+)
+_RE_PERCENT = re.compile(r"([0-9]{1,3}(?:\.[0-9]+)?)\s*%")
+
 
 class NdtwProvider(Provider):
     """
@@ -28,15 +35,31 @@ class NdtwProvider(Provider):
     BARCHART_URL = "https://www.barchart.com/stocks/quotes/$NDTW"
     TRADINGVIEW_URL = "https://www.tradingview.com/symbols/INDEX-NDTW/"
 
+    # 与 "20-Day"、"Above"、"NDTW" 等上下文锚定的百分比（按优先级）
+    _CONTEXT_PATTERNS: tuple[re.Pattern[str], ...] = tuple(
+        re.compile(p, re.IGNORECASE | re.DOTALL)
+        for p in (
+            # 匹配 "20-Day Average" 或类似文本后的百分比
+            r"(?:20[-\s]?Day[-\s]?Average|Above[-\s]?20[-\s]?Day|Stocks[-\s]?Above[-\s]?20[-\s]?Day).{0,300}?([0-9]{1,3}(?:\.[0-9]+)?)\s*%",
+            # 匹配百分比值前的 "20-Day" 相关文本
+            r"([0-9]{1,3}(?:\.[0-9]+)?)\s*%.{0,300}?(?:20[-\s]?Day[-\s]?Average|Above[-\s]?20[-\s]?Day)",
+            # 匹配包含 NDTW 或 $NDTW 附近的百分比
+            r"(?:\$?NDTW|INDEX-NDTW|Nasdaq[-\s]?100[-\s]?Stocks[-\s]?Above).{0,200}?([0-9]{1,3}(?:\.[0-9]+)?)\s*%",
+            # 匹配表格中的 "20-Day" 列
+            r"20[-\s]?Day[^>]*>.{0,300}?([0-9]{1,3}(?:\.[0-9]+)?)\s*%",
+        )
+    )
+
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.NASDAQ100_ABOVE_20D_MA not in set(indicator_ids):
+        if indicator_ids and IndicatorId.NASDAQ100_ABOVE_20D_MA not in indicator_ids:
             return []
         obs = self._fetch_best_effort()
         return [obs] if obs else []
 
+    @cached()
     def _fetch_best_effort(self) -> Observation | None:
         # 优先尝试从网页抓取（按优先级顺序）
         for fn in (self._fetch_barchart, self._fetch_tradingview):
@@ -52,19 +75,12 @@ class NdtwProvider(Provider):
         # 如果所有抓取都失败，返回 None
         return None
 
-    def _get(self, url: str, *, referer: str | None = None) -> str:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-        if referer:
-            headers["Referer"] = referer
+    def _get(self, url: str, *, referer: str | None = None, until: bytes | None = None) -> str:
+        headers = {**BROWSER_HEADERS, "Referer": referer} if referer else BROWSER_HEADERS
         try:
+            if until is not None:
+                # 只读到锚点附近即可（例如 Barchart 的 dailyLastPrice），不下载整页
+                return get_text_until(self.session, url, anchor=until, margin=128, headers=headers, timeout=(5, 12))
             resp = self.session.get(url, headers=headers, timeout=(5, 12))
             if resp.status_code >= 400:
                 return ""
@@ -80,28 +96,16 @@ class NdtwProvider(Provider):
         if not html:
             return None
 
-        # 更精确的上下文匹配模式
-        # 1. 匹配 "20-Day" 或 "20 Day" 附近的百分比数值
-        context_patterns = [
-            # 匹配 "20-Day Average" 或类似文本后的百分比
-            r"(?:20[-\s]?Day[-\s]?Average|Above[-\s]?20[-\s]?Day|Stocks[-\s]?Above[-\s]?20[-\s]?Day).{0,300}?([0-9]{1,3}(?:\.[0-9]+)?)\s*%",
-            # 匹配百分比值前的 "20-Day" 相关文本
-            r"([0-9]{1,3}(?:\.[0-9]+)?)\s*%.{0,300}?(?:20[-\s]?Day[-\s]?Average|Above[-\s]?20[-\s]?Day)",
-            # 匹配包含 NDTW 或 $NDTW 附近的百分比
-            r"(?:\$?NDTW|INDEX-NDTW|Nasdaq[-\s]?100[-\s]?Stocks[-\s]?Above).{0,200}?([0-9]{1,3}(?:\.[0-9]+)?)\s*%",
-            # 匹配表格中的 "20-Day" 列
-            r"20[-\s]?Day[^>]*>.*?([0-9]{1,3}(?:\.[0-9]+)?)\s*%",
-        ]
-
-        for p in context_patterns:
-            m = re.search(p, html, re.IGNORECASE | re.DOTALL)
+        # 1. 更精确的上下文匹配：匹配 "20-Day" 或 "20 Day" 附近的百分比数值
+        for p in self._CONTEXT_PATTERNS:
+            m = p.search(html)
             if m:
                 v = float(m.group(1))
                 if 0 <= v <= 100:
                     return v
 
         # 2. 如果没有找到上下文匹配，查找所有百分比值，但优先选择 20-100 范围内的值（更可能是正确的）
-        all_percentages = re.findall(r"([0-9]{1,3}(?:\.[0-9]+)?)\s*%", html, re.IGNORECASE)
+        all_percentages = _RE_PERCENT.findall(html)
         candidates = []
         for match in all_percentages:
             v = float(match)
@@ -127,14 +131,13 @@ class NdtwProvider(Provider):
         return None
 
     def _fetch_barchart(self) -> Observation | None:
-        html = self._get(self.BARCHART_URL, referer="https://www.barchart.com/")
+        html = self._get(self.BARCHART_URL, referer="https://www.barchart.com/", until=b"dailyLastPrice")
         if not html:
             return None
 
         # Barchart 页面里通常有一段 JSON（HTML entity 编码），包含 dailyLastPrice（对 $NDTW 来说就是百分比数值）
         # 例如：&quot;dailyLastPrice&quot;:&quot;59.40&quot;
-        unescaped = _html.unescape(html)
-        m = re.search(r'"dailyLastPrice"\s*:\s*"([0-9]{1,3}(?:\.[0-9]+)?)"', unescaped)
+        m = _RE_NDTW_DAILY.search(html)
         if m:
             try:
                 v = float(m.group(1))
@@ -145,12 +148,15 @@ class NdtwProvider(Provider):
 
         # 兼容：如果未来字段名变化，再退回到旧的“上下文百分比”解析（仍然锚定 20-Day/NDTW 相关文本）
         if v is None:
-            v = self._parse_percentage_from_html(unescaped)
+            # 命中了锚点说明正文在锚点后被截断：回退解析要看整页，重新完整读取一次
+            if "dailyLastPrice" in html:
+                html = self._get(self.BARCHART_URL, referer="https://www.barchart.com/")
+            v = self._parse_percentage_from_html(_html.unescape(html))
         if v is None:
             return None
         return Observation(
             indicator_id=IndicatorId.NASDAQ100_ABOVE_20D_MA,
-            as_of=date.today(),
+            as_of=self.today(),
             value=v,
             unit="percent",
             source="Barchart.com",
@@ -164,7 +170,7 @@ class NdtwProvider(Provider):
             return None
         return Observation(
             indicator_id=IndicatorId.NASDAQ100_ABOVE_20D_MA,
-            as_of=date.today(),
+            as_of=self.today(),
             value=v,
             unit="percent",
             source="TradingView",
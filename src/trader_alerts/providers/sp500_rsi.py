@@ -1,15 +1,51 @@
 from __future__ import annotations
 
 import re
-from datetime import date
 
 import requests
 
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION
 from ..market import _fetch_yahoo_chart
 from ..models import Observation
+from ._cache import cached
 from .base import Provider
 
+# Investing.com 技术面表格里的 RSI(14) 行（按严格程度排序）；以下各模式都以该锚点开头
+_RE_INVESTING_ANCHOR = re.compile(r"RSI\s*\(\s*14\s*\)", re.IGNORECASE)
+_RE_INVESTING_ROW = re.compile(
+    r"RSI\s*\(\s*14\s*\)\s*"
+    r"</td>\s*"
+    r"<td[^>]*>\s*"
+    r"([0-9]{1,3}(?:\.[0-9]+)?)\s*"
+    r"</td>\s*"
+    r"<td[^>]*>\s*"
+    r"(Buy|Sell|Neutral)\s*"
+    r"</td>",
+    re.IGNORECASE,
+)
+# td 里包了一层 span/div：只允许跳过标签和空白（不用 .*? + DOTALL，避免跨行回溯扫全页）
+_TAGS = r"(?:<[^>]*>|\s){0,20}"
+_RE_INVESTING_ROW_LOOSE = re.compile(
+    r"RSI\s*\(\s*14\s*\)\s*"
+    r"</td>\s*"
+    r"<td[^>]*>" + _TAGS +
+    r"([0-9]{1,3}(?:\.[0-9]+)?)" + _TAGS +
+    r"</td>\s*"
+    r"<td[^>]*>" + _TAGS +
+    r"(Buy|Sell|Neutral)" + _TAGS +
+    r"</td>",
+    re.IGNORECASE,
+)
+_RE_INVESTING_JSON = re.compile(
+    r"RSI\s*\(\s*14\s*\).{0,300}?"
+    r"(?:\"value\"|value|data-value)\s*[:=]\s*\"?([0-9]{1,3}(?:\.[0-9]+)?)\"?.{0,300}?"
+    r"(?:\"action\"|action)\s*[:=]\s*\"?(Buy|Sell|Neutral)\"?",
+    re.IGNORECASE | re.DOTALL,
+)
+_RE_INVESTING_TAIL = re.compile(r"RSI\s*\(\s*14\s*\)(.{0,200})", re.IGNORECASE | re.DOTALL)
+_RE_NUMBER = re.compile(r"([0-9]{1,3}(?:\.[0-9]+)?)")
+
 
 def compute_wilder_rsi(closes: list[float], period: int = 14) -> float | None:
     """
@@ -60,15 +96,27 @@ class Sp500RsiProvider(Provider):
     INVESTING_URL = "https://www.investing.com/indices/us-spx-500-technical"
     YAHOO_SYMBOL = "^GSPC"
 
+    # 常见形式（不同站点可能会出现的 RSI(14) / Relative Strength Index (14) / RSI - Relative Strength Index）
+    # 注意：不要使用过宽的 "\bRSI\b ... number" 规则，避免误抓页面其它数字（云端更易触发反爬页面）。
+    # 三种写法合并为一个正则单次扫描；分支放在零宽 lookahead 里互不吞掉文本，取值时按 r0 > r1 > r2 的优先级。
+    _RSI_KEYS = ("r0", "r1", "r2")
+    _RSI_COMBINED = re.compile(
+        r"(?=Relative\s+Strength\s+Index\s*\(14\)[^0-9]{0,80}(?P<r0>[0-9]{1,3}(?:\.[0-9]+)?))"
+        r"|(?=RSI\s*\(14\)[^0-9]{0,80}(?P<r1>[0-9]{1,3}(?:\.[0-9]+)?))"
+        r"|(?=RSI\s*-\s*Relative\s+Strength\s+Index[^0-9]{0,120}(?P<r2>[0-9]{1,3}(?:\.[0-9]+)?))",
+        re.IGNORECASE,
+    )
+
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.SP500_RSI not in set(indicator_ids):
+        if indicator_ids and IndicatorId.SP500_RSI not in indicator_ids:
             return []
         obs = self._fetch_best_effort()
         return [obs] if obs else []
 
+    @cached()
     def _fetch_best_effort(self) -> Observation | None:
         obs = self._fetch_from_yahoo()
         if obs is not None:
@@ -112,17 +160,7 @@ class Sp500RsiProvider(Provider):
         )
 
     def _get(self, url: str, *, referer: str | None = None) -> str:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-        if referer:
-            headers["Referer"] = referer
+        headers = {**BROWSER_HEADERS, "Referer": referer} if referer else BROWSER_HEADERS
         resp = self.session.get(url, headers=headers, timeout=(5, 12))
         if resp.status_code >= 400:
             return ""
@@ -132,17 +170,14 @@ class Sp500RsiProvider(Provider):
         if not html:
             return None
 
-        # 常见形式（不同站点可能会出现的 RSI(14) / Relative Strength Index (14) / RSI - Relative Strength Index）
-        # 注意：不要使用过宽的 "\bRSI\b ... number" 规则，避免误抓页面其它数字（云端更易触发反爬页面）。
-        patterns = [
-            r"Relative\s+Strength\s+Index\s*\(14\)[^0-9]{0,80}([0-9]{1,3}(?:\.[0-9]+)?)",
-            r"RSI\s*\(14\)[^0-9]{0,80}([0-9]{1,3}(?:\.[0-9]+)?)",
-            r"RSI\s*-\s*Relative\s+Strength\s+Index[^0-9]{0,120}([0-9]{1,3}(?:\.[0-9]+)?)",
-        ]
-        for p in patterns:
-            m = re.search(p, html, re.IGNORECASE)
-            if m:
-                v = float(m.group(1))
+        first: dict[str, str] = {}
+        for m in self._RSI_COMBINED.finditer(html):
+            first.setdefault(m.lastgroup, m.group(m.lastgroup))
+            if "r0" in first:
+                break
+        for key in self._RSI_KEYS:
+            if key in first:
+                v = float(first[key])
                 if 0 <= v <= 100:
                     return v
         return None
@@ -158,61 +193,40 @@ class Sp500RsiProvider(Provider):
         if not html:
             return None
 
+        # 先定位第一个 RSI(14) 锚点：页面里没有就直接返回，有则后续各模式都从锚点处开始搜索，
+        # 不再让带 DOTALL/.*? 的模式从头扫整页
+        anchor = _RE_INVESTING_ANCHOR.search(html)
+        if not anchor:
+            return None
+        pos = anchor.start()
+
         # 优先：严格匹配整行，避免误抓 RSI(14) 附近其它数字
         # 典型结构（表格行）：
         # <td>RSI(14)</td><td>69.858</td><td>Buy</td>
-        m = re.search(
-            r"RSI\s*\(\s*14\s*\)\s*"
-            r"</td>\s*"
-            r"<td[^>]*>\s*"
-            r"([0-9]{1,3}(?:\.[0-9]+)?)\s*"
-            r"</td>\s*"
-            r"<td[^>]*>\s*"
-            r"(Buy|Sell|Neutral)\s*"
-            r"</td>",
-            html,
-            re.IGNORECASE | re.DOTALL,
-        )
+        m = _RE_INVESTING_ROW.search(html, pos)
         if m:
             v = float(m.group(1))
             if 0 <= v <= 100:
                 return v
 
         # 兜底：有些情况下 td 里会包一层 span/div
-        m = re.search(
-            r"RSI\s*\(\s*14\s*\)\s*"
-            r"</td>\s*"
-            r"<td[^>]*>.*?"
-            r"([0-9]{1,3}(?:\.[0-9]+)?)"
-            r".*?</td>\s*"
-            r"<td[^>]*>.*?"
-            r"(Buy|Sell|Neutral)"
-            r".*?</td>",
-            html,
-            re.IGNORECASE | re.DOTALL,
-        )
+        m = _RE_INVESTING_ROW_LOOSE.search(html, pos)
         if m:
             v = float(m.group(1))
             if 0 <= v <= 100:
                 return v
 
         # 再兜底：如果页面把表格数据塞在脚本 JSON 里（key/value/action）
-        m = re.search(
-            r"RSI\s*\(\s*14\s*\).*?"
-            r"(?:\"value\"|value|data-value)\s*[:=]\s*\"?([0-9]{1,3}(?:\.[0-9]+)?)\"?.*?"
-            r"(?:\"action\"|action)\s*[:=]\s*\"?(Buy|Sell|Neutral)\"?",
-            html,
-            re.IGNORECASE | re.DOTALL,
-        )
+        m = _RE_INVESTING_JSON.search(html, pos)
         if m:
             v = float(m.group(1))
             if 0 <= v <= 100:
                 return v
 
         # 兜底：抓取 RSI(14) 后 0~200 字符内出现的第一个数值
-        m = re.search(r"RSI\s*\(\s*14\s*\)(.{0,200})", html, re.IGNORECASE | re.DOTALL)
+        m = _RE_INVESTING_TAIL.search(html, pos)
         if m:
-            mm = re.search(r"([0-9]{1,3}(?:\.[0-9]+)?)", m.group(1))
+            mm = _RE_NUMBER.search(m.group(1))
             if mm:
                 v = float(mm.group(1))
                 if 0 <= v <= 100:
@@ -227,7 +241,7 @@ class Sp500RsiProvider(Provider):
             return None
         return Observation(
             indicator_id=IndicatorId.SP500_RSI,
-            as_of=date.today(),
+            as_of=self.today(),
             value=v,
             unit="0-100",
             source="Investing.com",
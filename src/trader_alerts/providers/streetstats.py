@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 import re
-from datetime import date
 
 import requests
 
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION
 from ..models import Observation
 from .base import Provider
 
+# RSI 提取（按优先级）：正文文本 → JSON 字段 → rsiXX / RSI(14)=XX。
+# 三种写法合并为一个正则单次扫描；分支放在零宽 lookahead 里互不吞掉文本，取值时仍按上述优先级。
+_RSI_KEYS = ("v_text", "v_json", "v_bare")
+_RSI_COMBINED = re.compile(
+    r"(?=Relative\s+Strength\s+Index[^0-9]{0,80}(?P<v_text>[0-9]{1,3}(?:\.[0-9]+)?))"
+    r'|(?="rsi"\s*:\s*(?P<v_json>[0-9]{1,3}(?:\.[0-9]+)?))'
+    r"|(?=\bRSI\b[^0-9]{0,20}(?P<v_bare>[0-9]{1,3}(?:\.[0-9]+)?))",
+    re.IGNORECASE,
+)
+
 
 class StreetStatsProvider(Provider):
     """
@@ -21,52 +31,40 @@ class StreetStatsProvider(Provider):
     URL = "https://streetstats.finance/markets/breadth-momentum/SP500"
 
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.SP500_RSI not in set(indicator_ids):
+        if indicator_ids and IndicatorId.SP500_RSI not in indicator_ids:
             return []
         obs = self._fetch_sp500_rsi()
         return [obs] if obs else []
 
     def _fetch_sp500_rsi(self) -> Observation | None:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
         # 页面用于仪表盘展示，超时要短一些，避免阻塞刷新
-        resp = self.session.get(self.URL, headers=headers, timeout=(5, 12))
+        resp = self.session.get(self.URL, headers=BROWSER_HEADERS, timeout=(5, 12))
         resp.raise_for_status()
         html = resp.text
 
         # 1) 尝试基于文本提示提取（最直观）
         # 例："... Relative Strength Index ... 56.78 ..."
-        m = re.search(
-            r"Relative\s+Strength\s+Index[^0-9]{0,80}([0-9]{1,3}(?:\.[0-9]+)?)",
-            html,
-            re.IGNORECASE,
-        )
-        if not m:
-            # 2) 兜底：尝试常见 JSON 字段名
-            m = re.search(r'"rsi"\s*:\s*([0-9]{1,3}(?:\.[0-9]+)?)', html, re.IGNORECASE)
-        if not m:
-            # 3) 再兜底：rsiXX / RSI(14)=XX 之类格式
-            m = re.search(r"\bRSI\b[^0-9]{0,20}([0-9]{1,3}(?:\.[0-9]+)?)", html, re.IGNORECASE)
-        if not m:
+        # 2) 兜底：尝试常见 JSON 字段名
+        # 3) 再兜底：rsiXX / RSI(14)=XX 之类格式
+        first: dict[str, str] = {}
+        for m in _RSI_COMBINED.finditer(html):
+            first.setdefault(m.lastgroup, m.group(m.lastgroup))
+            if "v_text" in first:
+                break
+        raw = next((first[k] for k in _RSI_KEYS if k in first), None)
+        if raw is None:
             return None
 
-        v = float(m.group(1))
+        v = float(raw)
         if v < 0 or v > 1000:
             return None
 
         return Observation(
             indicator_id=IndicatorId.SP500_RSI,
-            as_of=date.today(),
+            as_of=self.today(),
             value=v,
             unit="0-100",
             source="StreetStats",
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import re
-from datetime import date, datetime
+from datetime import date
 
 import requests
 
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION, get_text_until
 from ..models import Observation
 from .base import Provider
 
+_META_DESC_RE = re.compile(r'<meta[^>]+id="metaDesc"[^>]+content="([^"]+)"', re.IGNORECASE)
+_WAS_PCT_RE = re.compile(r"\bwas\s*([0-9]+(?:\.[0-9]+)?)\s*%", re.IGNORECASE)
+_PCT_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*%")
+_TE_LASTUPDATE_RE = re.compile(r"TELastUpdate\s*=\s*'(\d{8})\d{0,6}'")
+_LASTUPDATE_RE = re.compile(r"\bLastUpdate\s*=\s*'(\d{8})\d{0,6}'")
+
 
 class TradingEconomicsProvider(Provider):
     """
@@ -28,68 +35,64 @@ class TradingEconomicsProvider(Provider):
     )
 
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.US_HIGH_YIELD_SPREAD not in set(indicator_ids):
+        if indicator_ids and IndicatorId.US_HIGH_YIELD_SPREAD not in indicator_ids:
             return []
         return [self._fetch_hy_oas_percent()]
 
     def _fetch_hy_oas_percent(self) -> Observation:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-        resp = self.session.get(self.URL, headers=headers, timeout=(10, 35))
-        resp.raise_for_status()
-        html = resp.text
+        # 页面里可能有多个 TELastUpdate（取最新的一条），正文兜底也要看到页面主体：
+        # 必须读完整个文档才算看全所有标记，所以读到 </html> 为止；上限 2MB 防止异常大的响应
+        html = get_text_until(
+            self.session,
+            self.URL,
+            anchor=b"</html>",
+            margin=0,
+            cap=2_000_000,
+            headers=BROWSER_HEADERS,
+            timeout=(10, 35),
+        )
 
         # 优先从 metaDesc（description）中提取当前值（最稳定）
         # 示例：
         # <meta id="metaDesc" name="description" content="... Spread was 2.83% in December of 2025 ...">
         meta_desc = None
-        mm = re.search(r'<meta[^>]+id="metaDesc"[^>]+content="([^"]+)"', html, re.IGNORECASE)
+        mm = _META_DESC_RE.search(html)
         if mm:
             meta_desc = mm.group(1)
 
         value: float | None = None
         if meta_desc:
-            m = re.search(r"\bwas\s*([0-9]+(?:\.[0-9]+)?)\s*%", meta_desc, re.IGNORECASE)
+            m = _WAS_PCT_RE.search(meta_desc)
             if not m:
-                m = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*%", meta_desc)
+                m = _PCT_RE.search(meta_desc)
             if m:
                 value = float(m.group(1))
 
         # 兜底：从正文里找一个 “x.xx%” 值（尽量避开 100% 等布局相关数值）
         if value is None:
-            candidates = [float(x) for x in re.findall(r"([0-9]+(?:\.[0-9]+)?)\s*%", html)]
-            # 经验：OAS% 通常 < 30；100% 之类大概率是无关值
-            candidates = [x for x in candidates if x < 30]
-            if candidates:
-                value = candidates[0]
+            # 经验：OAS% 通常 < 30；100% 之类大概率是无关值。逐个扫描，命中第一个即停
+            value = next((v for m in _PCT_RE.finditer(html) if (v := float(m.group(1))) < 30), None)
 
         if value is None:
             raise RuntimeError("无法从 TradingEconomics 页面解析当前 OAS 数值（%）")
 
         # 尝试从页面里的 TELastUpdate=YYYYMMDD... 推导日期
         # 页面里可能有多个 TELastUpdate，取最新的一条
-        as_of = date.today()
+        as_of = self.today()
         update_dates: list[date] = []
-        for ymd in re.findall(r"TELastUpdate\s*=\s*'(\d{8})\d{0,6}'", html):
+        for ymd in _TE_LASTUPDATE_RE.findall(html):
             try:
-                update_dates.append(datetime.strptime(ymd, "%Y%m%d").date())
-            except Exception:
+                update_dates.append(date(int(ymd[:4]), int(ymd[4:6]), int(ymd[6:8])))
+            except ValueError:
                 continue
         if not update_dates:
-            for ymd in re.findall(r"\bLastUpdate\s*=\s*'(\d{8})\d{0,6}'", html):
+            for ymd in _LASTUPDATE_RE.findall(html):
                 try:
-                    update_dates.append(datetime.strptime(ymd, "%Y%m%d").date())
-                except Exception:
+                    update_dates.append(date(int(ymd[:4]), int(ymd[4:6]), int(ymd[6:8])))
+                except ValueError:
                     continue
         if update_dates:
             as_of = max(update_dates)
@@ -5,13 +5,15 @@ import random
 import re
 import string
 import ssl
-from datetime import date, datetime, timezone
+import time
+from datetime import datetime, timezone
 from typing import Any
 
 import certifi
 from websocket import WebSocketTimeoutException, create_connection
 
 from ..constants import IndicatorId
+from ..http import json_loads
 from ..models import Observation
 from .base import Provider
 
@@ -26,7 +28,12 @@ def _pack(obj: dict[str, Any]) -> str:
     return f"~m~{len(raw)}~m~{raw}"
 
 
-_MSG_RE = re.compile(r"~m~(\\d+)~m~")
+_MSG_RE = re.compile(r"~m~(\d+)~m~")
+
+# 握手里与会话无关的固定消息：导入时打包一次
+_PACK_AUTH = _pack({"m": "set_auth_token", "p": ["unauthorized_user_token"]})
+_SYMBOL = "FRED:BAMLH0A0HYM2"
+_SYM_OBJ = "=" + json.dumps({"symbol": _SYMBOL, "adjustment": "splits", "session": "regular"}, separators=(",", ":"))
 
 
 def _iter_payloads(frame: str) -> list[dict[str, Any]]:
@@ -36,7 +43,8 @@ def _iter_payloads(frame: str) -> list[dict[str, Any]]:
     """
     out: list[dict[str, Any]] = []
     i = 0
-    while i < len(frame):
+    end = len(frame)
+    while i < end:
         m = _MSG_RE.match(frame, i)
         if not m:
             break
@@ -45,12 +53,41 @@ def _iter_payloads(frame: str) -> list[dict[str, Any]]:
         raw = frame[j : j + n]
         i = j + n
         try:
-            out.append(json.loads(raw))
+            out.append(json_loads(raw))
         except Exception:
             continue
     return out
 
 
+def _last_bar(p: Any, series_id: str) -> tuple[int | None, float] | None:
+    """
+    从 timescale_update 的 p 中取 series_id 的最后一根 bar：(epoch 秒, close)；结构不符返回 None。
+    """
+    if not (isinstance(p, list) and len(p) >= 2 and isinstance(p[1], dict)):
+        return None
+    series_blob = p[1].get(series_id)
+    if not isinstance(series_blob, dict):
+        return None
+    bars = series_blob.get("s")
+    if not isinstance(bars, list) or not bars:
+        return None
+    last = bars[-1]
+    # bars 可能是 list[dict(i, v=[t,o,h,l,c,...])]
+    if isinstance(last, dict) and isinstance(last.get("v"), list):
+        last = last["v"]
+    if not isinstance(last, list) or len(last) < 2:
+        return None
+    try:
+        ts: int | None = int(last[0])
+    except Exception:
+        ts = None
+    # 常见格式：[t, o, h, l, c, v]
+    try:
+        return ts, float(last[4] if len(last) >= 5 else last[1])
+    except Exception:
+        return None
+
+
 class TradingViewWSProvider(Provider):
     """
     用 TradingView WebSocket 获取最新“报价”（不需要 FRED API Key）。
@@ -65,12 +102,12 @@ class TradingViewWSProvider(Provider):
     WS_URL = "wss://data.tradingview.com/socket.io/websocket"
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.US_HIGH_YIELD_SPREAD not in set(indicator_ids):
+        if indicator_ids and IndicatorId.US_HIGH_YIELD_SPREAD not in indicator_ids:
             return []
         return [self._fetch_hy_oas()]
 
     def _fetch_hy_oas(self) -> Observation:
-        symbol = "FRED:BAMLH0A0HYM2"
+        symbol = _SYMBOL
         csid = _rand_session("cs_")
         series_id = "s1"
 
@@ -91,22 +128,23 @@ class TradingViewWSProvider(Provider):
                 pass
 
             # 1) unauthorized token（公开会话）
-            ws.send(_pack({"m": "set_auth_token", "p": ["unauthorized_user_token"]}))
+            ws.send(_PACK_AUTH)
 
             # 2) chart session（用于取时间序列）
             ws.send(_pack({"m": "chart_create_session", "p": [csid, ""]}))
 
             # 3) resolve symbol + create series（取最近 2 根日线）
-            sym_obj = json.dumps({"symbol": symbol, "adjustment": "splits", "session": "regular"}, separators=(",", ":"))
-            ws.send(_pack({"m": "resolve_symbol", "p": [csid, "sym_1", "=" + sym_obj]}))
+            ws.send(_pack({"m": "resolve_symbol", "p": [csid, "sym_1", _SYM_OBJ]}))
             ws.send(_pack({"m": "create_series", "p": [csid, series_id, series_id, "sym_1", "D", 2]}))
 
-            deadline = datetime.now(timezone.utc).timestamp() + 25
+            deadline = time.monotonic() + 25
             last_close_pct: float | None = None
             last_ts: int | None = None
             meta: dict[str, Any] = {"symbol": symbol, "provider": "TradingViewWS"}
 
-            while datetime.now(timezone.utc).timestamp() < deadline:
+            while (remaining := deadline - time.monotonic()) > 0:
+                # 单次 recv 的等待不超过剩余时间，整体耗时以 deadline 为准（否则最后一次 recv 还能再等满 20s）
+                ws.settimeout(remaining)
                 try:
                     frame = ws.recv()
                 except WebSocketTimeoutException:
@@ -120,40 +158,19 @@ class TradingViewWSProvider(Provider):
                         pass
 
                 # 心跳
-                if frame.startswith("~m~") is False:
+                if not frame.startswith("~m~"):
+                    continue
+                # 鉴权回执 / quote 推送等帧里没有 chart 数据，整帧跳过，不做 JSON 解码
+                if "timescale_update" not in frame:
                     continue
 
                 for msg in _iter_payloads(frame):
-                    m = msg.get("m")
-                    p = msg.get("p")
                     # chart 数据：timescale_update
-                    if m == "timescale_update" and isinstance(p, list) and len(p) >= 2 and isinstance(p[1], dict):
-                        series_blob = p[1].get(series_id)
-                        if not isinstance(series_blob, dict):
-                            continue
-                        bars = series_blob.get("s")
-                        if not isinstance(bars, list) or not bars:
-                            continue
-                        last = bars[-1]
-                        # bars 可能是 list[dict(i, v=[t,o,h,l,c,...])]
-                        if isinstance(last, dict) and isinstance(last.get("v"), list):
-                            last = last["v"]
-                        if not isinstance(last, list) or len(last) < 2:
-                            continue
-                        try:
-                            last_ts = int(last[0])
-                        except Exception:
-                            last_ts = None
-                        # 常见格式：[t, o, h, l, c, v]
-                        try:
-                            if len(last) >= 5:
-                                last_close_pct = float(last[4])
-                            else:
-                                last_close_pct = float(last[1])
-                        except Exception:
-                            continue
-
-                    if last_close_pct is not None:
+                    if msg.get("m") != "timescale_update":
+                        continue
+                    bar = _last_bar(msg.get("p"), series_id)
+                    if bar is not None:
+                        last_ts, last_close_pct = bar
                         break
                 if last_close_pct is not None:
                     break
@@ -161,7 +178,7 @@ class TradingViewWSProvider(Provider):
             if last_close_pct is None:
                 raise RuntimeError("TradingViewWS 未返回 timescale_update（无法拿到最新 close）")
 
-            as_of = date.today()
+            as_of = self.today()
             if last_ts:
                 try:
                     as_of = datetime.fromtimestamp(last_ts, tz=timezone.utc).date()
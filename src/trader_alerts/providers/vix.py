@@ -8,9 +8,14 @@ from zoneinfo import ZoneInfo
 import requests
 
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION, json_loads
 from ..models import Observation
 from .base import Provider
 
+# Yahoo chart JSON 只用到 meta 里的两个字段：先在原始 bytes 上直接扫，扫不到再完整解析 JSON
+_RE_YAHOO_PRICE = re.compile(rb'"regularMarketPrice"\s*:\s*([0-9]+(?:\.[0-9]+)?)')
+_RE_YAHOO_TIME = re.compile(rb'"regularMarketTime"\s*:\s*([0-9]+)')
+
 
 class VixProvider(Provider):
     """
@@ -32,17 +37,37 @@ class VixProvider(Provider):
     GRAPH_URL = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
     PAGE_URL = "https://edition.cnn.com/markets/fear-and-greed"
     YAHOO_URL = "https://query1.finance.yahoo.com/v8/finance/chart/%5EVIX"
-    USER_AGENT = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/131.0.0.0 Safari/537.36"
-    )
+    USER_AGENT = BROWSER_HEADERS["User-Agent"]
+
+    # 请求头在类上构造一次，所有实例/请求共用（只读）
+    _YAHOO_HEADERS = {
+        "User-Agent": USER_AGENT,
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "identity",
+        "Connection": "keep-alive",
+    }
+    _GRAPH_HEADERS = {
+        "User-Agent": USER_AGENT,
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "identity",
+        "Referer": PAGE_URL,
+        "Origin": "https://edition.cnn.com",
+        "Connection": "keep-alive",
+        "DNT": "1",
+        "Pragma": "no-cache",
+        "Cache-Control": "no-cache",
+        "Sec-Fetch-Site": "cross-site",
+        "Sec-Fetch-Mode": "cors",
+        "Sec-Fetch-Dest": "empty",
+    }
 
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.VIX not in set(indicator_ids):
+        if indicator_ids and IndicatorId.VIX not in indicator_ids:
             return []
 
         # Prefer Yahoo (more real-time). Fallback to CNN (may be delayed).
@@ -77,31 +102,31 @@ class VixProvider(Provider):
         - meta.regularMarketPrice: latest quote
         - meta.regularMarketTime: epoch seconds
         """
-        headers = {
-            "User-Agent": self.USER_AGENT,
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "identity",
-            "Connection": "keep-alive",
-        }
         try:
-            resp = self.session.get(self.YAHOO_URL, headers=headers, timeout=(3, 8))
+            resp = self.session.get(self.YAHOO_URL, headers=self._YAHOO_HEADERS, timeout=(3, 8))
             if resp.status_code >= 400:
                 return None
-            data = resp.json()
-            chart = data.get("chart") if isinstance(data, dict) else None
-            result = (chart or {}).get("result") if isinstance(chart, dict) else None
-            if not isinstance(result, list) or not result:
-                return None
-            meta = result[0].get("meta") if isinstance(result[0], dict) else None
-            if not isinstance(meta, dict) or not meta:
-                return None
+            body = resp.content
+            mp = _RE_YAHOO_PRICE.search(body)
+            mt = _RE_YAHOO_TIME.search(body)
+            if mp and mt:
+                vix = float(mp.group(1))
+                ts: Any = int(mt.group(1))
+            else:
+                data = json_loads(body)
+                chart = data.get("chart") if isinstance(data, dict) else None
+                result = (chart or {}).get("result") if isinstance(chart, dict) else None
+                if not isinstance(result, list) or not result:
+                    return None
+                meta = result[0].get("meta") if isinstance(result[0], dict) else None
+                if not isinstance(meta, dict) or not meta:
+                    return None
+                vix = float(meta.get("regularMarketPrice"))
+                ts = meta.get("regularMarketTime")
 
-            vix = float(meta.get("regularMarketPrice"))
             if not (5 <= vix <= 100):
                 return None
 
-            ts = meta.get("regularMarketTime")
             as_of = datetime.now(timezone.utc).date()
             if ts:
                 try:
@@ -118,23 +143,8 @@ class VixProvider(Provider):
             return None
 
     def _fetch_graphdata(self) -> dict[str, Any] | None:
-        headers = {
-            "User-Agent": self.USER_AGENT,
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "identity",
-            "Referer": self.PAGE_URL,
-            "Origin": "https://edition.cnn.com",
-            "Connection": "keep-alive",
-            "DNT": "1",
-            "Pragma": "no-cache",
-            "Cache-Control": "no-cache",
-            "Sec-Fetch-Site": "cross-site",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Dest": "empty",
-        }
         try:
-            resp = self.session.get(self.GRAPH_URL, headers=headers, timeout=(5, 20))
+            resp = self.session.get(self.GRAPH_URL, headers=self._GRAPH_HEADERS, timeout=(5, 20))
             if resp.status_code == 418:
                 # Bot protection
                 return None
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
 import re
-from datetime import date, datetime
+from datetime import date
 from typing import Any
 
 import requests
 
 from ..constants import IndicatorId
+from ..http import BROWSER_HEADERS, SESSION
 from ..models import Observation
 from .base import Provider
 
+# 周度值（例："10.94% for Wk of Dec 18 2025"）优先，其次 “Last Value” 表格附近的百分比。
+# 合并为一个正则单次扫描；分支放在零宽 lookahead 里互不吞掉文本，周度写法命中即停。
+_AAII_COMBINED = re.compile(
+    r"(?=(?P<w_val>[+-]?\d+(?:\.\d+)?)%\s*for\s*Wk\s*of\s*(?P<w_period>[A-Za-z]{3,9}\s+\d{1,2}\s+\d{4}))"
+    r"|(?=Last Value\s*</[^>]+>\s*<[^>]+>\s*(?P<l_val>[+-]?\d+(?:\.\d+)?)%)",
+    re.IGNORECASE,
+)
+# “Dec 18 2025” 的月份缩写（等价于 strptime 的 %b，但不走格式串解释器）
+_MONTHS = {m: i for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+
 
 class YChartsProvider(Provider):
     """
@@ -26,48 +37,42 @@ class YChartsProvider(Provider):
     URL = "https://ycharts.com/indicators/us_investor_sentiment_bull_bear_spread"
 
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = session or SESSION
 
     def fetch(self, indicator_ids: list[IndicatorId]) -> list[Observation]:
-        if indicator_ids and IndicatorId.BOFA_BULL_BEAR not in set(indicator_ids):
+        if indicator_ids and IndicatorId.BOFA_BULL_BEAR not in indicator_ids:
             return []
         return [self._fetch_aaii_spread()]
 
     def _fetch_aaii_spread(self) -> Observation:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-        resp = self.session.get(self.URL, headers=headers, timeout=25)
+        resp = self.session.get(self.URL, headers=BROWSER_HEADERS, timeout=25)
         resp.raise_for_status()
         html = resp.text
 
         # 页面通常会包含类似： "10.94% for Wk of Dec 18 2025"
-        m = re.search(
-            r"([+-]?\d+(?:\.\d+)?)%\s*for\s*Wk\s*of\s*([A-Za-z]{3,9}\s+\d{1,2}\s+\d{4})",
-            html,
-            re.IGNORECASE,
-        )
-        if not m:
-            # 备用：尝试从 “Last Value” 表格附近抽取一个百分比
-            m = re.search(r"Last Value\s*</[^>]+>\s*<[^>]+>\s*([+-]?\d+(?:\.\d+)?)%", html, re.IGNORECASE)
-        if not m:
+        week = last = None
+        for m in _AAII_COMBINED.finditer(html):
+            if m.group("w_val") is not None:
+                week = m
+                break
+            if last is None:
+                # 备用：“Last Value” 表格附近的百分比（继续扫描，看后面有没有周度写法）
+                last = m
+        if week is None and last is None:
             raise RuntimeError("无法从 ycharts 页面解析 AAII Bull-Bear Spread（可能需要登录或页面结构变化）")
 
-        value = float(m.group(1))
-        as_of = date.today()
+        as_of = self.today()
         period = None
-        if m.lastindex and m.lastindex >= 2:
+        if week is not None:
+            value = float(week.group("w_val"))
+            period = week.group("w_period")
+            mon, day, year = period.split()
             try:
-                as_of = datetime.strptime(m.group(2), "%b %d %Y").date()
-                period = m.group(2)
-            except Exception:
-                period = m.group(2)
+                as_of = date(int(year), _MONTHS[mon.lower()], int(day))
+            except (KeyError, ValueError):
+                pass
+        else:
+            value = float(last.group("l_val"))  # type: ignore[union-attr]
 
         return Observation(
             indicator_id=IndicatorId.BOFA_BULL_BEAR,
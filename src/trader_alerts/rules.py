@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import date
 from typing import Callable
@@ -23,15 +24,10 @@ def _latest_value(obs: Observation | None) -> float | None:
 def _value_on_or_before(history: list[Observation], target: date) -> Observation | None:
     """
     history: 按 as_of 升序
-    返回 <= target 的最后一个观测值
+    返回 <= target 的最后一个观测值（按 as_of 二分查找）
     """
-    best: Observation | None = None
-    for o in history:
-        if o.as_of <= target:
-            best = o
-        else:
-            break
-    return best
+    i = bisect_right(history, target, key=lambda o: o.as_of)
+    return history[i - 1] if i else None
 
 
 def _delta(
@@ -48,7 +44,7 @@ def _delta(
     return float(latest.value) - float(past.value)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RuleContext:
     latest: Observation | None
     history_30d: list[Observation]
@@ -57,7 +53,20 @@ class RuleContext:
 
 RuleFn = Callable[[RuleContext], Alert | None]
 
+RULES: dict[IndicatorId, RuleFn] = {}
 
+
+def register(indicator_id: IndicatorId) -> Callable[[RuleFn], RuleFn]:
+    """把规则函数登记到 RULES（每个指标一条规则）。"""
+
+    def deco(fn: RuleFn) -> RuleFn:
+        RULES[indicator_id] = fn
+        return fn
+
+    return deco
+
+
+@register(IndicatorId.BOFA_BULL_BEAR)
 def rule_bofa_bull_bear(ctx: RuleContext) -> Alert | None:
     """
     注意：你已选择用 YCharts 的 AAII Bull-Bear Spread 替代 BofA Bull & Bear。
@@ -98,6 +107,7 @@ def rule_bofa_bull_bear(ctx: RuleContext) -> Alert | None:
     )
 
 
+@register(IndicatorId.US_HIGH_YIELD_SPREAD)
 def rule_hy_spread(ctx: RuleContext) -> Alert | None:
     """
     高收益债利差（OAS）常见阈值（经验）：
@@ -139,12 +149,7 @@ def rule_hy_spread(ctx: RuleContext) -> Alert | None:
     )
 
 
-RULES: dict[IndicatorId, RuleFn] = {
-    IndicatorId.BOFA_BULL_BEAR: rule_bofa_bull_bear,
-    IndicatorId.US_HIGH_YIELD_SPREAD: rule_hy_spread,
-}
-
-
+@register(IndicatorId.SP500_PE_RATIO)
 def rule_sp500_pe_ratio(ctx: RuleContext) -> Alert | None:
     """
     估值预警（非常简化，可自行调整）：
@@ -180,9 +185,7 @@ def rule_sp500_pe_ratio(ctx: RuleContext) -> Alert | None:
     )
 
 
-RULES[IndicatorId.SP500_PE_RATIO] = rule_sp500_pe_ratio
-
-
+@register(IndicatorId.CNN_FEAR_GREED_INDEX)
 def rule_cnn_fear_greed(ctx: RuleContext) -> Alert | None:
     """
     CNN Fear & Greed Index（0-100）常用分区：
@@ -218,8 +221,3 @@ def rule_cnn_fear_greed(ctx: RuleContext) -> Alert | None:
         message="未触发极端阈值。",
         evidence={"value": v, "unit": latest.unit, "rating": rating},
     )
-
-
-RULES[IndicatorId.CNN_FEAR_GREED_INDEX] = rule_cnn_fear_greed
-
-
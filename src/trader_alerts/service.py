@@ -1,31 +1,42 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
 from pathlib import Path
 
 from .constants import ALL_INDICATORS, IndicatorId
 from .models import Alert
 from .rules import RULES, RuleContext
-from .storage import latest_observation, recent_observations
+from .storage import bulk_history, list_latest
 
 
 def compute_alerts(
     db_path: str | Path,
     indicators: list[IndicatorId] | None = None,
 ) -> list[Alert]:
-    targets = indicators or list(ALL_INDICATORS)
+    targets = [ind for ind in (indicators or list(ALL_INDICATORS)) if ind in RULES]
+    if not targets:
+        return []
+
+    # 一次查询取回所有指标近一年的历史（按日期升序），30 天窗口在内存里切
+    history = bulk_history(db_path, targets, 370)
+    cutoff_30 = date.today() - timedelta(days=35)
+    # 超出一年窗口的旧数据仍按最新值评估：这些指标的最新值一次查询补齐
+    stale = list_latest(db_path, [ind for ind in targets if not history.get(ind)])
     out: list[Alert] = []
 
     for ind in targets:
-        latest = latest_observation(db_path, ind)
-        h30 = recent_observations(db_path, ind, 35)
-        h365 = recent_observations(db_path, ind, 370)
-        rule = RULES.get(ind)
-        if not latest or not rule:
+        h365 = history.get(ind) or []
+        h30 = [o for o in h365 if o.as_of >= cutoff_30]
+        latest = h365[-1] if h365 else stale.get(ind)
+        if not latest:
             continue
-        alert = rule(RuleContext(latest=latest, history_30d=h30, history_365d=h365))
+        ctx = RuleContext(
+            latest=latest,
+            history_30d=h30,
+            history_365d=h365,
+        )
+        alert = RULES[ind](ctx)
         if alert:
             out.append(alert)
 
     return out
-
-
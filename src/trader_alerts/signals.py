@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable
 
 from .constants import IndicatorId
 from .models import Observation
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Signal:
     indicator_id: IndicatorId
     # Top signal: more biased toward "peak/overheating"
@@ -19,13 +19,41 @@ class Signal:
     meta: dict[str, Any] | None = None
 
 
-def compute_signals(
-    latest: dict[IndicatorId, Observation],
-    *,
-    pe_percentile: float | None = None,
-) -> list[Signal]:
-    out: list[Signal] = []
+# Checks/formatters receive (value, pe_percentile); only the S&P 500 PE
+# spec looks at the percentile.
+_Check = Callable[[float, float | None], bool]
+_Detail = Callable[[float, float | None], str]
+
+
+def _value(o: Observation) -> float:
+    return float(o.value)
+
+
+def _hy_bp(o: Observation) -> float:
+    # Providers report HY OAS either in percent or in bp; normalise to bp.
+    v = float(o.value)
+    return v * 100 if o.unit == "percent" or v < 30 else v
 
+
+def _pe_detail(v: float, pct: float | None) -> str:
+    pct_str = f", historical percentile≈{pct*100:.0f}%" if pct is not None else ""
+    return f"{v:.2f}x (>=30 top valuation; <=20 bottom valuation{pct_str})"
+
+
+@dataclass(frozen=True, slots=True)
+class _Spec:
+    indicator_id: IndicatorId
+    title: str
+    top: _Check
+    bottom: _Check
+    detail: _Detail
+    # Copy the provider's rating (CNN) into Signal.meta
+    rating: bool = False
+    value: Callable[[Observation], float] = _value
+
+
+# One entry per indicator, in display order.
+_SPECS: tuple[_Spec, ...] = (
     # 1) Investor Sentiment Bull-Bear Spread（%）
     # Calibration:
     #   - Real "extreme greed" tops were Jan-2018 +33, Nov-2021 +35, Dec-2024 +28.
@@ -34,38 +62,22 @@ def compute_signals(
     #   - ±20 catches early warnings; ±25 marks more selective conviction
     #     readings. We use ±20 here because the table is labelled
     #     "early-warning gauges", not "perfect tops".
-    o = latest.get(IndicatorId.BOFA_BULL_BEAR)
-    if o:
-        v = float(o.value)
-        top = v >= 20
-        bottom = v <= -20
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.BOFA_BULL_BEAR,
-                top=top,
-                bottom=bottom,
-                title="Investor Sentiment Bull-Bear Spread",
-                detail=f"{v:.2f}% (>=+20 top sentiment; <=-20 bottom sentiment)",
-            )
-        )
-
+    _Spec(
+        IndicatorId.BOFA_BULL_BEAR,
+        "Investor Sentiment Bull-Bear Spread",
+        top=lambda v, _: v >= 20,
+        bottom=lambda v, _: v <= -20,
+        detail=lambda v, _: f"{v:.2f}% (>=+20 top sentiment; <=-20 bottom sentiment)",
+    ),
     # 2) CNN Fear & Greed（0-100）
-    o = latest.get(IndicatorId.CNN_FEAR_GREED_INDEX)
-    if o:
-        v = float(o.value)
-        top = v >= 75
-        bottom = v <= 25
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.CNN_FEAR_GREED_INDEX,
-                top=top,
-                bottom=bottom,
-                title="Fear & Greed Index",
-                detail=f"{v:.1f} (>=75 extreme greed; <=25 extreme fear)",
-                meta={"rating": (o.meta or {}).get("rating")},
-            )
-        )
-
+    _Spec(
+        IndicatorId.CNN_FEAR_GREED_INDEX,
+        "Fear & Greed Index",
+        top=lambda v, _: v >= 75,
+        bottom=lambda v, _: v <= 25,
+        detail=lambda v, _: f"{v:.1f} (>=75 extreme greed; <=25 extreme fear)",
+        rating=True,
+    ),
     # 3) CNN Put/Call（5-day avg put/call ratio）
     # CNN's own labels for this 5-day-avg series:
     #   <0.65 = extreme greed, 0.65-0.75 = greed, 0.75-0.85 = fear,
@@ -74,58 +86,34 @@ def compute_signals(
     # the 5-day P/C printed 1.10-1.35; at frothy tops (early-2024, late-2024)
     # it printed 0.50-0.58.
     # Tightened to require true extremes rather than "fear/greed" levels.
-    o = latest.get(IndicatorId.CNN_PUT_CALL_OPTIONS)
-    if o:
-        v = float(o.value)
-        top = v < 0.55      # extreme greed in calls
-        bottom = v >= 0.95  # heavy put-buying / panic
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.CNN_PUT_CALL_OPTIONS,
-                top=top,
-                bottom=bottom,
-                title="Put/Call Ratio (5-Day Average)",
-                detail=f"{v:.2f} (<0.55 extreme greed; >=0.95 panic put-buying)",
-                meta={"rating": (o.meta or {}).get("rating")},
-            )
-        )
-
+    _Spec(
+        IndicatorId.CNN_PUT_CALL_OPTIONS,
+        "Put/Call Ratio (5-Day Average)",
+        top=lambda v, _: v < 0.55,      # extreme greed in calls
+        bottom=lambda v, _: v >= 0.95,  # heavy put-buying / panic
+        detail=lambda v, _: f"{v:.2f} (<0.55 extreme greed; >=0.95 panic put-buying)",
+        rating=True,
+    ),
     # 4) VIX（volatility index）
     # Long-run mean ~19.5. Sustained <13 = complacency (late-2017,
     # mid-2024 right before vol-mageddon); spikes >30 = panic (Mar-2020
     # 82, Aug-2024 65, Apr-2025 60). 14/25 catches more events as
     # warnings; >30 is the "real capitulation" line.
-    o = latest.get(IndicatorId.VIX)
-    if o:
-        v = float(o.value)
-        top = v < 14
-        bottom = v > 25
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.VIX,
-                top=top,
-                bottom=bottom,
-                title="S&P 500 Volatility Index",
-                detail=f"{v:.2f} (<14 complacency; >25 fear / >30 panic)",
-            )
-        )
-
+    _Spec(
+        IndicatorId.VIX,
+        "S&P 500 Volatility Index",
+        top=lambda v, _: v < 14,
+        bottom=lambda v, _: v > 25,
+        detail=lambda v, _: f"{v:.2f} (<14 complacency; >25 fear / >30 panic)",
+    ),
     # 5) S&P 500 RSI（0-100）
-    o = latest.get(IndicatorId.SP500_RSI)
-    if o:
-        v = float(o.value)
-        top = v >= 70
-        bottom = v <= 30
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.SP500_RSI,
-                top=top,
-                bottom=bottom,
-                title="S&P 500 Relative Strength Index",
-                detail=f"{v:.2f} (>70 overbought; <30 oversold)",
-            )
-        )
-
+    _Spec(
+        IndicatorId.SP500_RSI,
+        "S&P 500 Relative Strength Index",
+        top=lambda v, _: v >= 70,
+        bottom=lambda v, _: v <= 30,
+        detail=lambda v, _: f"{v:.2f} (>70 overbought; <30 oversold)",
+    ),
     # 6) S&P 500 PE（x, trailing-twelve-months）
     # Multpl monthly TTM PE history (verified from the actual table):
     #   Real-stock bottoms: Dec-2018 19.39, Oct-2022 20.44, Mar-2020 22.80
@@ -136,85 +124,47 @@ def compute_signals(
     #     (post-COVID earnings dip), Oct-2021 27.3, current ~30.
     # Top ≥ 30 / bottom ≤ 20 captures "true" extremes without firing on
     # every routine pullback.
-    o = latest.get(IndicatorId.SP500_PE_RATIO)
-    if o:
-        v = float(o.value)
-        top = v >= 30 or (pe_percentile is not None and pe_percentile >= 0.9)
-        bottom = v <= 20 or (pe_percentile is not None and pe_percentile <= 0.1)
-        pct_str = f", historical percentile≈{pe_percentile*100:.0f}%" if pe_percentile is not None else ""
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.SP500_PE_RATIO,
-                top=top,
-                bottom=bottom,
-                title="S&P 500 Price-to-Earnings Ratio",
-                detail=f"{v:.2f}x (>=30 top valuation; <=20 bottom valuation{pct_str})",
-            )
-        )
-
+    _Spec(
+        IndicatorId.SP500_PE_RATIO,
+        "S&P 500 Price-to-Earnings Ratio",
+        top=lambda v, pct: v >= 30 or (pct is not None and pct >= 0.9),
+        bottom=lambda v, pct: v <= 20 or (pct is not None and pct <= 0.1),
+        detail=_pe_detail,
+    ),
     # 7) Nasdaq 100 PE（x）
     # NDX bottoms typically 19-23x (Oct-2022 ~21, Dec-2018 ~19);
     # tops 32-40x. Previous "bottom 28x" never triggered in real bottoms.
-    o = latest.get(IndicatorId.NASDAQ100_PE_RATIO)
-    if o:
-        v = float(o.value)
-        top = v > 35
-        bottom = v < 22
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.NASDAQ100_PE_RATIO,
-                top=top,
-                bottom=bottom,
-                title="Nasdaq 100 Price-to-Earnings Ratio",
-                detail=f"{v:.2f}x (>35 top valuation; <22 bottom valuation)",
-            )
-        )
-
+    _Spec(
+        IndicatorId.NASDAQ100_PE_RATIO,
+        "Nasdaq 100 Price-to-Earnings Ratio",
+        top=lambda v, _: v > 35,
+        bottom=lambda v, _: v < 22,
+        detail=lambda v, _: f"{v:.2f}x (>35 top valuation; <22 bottom valuation)",
+    ),
     # 8) Nasdaq 100 Stocks Above 20-Day Average（%）
-    o = latest.get(IndicatorId.NASDAQ100_ABOVE_20D_MA)
-    if o:
-        v = float(o.value)
-        # Below 20 is bottom, above 80 is top
-        top = v > 80
-        bottom = v < 20
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.NASDAQ100_ABOVE_20D_MA,
-                top=top,
-                bottom=bottom,
-                title="Nasdaq 100 Above 20-Day Moving Average (%)",
-                detail=f"{v:.2f}% (>80 top; <20 bottom)",
-            )
-        )
-
-    # 9) HY OAS
+    # Below 20 is bottom, above 80 is top
+    _Spec(
+        IndicatorId.NASDAQ100_ABOVE_20D_MA,
+        "Nasdaq 100 Above 20-Day Moving Average (%)",
+        top=lambda v, _: v > 80,
+        bottom=lambda v, _: v < 20,
+        detail=lambda v, _: f"{v:.2f}% (>80 top; <20 bottom)",
+    ),
+    # 9) HY OAS (thresholds in bp)
     # FRED BAMLH0A0HYM2 historical extremes:
     #   Tight (=stock-top warning): 2007-Jun 2.41%, 2014-Jun 3.35%,
     #     2021-Jul 2.85%, 2024-Nov 2.74%, 2025-mid sub-3% range.
     #   Wide (=stock-bottom signal): 2008 22.07%, 2020-Mar 10.87%,
     #     2022-Oct 5.83%, 2024-Aug 3.93%, 2025-Apr 4.95%.
     # 2.8% / 4.5% catches early warnings; >5.5% is "real bottom" zone.
-    o = latest.get(IndicatorId.US_HIGH_YIELD_SPREAD)
-    if o:
-        v = float(o.value)
-        if o.unit == "percent" or v < 30:
-            v_bp = v * 100
-        else:
-            v_bp = v
-        val_display = f"{v_bp / 100.0:.2f}%"
-
-        top = v_bp < 280
-        bottom = v_bp > 450
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.US_HIGH_YIELD_SPREAD,
-                top=top,
-                bottom=bottom,
-                title="US High Yield Option-Adjusted Spread",
-                detail=f"Current {val_display} (<2.8% credit-greed top; >4.5% credit-stress bottom)",
-            )
-        )
-
+    _Spec(
+        IndicatorId.US_HIGH_YIELD_SPREAD,
+        "US High Yield Option-Adjusted Spread",
+        top=lambda v, _: v < 280,
+        bottom=lambda v, _: v > 450,
+        detail=lambda v, _: f"Current {v / 100.0:.2f}% (<2.8% credit-greed top; >4.5% credit-stress bottom)",
+        value=_hy_bp,
+    ),
     # 10) CBOE SKEW (tail-risk hedging cost)
     # Historical regimes:
     #   pre-2017: 105-140, with 145+ being a rare extreme
@@ -224,21 +174,13 @@ def compute_signals(
     # regime, so 145 no longer flags an "extreme". Bumped to 155 to
     # capture genuine tail-hedging spikes that historically have led
     # vol events (early-2018, Jan-2020, Sep-2021, Aug-2024).
-    o = latest.get(IndicatorId.CBOE_SKEW)
-    if o:
-        v = float(o.value)
-        top = v >= 155
-        bottom = False  # SKEW does not produce useful bottom signals
-        out.append(
-            Signal(
-                indicator_id=IndicatorId.CBOE_SKEW,
-                top=top,
-                bottom=bottom,
-                title="CBOE SKEW (Tail-Risk Hedging)",
-                detail=f"{v:.1f} (>=155 institutional tail-hedging spike — top warning)",
-            )
-        )
-
+    _Spec(
+        IndicatorId.CBOE_SKEW,
+        "CBOE SKEW (Tail-Risk Hedging)",
+        top=lambda v, _: v >= 155,
+        bottom=lambda v, _: False,  # SKEW does not produce useful bottom signals
+        detail=lambda v, _: f"{v:.1f} (>=155 institutional tail-hedging spike — top warning)",
+    ),
     # 11) 10Y-2Y Treasury yield curve (T10Y2Y)
     # Inversion <0% has preceded every U.S. recession since 1980.
     # The dangerous window for stocks is when the curve RE-STEEPENS from
@@ -247,24 +189,38 @@ def compute_signals(
     # inversion as a top warning. <-0.5% (deep inversion) is itself
     # not directly a bottom signal — bottoms tend to come once the
     # curve has steepened well above 1% and Fed is cutting fast.
-    o = latest.get(IndicatorId.YC_10Y_2Y)
-    if o:
-        v = float(o.value)
-        top = -0.05 <= v <= 0.6   # re-steepening danger window
-        bottom = v >= 1.5         # late-recession steepening (Fed easing aggressively)
+    _Spec(
+        IndicatorId.YC_10Y_2Y,
+        "10Y-2Y Treasury Yield Curve",
+        top=lambda v, _: -0.05 <= v <= 0.6,  # re-steepening danger window
+        bottom=lambda v, _: v >= 1.5,        # late-recession steepening (Fed easing aggressively)
+        detail=lambda v, _: (
+            f"{v:+.2f}% (re-steepening from inversion: late-cycle top window; "
+            f">=1.5% Fed-easing-driven bottom window)"
+        ),
+    ),
+)
+
+
+def compute_signals(
+    latest: dict[IndicatorId, Observation],
+    *,
+    pe_percentile: float | None = None,
+) -> list[Signal]:
+    out: list[Signal] = []
+    for spec in _SPECS:
+        o = latest.get(spec.indicator_id)
+        if not o:
+            continue
+        v = spec.value(o)
         out.append(
             Signal(
-                indicator_id=IndicatorId.YC_10Y_2Y,
-                top=top,
-                bottom=bottom,
-                title="10Y-2Y Treasury Yield Curve",
-                detail=(
-                    f"{v:+.2f}% (re-steepening from inversion: late-cycle top window; "
-                    f">=1.5% Fed-easing-driven bottom window)"
-                ),
+                indicator_id=spec.indicator_id,
+                top=spec.top(v, pe_percentile),
+                bottom=spec.bottom(v, pe_percentile),
+                title=spec.title,
+                detail=spec.detail(v, pe_percentile),
+                meta={"rating": (o.meta or {}).get("rating")} if spec.rating else None,
             )
         )
-
     return out
-
-
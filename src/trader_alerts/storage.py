@@ -2,22 +2,82 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 from dataclasses import asdict
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 from .constants import IndicatorId
 from .models import Observation
 
 
+# 每个线程每个库文件复用一条连接（sqlite3 连接默认不能跨线程使用）；线程结束时随 threading.local 一起释放。
+# `with _connect(...) as conn` 只负责提交/回滚事务，不会关闭连接。
+_LOCAL = threading.local()
+# 已确认建表的 (db_path, init 函数名)：读写函数只在每个进程第一次访问时跑 CREATE TABLE IF NOT EXISTS
+_SCHEMA_READY: set[tuple[str, str]] = set()
+_SCHEMA_LOCK = threading.Lock()
+# 行里的 indicator_id 字符串 → 枚举；字典查找比 IndicatorId(...) 走 Enum 元类快，查不到即历史指标
+_ID_BY_VALUE: dict[str, IndicatorId] = {i.value: i for i in IndicatorId}
+_MARKET_OVERVIEW_CHUNK = 99
+# 每个库文件一把进程内写锁：WAL 下读者互不阻塞，但同一时刻只能有一个写者；
+# 后台线程（auto-fetch / 行情刷新 / backfill / 新闻缓存）先在这里排队，而不是在 SQLite 的 busy 超时里空转
+_WRITE_LOCKS: dict[str, threading.Lock] = {}
+
+
 def _connect(db_path: str | Path) -> sqlite3.Connection:
-    conn = sqlite3.connect(str(db_path))
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA foreign_keys=ON;")
+    conns: dict[str, sqlite3.Connection] | None = getattr(_LOCAL, "conns", None)
+    if conns is None:
+        conns = _LOCAL.conns = {}
+    key = str(db_path)
+    conn = conns.get(key)
+    if conn is None:
+        conn = sqlite3.connect(key)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA foreign_keys=ON;")
+        # WAL 下 NORMAL 仍保证一致性，只是掉电时可能丢最后几笔提交；临时表/排序放内存
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        # 读多写少：页面直接从 mmap 读取，页缓存上限 64MB（按需增长，小库不会真的占满）
+        conn.execute("PRAGMA mmap_size=268435456;")
+        conn.execute("PRAGMA cache_size=-65536;")
+        conns[key] = conn
     return conn
 
 
+def _write_lock(db_path: str | Path) -> threading.Lock:
+    key = str(db_path)
+    lock = _WRITE_LOCKS.get(key)
+    if lock is None:
+        with _SCHEMA_LOCK:
+            lock = _WRITE_LOCKS.setdefault(key, threading.Lock())
+    return lock
+
+
+def _ensure_schema(db_path: str | Path, init: Callable[[str | Path], None]) -> None:
+    key = (str(db_path), init.__name__)
+    if key in _SCHEMA_READY:
+        return
+    with _SCHEMA_LOCK:
+        if key in _SCHEMA_READY:
+            return
+        init(db_path)
+        _SCHEMA_READY.add(key)
+
+
+def _utc_stamp() -> str:
+    # 整批写入共用一个时间戳（YYYY-MM-DDTHH:MM:SSZ），每次 upsert 只算一次
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _load_meta(raw: str | None) -> dict[str, Any]:
+    # 空 meta 写入时存 NULL；旧数据里的 "{}" 同样不走 JSON 解析
+    if not raw or raw == "{}":
+        return {}
+    return json.loads(raw)
+
+
 def init_db(db_path: str | Path) -> None:
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     with _connect(db_path) as conn:
@@ -56,6 +116,8 @@ def init_market_overview(db_path: str | Path) -> None:
             )
             """
         )
+        # list_market_overview_rows 按 lower(symbol) IN (...) 过滤：表达式索引让它走索引而不是逐行算 lower()
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_market_overview_symbol_lower ON market_overview(lower(symbol))")
 
 
 def init_news_cache(db_path: str | Path) -> None:
@@ -81,7 +143,7 @@ def get_cached_news(
     *,
     max_age_seconds: int = 86400,
 ) -> list[dict[str, Any]] | None:
-    init_news_cache(db_path)
+    _ensure_schema(db_path, init_news_cache)
     with _connect(db_path) as conn:
         row = conn.execute(
             """
@@ -115,9 +177,9 @@ def upsert_cached_news(
     as_of: str,
     payload: list[dict[str, Any]],
 ) -> None:
-    init_news_cache(db_path)
-    now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    with _connect(db_path) as conn:
+    _ensure_schema(db_path, init_news_cache)
+    now = _utc_stamp()
+    with _write_lock(db_path), _connect(db_path) as conn:
         conn.execute(
             """
             INSERT INTO news_cache (cache_key, as_of, payload_json, fetched_at)
@@ -132,8 +194,8 @@ def upsert_cached_news(
 
 
 def upsert_observations(db_path: str | Path, observations: Iterable[Observation]) -> int:
-    init_db(db_path)
-    now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    _ensure_schema(db_path, init_db)
+    now = _utc_stamp()
 
     rows = []
     for obs in observations:
@@ -144,12 +206,14 @@ def upsert_observations(db_path: str | Path, observations: Iterable[Observation]
                 float(obs.value),
                 obs.unit,
                 obs.source,
-                json.dumps(obs.meta or {}, ensure_ascii=False),
+                json.dumps(obs.meta, ensure_ascii=False) if obs.meta else None,
                 now,
             )
         )
 
-    with _connect(db_path) as conn:
+    with _write_lock(db_path), _connect(db_path) as conn:
+        # 整批一个事务、一次提交；IMMEDIATE 一开始就拿写锁，避免与其它写入方在升级锁时互相等待
+        conn.execute("BEGIN IMMEDIATE;")
         cur = conn.executemany(
             """
             INSERT INTO observations (indicator_id, as_of, value, unit, source, meta_json, inserted_at)
@@ -168,8 +232,8 @@ def upsert_observations(db_path: str | Path, observations: Iterable[Observation]
 
 
 def upsert_market_overview_rows(db_path: str | Path, rows: Iterable[dict[str, Any]]) -> int:
-    init_market_overview(db_path)
-    now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    _ensure_schema(db_path, init_market_overview)
+    now = _utc_stamp()
     payload = []
     for r in rows:
         payload.append(
@@ -188,34 +252,42 @@ def upsert_market_overview_rows(db_path: str | Path, rows: Iterable[dict[str, An
         )
     if not payload:
         return 0
-    with _connect(db_path) as conn:
-        cur = conn.executemany(
-            """
-            INSERT INTO market_overview
-              (symbol, name, as_of, close, chg_1w_pct, chg_1m_pct, chg_3m_pct, chg_1y_pct, source_url, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(symbol)
-            DO UPDATE SET
-              name=excluded.name,
-              as_of=excluded.as_of,
-              close=excluded.close,
-              chg_1w_pct=excluded.chg_1w_pct,
-              chg_1m_pct=excluded.chg_1m_pct,
-              chg_3m_pct=excluded.chg_3m_pct,
-              chg_1y_pct=excluded.chg_1y_pct,
-              source_url=excluded.source_url,
-              updated_at=excluded.updated_at
-            """,
-            payload,
-        )
-        return cur.rowcount
+    # 多行 VALUES：每条语句写一批（≤99 行 × 10 个参数，不超过 SQLite 默认 999 个参数上限），
+    # 满批的 SQL 文本相同，可命中连接上的语句缓存
+    changed = 0
+    with _write_lock(db_path), _connect(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE;")
+        for i in range(0, len(payload), _MARKET_OVERVIEW_CHUNK):
+            chunk = payload[i : i + _MARKET_OVERVIEW_CHUNK]
+            values = ",".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"] * len(chunk))
+            cur = conn.execute(
+                f"""
+                INSERT INTO market_overview
+                  (symbol, name, as_of, close, chg_1w_pct, chg_1m_pct, chg_3m_pct, chg_1y_pct, source_url, updated_at)
+                VALUES {values}
+                ON CONFLICT(symbol)
+                DO UPDATE SET
+                  name=excluded.name,
+                  as_of=excluded.as_of,
+                  close=excluded.close,
+                  chg_1w_pct=excluded.chg_1w_pct,
+                  chg_1m_pct=excluded.chg_1m_pct,
+                  chg_3m_pct=excluded.chg_3m_pct,
+                  chg_1y_pct=excluded.chg_1y_pct,
+                  source_url=excluded.source_url,
+                  updated_at=excluded.updated_at
+                """,
+                [v for row in chunk for v in row],
+            )
+            changed += cur.rowcount
+    return changed
 
 
 def list_market_overview_rows(
     db_path: str | Path,
     symbols: list[str] | None = None,
 ) -> list[dict[str, Any]]:
-    init_market_overview(db_path)
+    _ensure_schema(db_path, init_market_overview)
     with _connect(db_path) as conn:
         if symbols:
             norm = [s.lower() for s in symbols if s]
@@ -255,7 +327,7 @@ def list_market_overview_rows(
 
 
 def latest_observation(db_path: str | Path, indicator_id: IndicatorId) -> Observation | None:
-    init_db(db_path)
+    _ensure_schema(db_path, init_db)
     with _connect(db_path) as conn:
         row = conn.execute(
             """
@@ -270,12 +342,12 @@ def latest_observation(db_path: str | Path, indicator_id: IndicatorId) -> Observ
     if not row:
         return None
     return Observation(
-        indicator_id=IndicatorId(row[0]),
+        indicator_id=indicator_id,
         as_of=date.fromisoformat(row[1]),
         value=float(row[2]),
         unit=row[3],
         source=row[4],
-        meta=json.loads(row[5]) if row[5] else {},
+        meta=_load_meta(row[5]),
     )
 
 
@@ -284,7 +356,7 @@ def recent_observations(
     indicator_id: IndicatorId,
     days: int,
 ) -> list[Observation]:
-    init_db(db_path)
+    _ensure_schema(db_path, init_db)
     cutoff = (date.today() - timedelta(days=days)).isoformat()
     with _connect(db_path) as conn:
         rows = conn.execute(
@@ -296,26 +368,50 @@ def recent_observations(
             ORDER BY as_of ASC
             """,
             (indicator_id.value, cutoff),
-        ).fetchall()
+        )
+        # 热循环：直接迭代游标（不先 fetchall 成中间列表），位置参数构造，指标即查询参数本身
+        return [
+            Observation(indicator_id, date.fromisoformat(row[1]), float(row[2]), row[3], row[4], _load_meta(row[5]))
+            for row in rows
+        ]
 
-    out: list[Observation] = []
-    for row in rows:
-        out.append(
-            Observation(
-                indicator_id=IndicatorId(row[0]),
-                as_of=date.fromisoformat(row[1]),
-                value=float(row[2]),
-                unit=row[3],
-                source=row[4],
-                meta=json.loads(row[5]) if row[5] else {},
-            )
+
+def bulk_history(
+    db_path: str | Path,
+    indicator_ids: Iterable[IndicatorId],
+    days: int = 370,
+) -> dict[IndicatorId, list[Observation]]:
+    """一次查询取多个指标最近 `days` 天的历史（按日期升序），避免逐指标多次查询"""
+    ids = list(indicator_ids)
+    out: dict[IndicatorId, list[Observation]] = {ind: [] for ind in ids}
+    if not ids:
+        return out
+    _ensure_schema(db_path, init_db)
+    cutoff = (date.today() - timedelta(days=days)).isoformat()
+    placeholders = ",".join(["?"] * len(ids))
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT indicator_id, as_of, value, unit, source, meta_json
+            FROM observations
+            WHERE indicator_id IN ({placeholders})
+              AND as_of >= ?
+            ORDER BY indicator_id ASC, as_of ASC
+            """,
+            [ind.value for ind in ids] + [cutoff],
         )
+        by_value = {ind.value: ind for ind in ids}
+        for row in rows:
+            ind = by_value[row[0]]
+            out[ind].append(
+                Observation(ind, date.fromisoformat(row[1]), float(row[2]), row[3], row[4], _load_meta(row[5]))
+            )
     return out
 
 
 def get_last_update_time(db_path: str | Path) -> datetime | None:
     """获取数据库中最后一次数据更新的时间戳"""
-    init_db(db_path)
+    _ensure_schema(db_path, init_db)
     with _connect(db_path) as conn:
         row = conn.execute(
             """
@@ -333,38 +429,37 @@ def get_last_update_time(db_path: str | Path) -> datetime | None:
     return None
 
 
-def list_latest(db_path: str | Path) -> dict[IndicatorId, Observation]:
-    init_db(db_path)
+def list_latest(
+    db_path: str | Path,
+    indicator_ids: Iterable[IndicatorId] | None = None,
+) -> dict[IndicatorId, Observation]:
+    """每个指标的最新观测；传入 indicator_ids 时只查这些指标（一次查询，代替逐个 latest_observation）"""
+    ids = [ind.value for ind in indicator_ids] if indicator_ids is not None else None
+    if ids == []:
+        return {}
+    _ensure_schema(db_path, init_db)
+    where = f"WHERE indicator_id IN ({','.join(['?'] * len(ids))})" if ids else ""
+    # 主键 (indicator_id, as_of) 本身就是复合索引：每个指标的 MAX(as_of) 走一次索引 seek，
+    # 不再对整张表做 GROUP BY 再回表 join
     with _connect(db_path) as conn:
         rows = conn.execute(
-            """
+            f"""
             SELECT o.indicator_id, o.as_of, o.value, o.unit, o.source, o.meta_json
-            FROM observations o
-            INNER JOIN (
-              SELECT indicator_id, MAX(as_of) AS max_as_of
-              FROM observations
-              GROUP BY indicator_id
-            ) m
-            ON o.indicator_id = m.indicator_id AND o.as_of = m.max_as_of
+            FROM (SELECT DISTINCT indicator_id FROM observations {where}) d
+            INNER JOIN observations o
+            ON o.indicator_id = d.indicator_id
+              AND o.as_of = (SELECT MAX(as_of) FROM observations WHERE indicator_id = d.indicator_id)
             ORDER BY o.indicator_id ASC
-            """
-        ).fetchall()
-
-    out: dict[IndicatorId, Observation] = {}
-    for row in rows:
-        try:
-            ind = IndicatorId(row[0])
-        except Exception:
-            # 数据库里可能存在历史指标（已从当前版本移除），直接忽略
-            continue
-        out[ind] = Observation(
-            indicator_id=ind,
-            as_of=date.fromisoformat(row[1]),
-            value=float(row[2]),
-            unit=row[3],
-            source=row[4],
-            meta=json.loads(row[5]) if row[5] else {},
+            """,
+            ids or [],
         )
+        out: dict[IndicatorId, Observation] = {}
+        for row in rows:
+            ind = _ID_BY_VALUE.get(row[0])
+            if ind is None:
+                # 数据库里可能存在历史指标（已从当前版本移除），直接忽略
+                continue
+            out[ind] = Observation(ind, date.fromisoformat(row[1]), float(row[2]), row[3], row[4], _load_meta(row[5]))
     return out
 
 
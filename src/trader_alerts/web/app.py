@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
+from functools import cache, lru_cache
+import hashlib
 from datetime import date, datetime, timedelta, timezone
 import re
 from pathlib import Path
 import threading
-from typing import Any
+import time
+from typing import Any, Callable, Mapping
 
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.requests import Request
 
 from ..constants import ALL_INDICATORS
@@ -26,8 +35,10 @@ from ..providers import (
     VixProvider,
     YChartsProvider,
 )
+from ..providers.base import Provider
 from ..constants import IndicatorId
-from ..signals import compute_signals
+from ..models import Observation
+from ..signals import Signal, compute_signals
 from ..service import compute_alerts
 from ..storage import (
     list_latest,
@@ -46,8 +57,186 @@ from ..world import (
     get_world_overview,
 )
 from ..news import fetch_news_for_index, fetch_company_news, is_enabled as news_is_enabled
-from ..backfill import backfill_history
+from ..backfill import backfill_history, fetch_multpl_pe_monthly
 from ..regime import compute_market_regime
+from ..historical import get_historical_events
+from ..http import cache_dir
+
+
+# Auto-fetch provider name -> (provider class, indicators to request).
+# "http" is built from the api_config.yaml path and fetches every indicator.
+_AUTO_FETCH_JOBS: dict[str, tuple[Callable[[], Provider], tuple[IndicatorId, ...]]] = {
+    "cnn": (CnnFearGreedProvider, (IndicatorId.CNN_FEAR_GREED_INDEX, IndicatorId.CNN_PUT_CALL_OPTIONS)),
+    "vix": (VixProvider, (IndicatorId.VIX,)),
+    "multpl": (MultplProvider, ()),
+    "nasdaqpe": (Nasdaq100PeProvider, (IndicatorId.NASDAQ100_PE_RATIO,)),
+    "rsi": (Sp500RsiProvider, (IndicatorId.SP500_RSI,)),
+    "fred": (FredProvider, (IndicatorId.US_HIGH_YIELD_SPREAD,)),
+    "ycharts": (YChartsProvider, (IndicatorId.BOFA_BULL_BEAR,)),
+    "ndtw": (NdtwProvider, (IndicatorId.NASDAQ100_ABOVE_20D_MA,)),
+}
+
+# Query-string values treated as "on" for ?refresh= / ?history=
+_TRUTHY = frozenset({"1", "true", "yes", "y"})
+
+
+def _truthy(params: Mapping[str, str], key: str) -> bool:
+    v = params.get(key)
+    return bool(v) and v.strip().lower() in _TRUTHY
+
+
+# Indicator ID to display name mapping (use default name if no signal)
+_INDICATOR_NAMES: dict[IndicatorId, str] = {
+    IndicatorId.US_HIGH_YIELD_SPREAD: "US High Yield Option-Adjusted Spread",
+    IndicatorId.BOFA_BULL_BEAR: "Investor Sentiment Bull-Bear Spread",
+    IndicatorId.CNN_FEAR_GREED_INDEX: "Fear & Greed Index",
+    IndicatorId.CNN_PUT_CALL_OPTIONS: "Put/Call Ratio (5-Day Average)",
+    IndicatorId.SP500_PE_RATIO: "S&P 500 Price-to-Earnings Ratio",
+    IndicatorId.NASDAQ100_PE_RATIO: "Nasdaq 100 Price-to-Earnings Ratio",
+    IndicatorId.SP500_RSI: "S&P 500 Relative Strength Index",
+    IndicatorId.NASDAQ100_ABOVE_20D_MA: "Nasdaq 100 Above 20-Day Moving Average (%)",
+    IndicatorId.VIX: "S&P 500 Volatility Index",
+    IndicatorId.CBOE_SKEW: "CBOE SKEW (Tail-Risk Hedging)",
+    IndicatorId.YC_10Y_2Y: "10Y-2Y Treasury Yield Curve",
+}
+
+# Indicator ID to source URL mapping
+_INDICATOR_SOURCE_URLS: dict[IndicatorId, str] = {
+    IndicatorId.US_HIGH_YIELD_SPREAD: "https://fred.stlouisfed.org/series/BAMLH0A0HYM2",
+    IndicatorId.BOFA_BULL_BEAR: "https://ycharts.com/indicators/us_investor_sentiment_bull_bear_spread",
+    IndicatorId.CNN_FEAR_GREED_INDEX: "https://edition.cnn.com/markets/fear-and-greed",
+    IndicatorId.CNN_PUT_CALL_OPTIONS: "https://edition.cnn.com/markets/fear-and-greed",
+    IndicatorId.SP500_PE_RATIO: "https://www.multpl.com/s-p-500-pe-ratio/table/by-month",
+    IndicatorId.NASDAQ100_PE_RATIO: "https://www.barrons.com/market-data/stocks/us/pe-yields",
+    IndicatorId.SP500_RSI: "https://www.investing.com/indices/us-spx-500-technical",
+    IndicatorId.NASDAQ100_ABOVE_20D_MA: "https://www.barchart.com/stocks/quotes/$NDTW",
+    IndicatorId.VIX: "https://edition.cnn.com/markets/fear-and-greed",
+    IndicatorId.CBOE_SKEW: "https://finance.yahoo.com/quote/%5ESKEW",
+    IndicatorId.YC_10Y_2Y: "https://fred.stlouisfed.org/series/T10Y2Y",
+}
+
+def _fmt2(v: float) -> str:
+    return f"{float(v):.2f}"
+
+
+# Value formatting for the latest-values table (indicators not listed are shown raw)
+_FMT: dict[IndicatorId, Callable[[float], str]] = {
+    # US High Yield Spread stored in bp, display as percentage (without % symbol, % shown in unit column)
+    IndicatorId.US_HIGH_YIELD_SPREAD: lambda v: f"{float(v) / 100.0:.2f}",
+    IndicatorId.SP500_RSI: _fmt2,
+    IndicatorId.CNN_FEAR_GREED_INDEX: _fmt2,
+    IndicatorId.CNN_PUT_CALL_OPTIONS: _fmt2,
+    IndicatorId.NASDAQ100_ABOVE_20D_MA: _fmt2,
+    IndicatorId.SP500_PE_RATIO: _fmt2,
+    IndicatorId.NASDAQ100_PE_RATIO: _fmt2,
+    IndicatorId.CBOE_SKEW: _fmt2,
+    IndicatorId.YC_10Y_2Y: lambda v: f"{float(v):+.2f}",
+}
+
+# (indicator, stored unit) -> displayed unit; a None indicator applies to every indicator
+_UNIT_REMAP: dict[tuple[IndicatorId | None, str | None], str] = {
+    (IndicatorId.US_HIGH_YIELD_SPREAD, "bp"): "%",
+    (None, "percent"): "%",
+}
+
+_SOURCES: tuple[dict[str, str], ...] = (
+    {"name": "US High Yield OAS (Primary)", "url": "https://tradingeconomics.com/united-states/bofa-merrill-lynch-us-high-yield-option-adjusted-spread-fed-data.html"},
+    {"name": "AAII Bull-Bear Spread", "url": "https://ycharts.com/indicators/us_investor_sentiment_bull_bear_spread"},
+    {"name": "CNN Fear & Greed", "url": "https://edition.cnn.com/markets/fear-and-greed"},
+    {"name": "CNN Put/Call (Same source as Fear&Greed)", "url": "https://edition.cnn.com/markets/fear-and-greed"},
+    {"name": "S&P 500 PE Ratio", "url": "https://www.multpl.com/s-p-500-pe-ratio"},
+    {"name": "Nasdaq 100 PE Ratio", "url": "https://www.barrons.com/market-data/stocks/us/pe-yields"},
+    {"name": "S&P 500 RSI", "url": "https://www.investing.com/indices/us-spx-500-technical"},
+    {"name": "Nasdaq 100 Above 20D MA (Primary)", "url": "https://eoddata.com/stockquote/INDEX/NDTW.htm"},
+    {"name": "Nasdaq 100 Above 20D MA (Alternative)", "url": "https://www.barchart.com/stocks/quotes/$NDTW"},
+    {"name": "Nasdaq 100 Above 20D MA (Alternative)", "url": "https://www.tradingview.com/symbols/INDEX-NDTW/"},
+    {"name": "VIX (CNN Fear & Greed component)", "url": "https://edition.cnn.com/markets/fear-and-greed"},
+    {"name": "US Stock Indices (S&P/Dow/Nasdaq) Daily CSV", "url": "https://stooq.com/q/d/l/"},
+)
+
+def _build_latest_row(
+    ind: IndicatorId,
+    o: Observation | None,
+    s: Signal | None,
+    *,
+    names: dict[IndicatorId, str] = _INDICATOR_NAMES,
+    urls: dict[IndicatorId, str] = _INDICATOR_SOURCE_URLS,
+    fmts: dict[IndicatorId, Callable[[float], str]] = _FMT,
+    unit_remap: dict[tuple[IndicatorId | None, str | None], str] = _UNIT_REMAP,
+) -> dict[str, Any]:
+    """
+    One row of the latest-values table. The lookup tables are bound as
+    defaults so the per-row lookups are locals rather than globals.
+    """
+    # Use signal title first, otherwise use default name
+    name = s.title if s else names.get(ind, ind.value)
+
+    value_display = o.value if o else None
+    fmt = fmts.get(ind)
+    if value_display is not None and fmt is not None:
+        try:
+            value_display = fmt(value_display)
+        except (ValueError, TypeError):
+            pass
+
+    # Special handling: unit display optimization
+    unit_display = o.unit if o else None
+    unit_display = unit_remap.get((ind, unit_display)) or unit_remap.get((None, unit_display), unit_display)
+
+    return {
+        "id": ind.value,
+        "name": name,
+        "as_of": o.as_of.strftime("%m-%d") if o else None,
+        "value": value_display,
+        "unit": unit_display,
+        "source": o.source if o else None,
+        "source_url": urls.get(ind),
+        "is_top": s.top if s else False,
+        "is_bottom": s.bottom if s else False,
+    }
+
+
+# Threshold lines drawn on the indicator history chart (mirror signals.py)
+_THRESHOLDS: dict[IndicatorId, dict[str, Any]] = {
+    IndicatorId.BOFA_BULL_BEAR: {"top": 20.0, "bottom": -20.0},
+    IndicatorId.CNN_FEAR_GREED_INDEX: {"top": 75.0, "bottom": 25.0},
+    IndicatorId.CNN_PUT_CALL_OPTIONS: {"top": 0.55, "bottom": 0.95},
+    IndicatorId.VIX: {"top": 14.0, "bottom": 25.0},
+    IndicatorId.SP500_RSI: {"top": 70.0, "bottom": 30.0},
+    IndicatorId.SP500_PE_RATIO: {"top": 30.0, "bottom": 20.0},
+    IndicatorId.NASDAQ100_PE_RATIO: {"top": 35.0, "bottom": 22.0},
+    IndicatorId.NASDAQ100_ABOVE_20D_MA: {"top": 80.0, "bottom": 20.0},
+    IndicatorId.US_HIGH_YIELD_SPREAD: {"top": 2.8, "bottom": 4.5},
+    IndicatorId.CBOE_SKEW: {"top": 155.0},
+    # 10Y-2Y is special: the "top warning" is a BAND (post-inversion
+    # re-steepening window), not a single threshold. We emit a
+    # `top_zone` instead of a `top` here. There is no clean single
+    # "bottom" threshold either — true bottoms only register when
+    # the curve is steep AND panic indicators co-fire — so we skip it.
+    IndicatorId.YC_10Y_2Y: {"top_zone": [-0.05, 0.6]},
+}
+
+try:
+    import orjson  # noqa: F401  # optional accelerator (speedups extra)
+except Exception:
+    _JSONResponse: type[JSONResponse] = JSONResponse
+else:
+    _JSONResponse = ORJSONResponse
+
+# 页面上的更新时间按东八区显示（假设用户在东八区）
+_CST = timezone(timedelta(hours=8))
+
+
+@lru_cache(maxsize=1)
+def _fmt_last_update(ts: datetime) -> str:
+    # ts only changes after a write, so consecutive requests hit the cache
+    return ts.astimezone(_CST).strftime('%Y-%m-%d %H:%M:%S')
+
+
+@cache
+def _bear_rows_cached() -> list[dict[str, Any]]:
+    # Events are hardcoded in historical.py: convert them once per process
+    return [asdict(e) for e in get_historical_events()]
 
 
 def create_app(
@@ -58,25 +247,50 @@ def create_app(
     min_interval_seconds: int = 3600,  # Auto-fetch every 1 hour
     http_config_path: str | Path = "api_config.yaml",
 ) -> FastAPI:
-    app = FastAPI(title="Trader Dashboard", version="0.1.0")
+    app = FastAPI(title="Trader Dashboard", version="0.1.0", default_response_class=_JSONResponse)
+    # The dashboard HTML and the JSON APIs are text-heavy; compress anything over 1KB
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
     root = Path(__file__).resolve().parent
     templates = Jinja2Templates(directory=str(root / "templates"))
+    # Templates ship with the package: no per-render mtime check, and keep the
+    # compiled bytecode on disk so a restarted worker skips the Jinja compile.
+    templates.env.auto_reload = False
+    try:
+        bc_dir = cache_dir("jinja")
+        bc_dir.mkdir(parents=True, exist_ok=True)
+        templates.env.bytecode_cache = FileSystemBytecodeCache(directory=str(bc_dir))
+    except Exception:
+        pass
+    templates.env.get_template("index.html")
 
     resolved_db = Path(db_path) if db_path else (Path.cwd() / "trader_alerts.sqlite3")
     # Simple cache: avoid fetching long historical web pages on every refresh
-    cached_pe_monthly: dict | None = None
+    # 月度 PE 的值升序排好（只在抓取时排序一次），分位数用二分查找
+    cached_pe_sorted: array | None = None
     cached_market_rows: list[dict[str, Any]] = []
     cached_market_at: datetime | None = None
+    # 同一次刷新的 time.monotonic()，只用于 60s 新鲜度判断（cached_market_at 仅用于展示 as_of_utc）
+    cached_market_mono: float | None = None
     market_lock = threading.Lock()
     market_refreshing = False
+    market_task: asyncio.Task[None] | None = None
 
     # World indices cache: refreshed in background on first hit, then every 5 min
     cached_world_rows: list[dict[str, Any]] = []
     cached_world_at: datetime | None = None
+    cached_world_mono: float | None = None
     world_lock = threading.Lock()
     world_refreshing = False
 
+    # Dashboard context snapshot, keyed by the ?history= flag:
+    # want_history -> (data version, built at (monotonic), context)
+    cached_ctx: dict[bool, tuple[float, float, dict[str, Any]]] = {}
+    ctx_lock = threading.Lock()
+    ctx_ttl_seconds = 60
+    # (want_history, data version) -> context build in progress (event-loop only)
+    ctx_inflight: dict[tuple[bool, float], asyncio.Task[dict[str, Any]]] = {}
+
     # One-shot indicator history backfill (RSI + VIX) on first request,
     # so a freshly-deployed instance with an empty SQLite immediately has
     # ~1 year of history for the trend chart.
@@ -93,7 +307,9 @@ def create_app(
         if p.strip()
     ]
     cooldown = max(0, int(min_interval_seconds))
-    last_fetch_at: dict[str, datetime] = {}
+    # provider name -> 上次成功抓取时的 time.monotonic()
+    last_fetch_at: dict[str, float] = {}
+    provider_objs: dict[str, Provider] = {}
     http_cfg = Path(http_config_path)
     default_market_symbols = [
         "^spx",
@@ -148,99 +364,137 @@ def create_app(
                 out.append(r)
         return out
 
-    def _should_fetch(name: str, now: datetime) -> bool:
+    def _should_fetch(name: str, now: float) -> bool:
         last = last_fetch_at.get(name)
-        if not last:
+        if last is None:
             return True
-        return (now - last) >= timedelta(seconds=cooldown)
+        return (now - last) >= cooldown
 
-    def _auto_fetch_now(requested: bool) -> tuple[list[str], list[str]]:
+    def _provider(name: str) -> Provider | None:
         """
-        返回 (ok_messages, error_messages)
+        每个 provider 只构造一次、之后复用（它们都走 http.SESSION 的连接池，keep-alive 跨次抓取复用）。
+        http provider 例外：每次按 api_config.yaml 重新构造，改配置后无需重启即可生效。
+        """
+        if name == "http":
+            if not http_cfg.exists():
+                raise RuntimeError(f"Missing http config file: {http_cfg} (please run `trader init` first or create manually)")
+            return HttpJsonProvider(http_cfg)
+        provider = provider_objs.get(name)
+        if provider is not None:
+            return provider
+        if name in _AUTO_FETCH_JOBS:
+            provider = _AUTO_FETCH_JOBS[name][0]()
+        else:
+            return None
+        # 并发首用时可能各自构造一次，以先登记的为准
+        return provider_objs.setdefault(name, provider)
+
+    def _fetch_one(name: str, force: bool = False) -> tuple[str, list[Observation] | None, str | None]:
+        """
+        在线程池里跑单个 provider：返回 (name, observations, error)；不写库。
+        force=True（?refresh=1）时跳过 provider 的磁盘缓存。
+        """
+        try:
+            provider = _provider(name)
+            if provider is None:
+                return (name, None, f"Unknown provider: {name}")
+            provider.force_refresh = force
+            obs = provider.fetch(list(ALL_INDICATORS) if name == "http" else list(_AUTO_FETCH_JOBS[name][1]))
+            if not obs and name == "rsi":
+                cached_rsi = latest_observation(resolved_db, IndicatorId.SP500_RSI)
+                if cached_rsi:
+                    obs = [cached_rsi]
+            return (name, obs, None)
+        except Exception as e:
+            return (name, None, f"{name}: {e}")
+
+    def _auto_fetch_now(requested: bool, now: float | None = None) -> tuple[list[str], list[str]]:
+        """
+        返回 (ok_messages, error_messages)；now 为调用方在请求入口取的 time.monotonic()
         """
         if not (auto_fetch or requested):
             return ([], [])
 
-        now = datetime.now(timezone.utc)
+        # 如果用户显式 refresh=1，视为“强制刷新”，不受 cooldown 影响（此时不必读时钟）
+        if requested:
+            todo = list(providers)
+        else:
+            if now is None:
+                now = time.monotonic()
+            todo = [name for name in providers if _should_fetch(name, now)]
+        # 全部处于 cooldown（或没有配置 provider）：常见的无操作路径，直接返回
+        if not todo:
+            return ([], [])
+        if now is None:
+            now = time.monotonic()
         ok: list[str] = []
         err: list[str] = []
 
-        for name in providers:
-            # 如果用户显式 refresh=1，视为“强制刷新”，不受 cooldown 影响
-            if (not requested) and (not _should_fetch(name, now)):
+        # 各 provider 的 HTTP 请求并发执行（总耗时≈最慢的一个）；写库留在当前线程做
+        with ThreadPoolExecutor(max_workers=min(16, len(todo)), thread_name_prefix="autofetch") as ex:
+            results = list(ex.map(_fetch_one, todo, [requested] * len(todo)))
+
+        batch: list[Observation] = []
+        fetched: list[tuple[str, int]] = []
+        for name, obs, error in results:
+            if error is not None:
+                err.append(error)
                 continue
-            try:
-                if name == "cnn":
-                    obs = CnnFearGreedProvider().fetch([IndicatorId.CNN_FEAR_GREED_INDEX, IndicatorId.CNN_PUT_CALL_OPTIONS])
-                elif name == "vix":
-                    obs = VixProvider().fetch([IndicatorId.VIX])
-                elif name == "multpl":
-                    obs = MultplProvider().fetch([])
-                elif name == "nasdaqpe":
-                    obs = Nasdaq100PeProvider().fetch([IndicatorId.NASDAQ100_PE_RATIO])
-                elif name == "rsi":
-                    obs = Sp500RsiProvider().fetch([IndicatorId.SP500_RSI])
-                    if not obs:
-                        cached_rsi = latest_observation(resolved_db, IndicatorId.SP500_RSI)
-                        if cached_rsi:
-                            obs = [cached_rsi]
-                elif name == "fred":
-                    obs = FredProvider().fetch([IndicatorId.US_HIGH_YIELD_SPREAD])
-                elif name == "http":
-                    if not http_cfg.exists():
-                        raise RuntimeError(f"Missing http config file: {http_cfg} (please run `trader init` first or create manually)")
-                    obs = HttpJsonProvider(http_cfg).fetch(list(ALL_INDICATORS))
-                elif name == "ycharts":
-                    obs = YChartsProvider().fetch([IndicatorId.BOFA_BULL_BEAR])
-                elif name == "ndtw":
-                    obs = NdtwProvider().fetch([IndicatorId.NASDAQ100_ABOVE_20D_MA])
-                else:
-                    err.append(f"Unknown provider: {name}")
-                    continue
+            if obs:
+                batch.extend(obs)
+            fetched.append((name, len(obs or ())))
 
-                if obs:
-                    upsert_observations(resolved_db, obs)
-                    ok.append(f"{name}: wrote {len(obs)} records")
-                else:
-                    ok.append(f"{name}: no data")
-                last_fetch_at[name] = now
+        # 所有 provider 的结果合成一批、一个事务写入（一次提交，而不是每个 provider 各提交一次）；
+        # 同一 (indicator, as_of) 出现多次时按 providers 顺序后写覆盖先写，与逐个写入一致
+        if batch:
+            try:
+                upsert_observations(resolved_db, batch)
             except Exception as e:
-                err.append(f"{name}: {e}")
-
+                err.extend(f"{name}: {e}" for name, _ in fetched)
+                return (ok, err)
+            with ctx_lock:
+                cached_ctx.clear()
+
+        for name, n in fetched:
+            ok.append(f"{name}: wrote {n} records" if n else f"{name}: no data")
+            last_fetch_at[name] = now
         return (ok, err)
 
-    def _kick_market_refresh(*, force: bool) -> None:
+    def _kick_market_refresh(*, force: bool, now: float | None = None) -> None:
         """
         异步刷新 market cache：不要阻塞首页渲染。
+        只在 async 路由里调用：刷新作为事件循环上的 task 运行，阻塞调用走默认线程池，不再每次新建线程。
         """
-        nonlocal cached_market_rows, cached_market_at, market_refreshing
+        nonlocal market_refreshing, market_task
 
         with market_lock:
             if market_refreshing:
                 return
-            now = datetime.now(timezone.utc)
-            if (not force) and cached_market_at and (now - cached_market_at) <= timedelta(seconds=60):
+            if now is None:
+                now = time.monotonic()
+            if (not force) and cached_market_mono is not None and (now - cached_market_mono) <= 60:
                 return
             market_refreshing = True
 
-        def _run() -> None:
-            nonlocal cached_market_rows, cached_market_at, market_refreshing
-            try:
-                rows = get_us_index_overview_rows()
-                with market_lock:
-                    cached_market_rows = rows or []
-                    cached_market_at = datetime.now(timezone.utc)
-                if rows:
-                    upsert_market_overview_rows(resolved_db, rows)
-            except Exception:
-                # 保留旧数据（或空），避免失败影响页面
-                pass
-            finally:
-                with market_lock:
-                    market_refreshing = False
+        # 持有 task 引用，避免运行中被 GC
+        market_task = asyncio.get_running_loop().create_task(_refresh_market())
 
-        t = threading.Thread(target=_run, daemon=True)
-        t.start()
+    async def _refresh_market() -> None:
+        nonlocal cached_market_rows, cached_market_at, cached_market_mono, market_refreshing
+        try:
+            rows = await asyncio.to_thread(get_us_index_overview_rows)
+            with market_lock:
+                cached_market_rows = rows or []
+                cached_market_at = datetime.now(timezone.utc)
+                cached_market_mono = time.monotonic()
+            if rows:
+                await asyncio.to_thread(upsert_market_overview_rows, resolved_db, rows)
+        except Exception:
+            # 保留旧数据（或空），避免失败影响页面
+            pass
+        finally:
+            with market_lock:
+                market_refreshing = False
 
     def _kick_history_backfill() -> None:
         """One-shot, async backfill of RSI/VIX daily history from Yahoo."""
@@ -258,26 +512,28 @@ def create_app(
 
         threading.Thread(target=_run, daemon=True).start()
 
-    def _kick_world_refresh(*, force: bool) -> None:
-        """Async refresh of the world-indices cache."""
-        nonlocal cached_world_rows, cached_world_at, world_refreshing
+    def _kick_world_refresh(*, force: bool, now: float | None = None) -> None:
+        """Async refresh of the world-indices cache (`now`: time.monotonic())."""
+        nonlocal world_refreshing
 
         with world_lock:
             if world_refreshing:
                 return
-            now = datetime.now(timezone.utc)
+            if now is None:
+                now = time.monotonic()
             # 5-min freshness window when not forced
-            if (not force) and cached_world_at and (now - cached_world_at) <= timedelta(seconds=300):
+            if (not force) and cached_world_mono is not None and (now - cached_world_mono) <= 300:
                 return
             world_refreshing = True
 
         def _run() -> None:
-            nonlocal cached_world_rows, cached_world_at, world_refreshing
+            nonlocal cached_world_rows, cached_world_at, cached_world_mono, world_refreshing
             try:
                 rows = get_world_overview(db_path=resolved_db, with_news=True)
                 with world_lock:
                     cached_world_rows = rows or []
                     cached_world_at = datetime.now(timezone.utc)
+                    cached_world_mono = time.monotonic()
             except Exception:
                 pass
             finally:
@@ -287,58 +543,48 @@ def create_app(
         t = threading.Thread(target=_run, daemon=True)
         t.start()
 
-    @app.get("/", response_class=HTMLResponse)
-    def index(request: Request) -> Any:
-        refresh = str(request.query_params.get("refresh") or "").strip().lower() in {"1", "true", "yes", "y"}
-        ok_msgs, err_msgs = _auto_fetch_now(refresh)
-        latest = list_latest(resolved_db)
-        alerts = compute_alerts(resolved_db, list(ALL_INDICATORS))
+    async def _build_index_data(last_update: datetime | None, want_history: bool) -> dict[str, Any]:
+        """
+        首页 context 中只取决于数据库内容的部分；结果会被 cached_ctx 跨请求复用。
+        """
+        nonlocal cached_pe_sorted
+        latest, alerts = await asyncio.gather(
+            asyncio.to_thread(list_latest, resolved_db),
+            asyncio.to_thread(compute_alerts, resolved_db, list(ALL_INDICATORS)),
+        )
 
         # Calculate last update time
-        last_update_time = get_last_update_time(resolved_db)
-        if last_update_time:
-            # 转换为本地时区显示（假设用户在东八区）
-            last_update_time = last_update_time.astimezone(timezone(timedelta(hours=8))).strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            last_update_time = None
-
-        # US market overview：改成异步刷新（不阻塞页面）
-        _kick_market_refresh(force=refresh)
-        with market_lock:
-            market_rows = list(cached_market_rows)
-
-        # Kick the world indices refresh so the map has data ready ASAP.
-        _kick_world_refresh(force=refresh)
-
-        # Backfill ~1y of RSI / VIX history on first request, so the trend
-        # chart is meaningful even on a freshly-deployed instance.
-        _kick_history_backfill()
+        last_update_time = _fmt_last_update(last_update) if last_update else None
 
         # History (hardcoded in historical.py, no longer dynamically fetch long historical data)
-        from ..historical import get_historical_events
-        bear_rows = [asdict(e) for e in get_historical_events()]
+        bear_rows = _bear_rows_cached()
 
         # Only fetch monthly PE table once when calculating PE percentile (optional, default off to keep fast loading)
         pe_pct = None
-        want_history = str(request.query_params.get("history") or "").strip().lower() in {"1", "true", "yes", "y"}
         if want_history:
             try:
-                if cached_pe_monthly is None:
-                    from ..historical import fetch_multpl_pe_monthly
-                    cached_pe_monthly = fetch_multpl_pe_monthly()
+                if cached_pe_sorted is None:
+                    pe_monthly = await asyncio.to_thread(fetch_multpl_pe_monthly)
+                    cached_pe_sorted = array("d", sorted(pe_monthly.values()))
 
                 pe_latest = latest.get(IndicatorId.SP500_PE_RATIO)
-                if pe_latest and cached_pe_monthly:
-                    vals = sorted(cached_pe_monthly.values())
+                if pe_latest and cached_pe_sorted:
                     v = float(pe_latest.value)
-                    import bisect
-                    pe_pct = bisect.bisect_right(vals, v) / max(1, len(vals))
+                    pe_pct = bisect_right(cached_pe_sorted, v) / len(cached_pe_sorted)
             except Exception:
                 pass # Ignore PE percentile calculation errors to ensure page display
 
         signals = compute_signals(latest, pe_percentile=pe_pct)
-        top_signals = [s for s in signals if s.top]
-        bottom_signals = [s for s in signals if s.bottom]
+        # One pass: top / bottom lists plus an id -> signal map for the table rows
+        top_signals: list[Signal] = []
+        bottom_signals: list[Signal] = []
+        signal_map: dict[IndicatorId, Signal] = {}
+        for s in signals:
+            signal_map[s.indicator_id] = s
+            if s.top:
+                top_signals.append(s)
+            if s.bottom:
+                bottom_signals.append(s)
 
         # Composite "Market Regime" reading: combine all current indicators
         # into a single Strong Buy / Buy / Cautious Buy / Neutral / Caution
@@ -349,137 +595,112 @@ def create_app(
         # market historically tends to actually arrive — so we look back
         # ~720 days for any negative T10Y2Y print.
         try:
-            yc_history = recent_observations(resolved_db, IndicatorId.YC_10Y_2Y, 720)
+            yc_history = await asyncio.to_thread(recent_observations, resolved_db, IndicatorId.YC_10Y_2Y, 720)
             yc_recently_inverted = any(float(o.value) < 0 for o in yc_history)
         except Exception:
             yc_recently_inverted = True  # safe default for current macro era
         regime = compute_market_regime(latest, yc_recently_inverted=yc_recently_inverted)
 
-        # Build signal dictionary for easy lookup
-        signal_map = {s.indicator_id: s for s in signals}
-
-        # Indicator ID to display name mapping (use default name if no signal)
-        indicator_names = {
-            IndicatorId.US_HIGH_YIELD_SPREAD: "US High Yield Option-Adjusted Spread",
-            IndicatorId.BOFA_BULL_BEAR: "Investor Sentiment Bull-Bear Spread",
-            IndicatorId.CNN_FEAR_GREED_INDEX: "Fear & Greed Index",
-            IndicatorId.CNN_PUT_CALL_OPTIONS: "Put/Call Ratio (5-Day Average)",
-            IndicatorId.SP500_PE_RATIO: "S&P 500 Price-to-Earnings Ratio",
-            IndicatorId.NASDAQ100_PE_RATIO: "Nasdaq 100 Price-to-Earnings Ratio",
-            IndicatorId.SP500_RSI: "S&P 500 Relative Strength Index",
-            IndicatorId.NASDAQ100_ABOVE_20D_MA: "Nasdaq 100 Above 20-Day Moving Average (%)",
-            IndicatorId.VIX: "S&P 500 Volatility Index",
-            IndicatorId.CBOE_SKEW: "CBOE SKEW (Tail-Risk Hedging)",
-            IndicatorId.YC_10Y_2Y: "10Y-2Y Treasury Yield Curve",
-        }
+        # Make it easier to use in template
+        latest_rows = [_build_latest_row(ind, latest.get(ind), signal_map.get(ind)) for ind in ALL_INDICATORS]
 
-        # Indicator ID to source URL mapping
-        indicator_source_urls = {
-            IndicatorId.US_HIGH_YIELD_SPREAD: "https://fred.stlouisfed.org/series/BAMLH0A0HYM2",
-            IndicatorId.BOFA_BULL_BEAR: "https://ycharts.com/indicators/us_investor_sentiment_bull_bear_spread",
-            IndicatorId.CNN_FEAR_GREED_INDEX: "https://edition.cnn.com/markets/fear-and-greed",
-            IndicatorId.CNN_PUT_CALL_OPTIONS: "https://edition.cnn.com/markets/fear-and-greed",
-            IndicatorId.SP500_PE_RATIO: "https://www.multpl.com/s-p-500-pe-ratio/table/by-month",
-            IndicatorId.NASDAQ100_PE_RATIO: "https://www.barrons.com/market-data/stocks/us/pe-yields",
-            IndicatorId.SP500_RSI: "https://www.investing.com/indices/us-spx-500-technical",
-            IndicatorId.NASDAQ100_ABOVE_20D_MA: "https://www.barchart.com/stocks/quotes/$NDTW",
-            IndicatorId.VIX: "https://edition.cnn.com/markets/fear-and-greed",
-            IndicatorId.CBOE_SKEW: "https://finance.yahoo.com/quote/%5ESKEW",
-            IndicatorId.YC_10Y_2Y: "https://fred.stlouisfed.org/series/T10Y2Y",
+        return {
+            "latest_rows": latest_rows,
+            "last_update_time": last_update_time,
+            "alerts": [asdict(a) for a in alerts],
+            "bear_rows": bear_rows,
+            "signals": signals,
+            "top_signals": top_signals,
+            "bottom_signals": bottom_signals,
+            "top_score": len(top_signals),
+            "bottom_score": len(bottom_signals),
+            "regime": regime,
+            "pe_percentile": pe_pct,
         }
 
-        # Make it easier to use in template
-        latest_rows = []
-        for ind in ALL_INDICATORS:
-            o = latest.get(ind)
-            s = signal_map.get(ind)
-            # Use signal title first, otherwise use default name
-            name = s.title if s else indicator_names.get(ind, ind.value)
-
-            # Format values: special handling for US High Yield Spread (convert from bp to % display)
-            value_display = o.value if o else None
-            if value_display is not None:
-                try:
-                    if ind == IndicatorId.US_HIGH_YIELD_SPREAD:
-                        # US High Yield Spread stored in bp, display as percentage (without % symbol, % shown in unit column)
-                        value_display = f"{float(value_display) / 100.0:.2f}"
-                    elif ind == IndicatorId.SP500_RSI:
-                        value_display = f"{float(value_display):.2f}"
-                    elif ind in {IndicatorId.CNN_FEAR_GREED_INDEX, IndicatorId.CNN_PUT_CALL_OPTIONS, IndicatorId.NASDAQ100_ABOVE_20D_MA}:
-                        value_display = f"{float(value_display):.2f}"
-                    elif ind in {IndicatorId.SP500_PE_RATIO, IndicatorId.NASDAQ100_PE_RATIO}:
-                        value_display = f"{float(value_display):.2f}"
-                    elif ind == IndicatorId.CBOE_SKEW:
-                        value_display = f"{float(value_display):.2f}"
-                    elif ind == IndicatorId.YC_10Y_2Y:
-                        value_display = f"{float(value_display):+.2f}"
-                except (ValueError, TypeError):
-                    pass
-
-            # Special handling: unit display optimization
-            unit_display = o.unit if o else None
-            if ind == IndicatorId.US_HIGH_YIELD_SPREAD and unit_display == "bp":
-                unit_display = "%"
-            elif unit_display == "percent":
-                unit_display = "%"
-            
-            latest_rows.append(
-                {
-                    "id": ind.value,
-                    "name": name,
-                    "as_of": o.as_of.strftime("%m-%d") if o else None,
-                    "value": value_display,
-                    "unit": unit_display,
-                    "source": o.source if o else None,
-                    "source_url": indicator_source_urls.get(ind),
-                    "is_top": s.top if s else False,
-                    "is_bottom": s.bottom if s else False,
-                }
-            )
+    @app.get("/", response_class=HTMLResponse)
+    async def index(request: Request) -> Any:
+        refresh = _truthy(request.query_params, "refresh")
+        want_history = _truthy(request.query_params, "history")
+        # Provider HTTP / SQLite are blocking: run them in worker threads so the
+        # event loop keeps serving other viewers while we wait on I/O.
+        # One clock read per request, shared by the cooldown / freshness checks below
+        now = time.monotonic()
+        ok_msgs, err_msgs = await asyncio.to_thread(_auto_fetch_now, refresh, now)
+
+        # The DB only changes on auto-fetch / backfill, so reuse the last
+        # snapshot while MAX(inserted_at) is unchanged and it is still fresh.
+        last_update = await asyncio.to_thread(get_last_update_time, resolved_db)
+        version = last_update.timestamp() if last_update else 0.0
+
+        # US market overview：改成异步刷新（不阻塞页面）
+        _kick_market_refresh(force=refresh, now=now)
+        with market_lock:
+            market_rows = list(cached_market_rows)
+            market_at = cached_market_at
 
-        return templates.TemplateResponse(
+        # Kick the world indices refresh so the map has data ready ASAP.
+        _kick_world_refresh(force=refresh, now=now)
+
+        # Backfill ~1y of RSI / VIX history on first request, so the trend
+        # chart is meaningful even on a freshly-deployed instance.
+        _kick_history_backfill()
+
+        # Everything the page shows is determined by these values: when the
+        # browser already has this render, answer 304 without rendering.
+        auto_fetch_enabled = getattr(app.state, 'auto_fetch_enabled', auto_fetch)
+        # hash() is salted per process, so digest a repr instead: the ETag must
+        # stay stable across workers / restarts. The PE table size covers the
+        # percentile appearing once it loads, today() the relative dates.
+        pe_rows = len(cached_pe_sorted) if cached_pe_sorted else 0
+        page_key = repr((
+            version, market_at, want_history, auto_fetch_enabled, pe_rows,
+            date.today().isoformat(), tuple(ok_msgs), tuple(err_msgs),
+        ))
+        etag = f'W/"{hashlib.blake2b(page_key.encode(), digest_size=8).hexdigest()}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        with ctx_lock:
+            hit = cached_ctx.get(want_history)
+        if (not refresh) and hit and hit[0] == version and (time.monotonic() - hit[1]) <= ctx_ttl_seconds:
+            data = hit[2]
+        else:
+            # Single-flight: concurrent misses for the same snapshot share one
+            # build instead of each hitting the DB. shield() keeps a client
+            # disconnect from cancelling the build the others are waiting on.
+            key = (want_history, version)
+            task = ctx_inflight.get(key)
+            if task is None:
+                task = asyncio.get_running_loop().create_task(_build_index_data(last_update, want_history))
+                ctx_inflight[key] = task
+                task.add_done_callback(lambda _t, key=key: ctx_inflight.pop(key, None))
+            data = await asyncio.shield(task)
+            with ctx_lock:
+                cached_ctx[want_history] = (version, time.monotonic(), data)
+
+        response = templates.TemplateResponse(
             "index.html",
             {
                 "request": request,
+                **data,
                 "db_path": str(resolved_db),
-                "latest_rows": latest_rows,
-                "last_update_time": last_update_time,
                 "market_rows": market_rows,
-                "alerts": [asdict(a) for a in alerts],
                 "auto_fetch": auto_fetch,
-                "auto_fetch_enabled": getattr(app.state, 'auto_fetch_enabled', auto_fetch),
+                "auto_fetch_enabled": auto_fetch_enabled,
                 "auto_fetch_providers": providers,
                 "cooldown_seconds": cooldown,
                 "fetch_ok": ok_msgs,
                 "fetch_err": err_msgs,
-                "bear_rows": bear_rows,
-                "signals": signals,
-                "top_signals": top_signals,
-                "bottom_signals": bottom_signals,
-                "top_score": len(top_signals),
-                "bottom_score": len(bottom_signals),
-                "regime": regime,
-                "pe_percentile": pe_pct,
-                "sources": [
-                    {"name": "US High Yield OAS (Primary)", "url": "https://tradingeconomics.com/united-states/bofa-merrill-lynch-us-high-yield-option-adjusted-spread-fed-data.html"},
-                    {"name": "AAII Bull-Bear Spread", "url": "https://ycharts.com/indicators/us_investor_sentiment_bull_bear_spread"},
-                    {"name": "CNN Fear & Greed", "url": "https://edition.cnn.com/markets/fear-and-greed"},
-                    {"name": "CNN Put/Call (Same source as Fear&Greed)", "url": "https://edition.cnn.com/markets/fear-and-greed"},
-                    {"name": "S&P 500 PE Ratio", "url": "https://www.multpl.com/s-p-500-pe-ratio"},
-                    {"name": "Nasdaq 100 PE Ratio", "url": "https://www.barrons.com/market-data/stocks/us/pe-yields"},
-                    {"name": "S&P 500 RSI", "url": "https://www.investing.com/indices/us-spx-500-technical"},
-                    {"name": "Nasdaq 100 Above 20D MA (Primary)", "url": "https://eoddata.com/stockquote/INDEX/NDTW.htm"},
-                    {"name": "Nasdaq 100 Above 20D MA (Alternative)", "url": "https://www.barchart.com/stocks/quotes/$NDTW"},
-                    {"name": "Nasdaq 100 Above 20D MA (Alternative)", "url": "https://www.tradingview.com/symbols/INDEX-NDTW/"},
-                    {"name": "VIX (CNN Fear & Greed component)", "url": "https://edition.cnn.com/markets/fear-and-greed"},
-                    {"name": "US Stock Indices (S&P/Dow/Nasdaq) Daily CSV", "url": "https://stooq.com/q/d/l/"},
-                ],
+                "sources": _SOURCES,
             },
         )
+        response.headers["ETag"] = etag
+        return response
 
     @app.get("/api/market-overview")
-    def api_market_overview(request: Request) -> dict[str, Any]:
-        force = str(request.query_params.get("refresh") or "").strip().lower() in {"1", "true", "yes", "y"}
+    async def api_market_overview(request: Request) -> Any:
+        force = _truthy(request.query_params, "refresh")
         raw_symbols = str(request.query_params.get("symbols") or "")
         symbols = [s for s in re.split(r"[,\s]+", raw_symbols) if s.strip()]
         _kick_market_refresh(force=force)
@@ -488,9 +709,9 @@ def create_app(
             at = cached_market_at
             refreshing = market_refreshing
         if symbols:
-            rows = get_us_index_overview_rows(extra_symbols=symbols)
+            rows = await asyncio.to_thread(get_us_index_overview_rows, extra_symbols=symbols)
             if rows:
-                upsert_market_overview_rows(resolved_db, rows)
+                await asyncio.to_thread(upsert_market_overview_rows, resolved_db, rows)
             expected = list(default_market_symbols)
             for s in symbols:
                 norm = _normalize_stock_symbol(s)
@@ -505,17 +726,21 @@ def create_app(
                     continue
                 seen.add(key)
                 expected_unique.append(s)
-            rows = _merge_market_rows(expected_unique, rows)
+            rows = await asyncio.to_thread(_merge_market_rows, expected_unique, rows)
         else:
             if not rows:
-                rows = list_market_overview_rows(resolved_db)
-            rows = _merge_market_rows(default_market_symbols, rows)
+                rows = await asyncio.to_thread(list_market_overview_rows, resolved_db)
+            rows = await asyncio.to_thread(_merge_market_rows, default_market_symbols, rows)
 
-        return {
-            "rows": rows,
-            "as_of_utc": at.isoformat() if at else None,
-            "refreshing": refreshing,
-        }
+        # Hand back a Response directly so FastAPI skips jsonable_encoder and the
+        # payload goes straight to orjson (when installed)
+        return _JSONResponse(
+            {
+                "rows": rows,
+                "as_of_utc": at.isoformat() if at else None,
+                "refreshing": refreshing,
+            }
+        )
 
     def _to_yahoo_symbol(raw: str) -> str | None:
         """
@@ -633,8 +858,8 @@ def create_app(
         }
 
     @app.get("/api/latest")
-    def api_latest() -> Any:
-        latest = list_latest(resolved_db)
+    async def api_latest() -> Any:
+        latest = await asyncio.to_thread(list_latest, resolved_db)
         out = {}
         for ind, o in latest.items():
             out[ind.value] = {
@@ -644,12 +869,12 @@ def create_app(
                 "source": o.source,
                 "meta": o.meta or {},
             }
-        return out
+        return _JSONResponse(out)
 
     @app.get("/api/alerts")
-    def api_alerts() -> Any:
-        alerts = compute_alerts(resolved_db, list(ALL_INDICATORS))
-        return [asdict(a) for a in alerts]
+    async def api_alerts() -> Any:
+        alerts = await asyncio.to_thread(compute_alerts, resolved_db, list(ALL_INDICATORS))
+        return _JSONResponse([asdict(a) for a in alerts])
 
     @app.get("/api/regime")
     def api_regime() -> dict[str, Any]:
@@ -680,25 +905,6 @@ def create_app(
         except Exception:
             return {"indicator_id": indicator_id, "unit": None, "series": [], "error": "Unknown indicator_id"}
 
-        thresholds: dict[IndicatorId, dict[str, float]] = {
-            IndicatorId.BOFA_BULL_BEAR: {"top": 20.0, "bottom": -20.0},
-            IndicatorId.CNN_FEAR_GREED_INDEX: {"top": 75.0, "bottom": 25.0},
-            IndicatorId.CNN_PUT_CALL_OPTIONS: {"top": 0.55, "bottom": 0.95},
-            IndicatorId.VIX: {"top": 14.0, "bottom": 25.0},
-            IndicatorId.SP500_RSI: {"top": 70.0, "bottom": 30.0},
-            IndicatorId.SP500_PE_RATIO: {"top": 30.0, "bottom": 20.0},
-            IndicatorId.NASDAQ100_PE_RATIO: {"top": 35.0, "bottom": 22.0},
-            IndicatorId.NASDAQ100_ABOVE_20D_MA: {"top": 80.0, "bottom": 20.0},
-            IndicatorId.US_HIGH_YIELD_SPREAD: {"top": 2.8, "bottom": 4.5},
-            IndicatorId.CBOE_SKEW: {"top": 155.0},
-            # 10Y-2Y is special: the "top warning" is a BAND (post-inversion
-            # re-steepening window), not a single threshold. We emit a
-            # `top_zone` instead of a `top` here. There is no clean single
-            # "bottom" threshold either — true bottoms only register when
-            # the curve is steep AND panic indicators co-fire — so we skip it.
-            IndicatorId.YC_10Y_2Y: {"top_zone": [-0.05, 0.6]},
-        }
-
         days = max(1, min(int(days), 36500))
         obs = recent_observations(resolved_db, ind, days)
         series: list[dict[str, Any]] = []
@@ -720,7 +926,7 @@ def create_app(
                 unit_display = ""
             series.append({"date": o.as_of.isoformat(), "value": v})
 
-        th = thresholds.get(ind) or {}
+        th = _THRESHOLDS.get(ind) or {}
         return {
             "indicator_id": ind.value,
             "unit": unit_display,
@@ -741,7 +947,7 @@ def create_app(
         and up to 3 headlines per index. Background-refreshed; an empty initial
         response is fine (the front-end shows a 'Loading...' state).
         """
-        force = str(request.query_params.get("refresh") or "").strip().lower() in {"1", "true", "yes", "y"}
+        force = _truthy(request.query_params, "refresh")
         _kick_world_refresh(force=force)
         with world_lock:
             rows = list(cached_world_rows)
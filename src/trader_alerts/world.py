@@ -15,6 +15,7 @@ from typing import Any
 
 import requests
 
+from .http import SESSION
 from .market import (
     _fetch_stooq_daily_closes,
     _fetch_stooq_quote,
@@ -327,7 +328,7 @@ def get_world_overview(*, db_path: str | Path | None = None, with_news: bool = T
     Returns one row per world index (price + day change + up to 3 headlines).
     News fetch is skipped silently when FINNHUB_KEY is not set.
     """
-    session = requests.Session()
+    session = SESSION
     rows: list[dict[str, Any]] = []
     with ThreadPoolExecutor(max_workers=min(8, len(WORLD_INDICES))) as ex:
         futs = {ex.submit(_fetch_one_overview, m, session=session): m for m in WORLD_INDICES}
@@ -444,7 +445,7 @@ def get_index_history(
     span = days_map.get(range_key.lower(), 400)
     end = date.today()
     start = end - timedelta(days=span + 30)  # +buffer for holidays/weekends
-    session = requests.Session()
+    session = SESSION
 
     yahoo_range = {"1m": "1mo", "1y": "1y", "all": "10y"}.get(range_key.lower(), "1y")
     raw: list[tuple[date, float]] = []